@@ -53,14 +53,21 @@ class MenuBar():
             DirectMenuItemEntry("Zoom Out", base.messenger.send, ["NodeEditor_zoom", [False]]),
             DirectMenuSeparator(),
             DirectMenuItemEntry("Reset Zoom", base.messenger.send, ["NodeEditor_zoom_reset"]),
+            DirectMenuSeparator(),
+            DirectMenuItemEntry("Toggle Viewport Culling", base.messenger.send, ["NodeEditor_toggleCulling"]),
             ]
         self.view = self.__create_menu_item("View", self.view_entries)
 
         self.tool_entries = [
+            DirectMenuItemEntry("Undo", base.messenger.send, ["NodeEditor_undo"]),
+            DirectMenuItemEntry("Redo", base.messenger.send, ["NodeEditor_redo"]),
+            DirectMenuSeparator(),
             DirectMenuItemEntry("Refresh", base.messenger.send, ["NodeEditor_refreshNodes"]),
             DirectMenuSeparator(),
             DirectMenuItemEntry("Copy Nodes", taskMgr.doMethodLater, [0.2, base.messenger.send, "delayedCopyFromMenu", ["NodeEditor_copyNodes"]]),
             DirectMenuItemEntry("Delete Nodes", base.messenger.send, ["NodeEditor_removeNode"]),
+            DirectMenuSeparator(),
+            DirectMenuItemEntry("Toggle Profiler", base.messenger.send, ["NodeEditor_toggleProfiler"]),
             ]
         self.tool = self.__create_menu_item("Tools", self.tool_entries)
 
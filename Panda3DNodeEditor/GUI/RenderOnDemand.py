@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import time
+
+from panda3d.core import ClockObject
+
+from direct.showbase.DirectObject import DirectObject
+
+class RenderOnDemand(DirectObject):
+    """Only renders frames after an input or a change of the editor.
+
+    While nothing happens, each frame is stretched to last
+    1 / idleFrameRate seconds, which lets the application sleep instead
+    of spinning through empty frames. The mode and frame rate of the
+    global clock are left as set up by the application. If the editor
+    is the only thing shown in the main window, deactivateWindow can be
+    set to stop rendering the window at all while idle, which would also
+    stop the rest of the scene from being drawn. Moving the mouse,
+    pressing a button, resizing the window or calling request renders
+    the next activeFrames frames again."""
+    def __init__(self, idleFrameRate=10, activeFrames=3, deactivateWindow=False):
+        DirectObject.__init__(self)
+        self.idleFrameRate = idleFrameRate
+        self.activeFrames = activeFrames
+        self.deactivateWindow = deactivateWindow
+        self.framesLeft = 0
+        self.lastMouse = None
+        self.idle = False
+        # real time at which the last idle frame ended
+        self.idleFrameEnd = None
+        # button events set by us on the button thrower
+        self.ownButtonEvents = []
+
+    def start(self):
+        if taskMgr.hasTaskNamed("NodeEditor_renderOnDemand"):
+            return
+        self.accept("window-event", self.onWindowEvent)
+        for buttonThrower in base.buttonThrowers or []:
+            node = buttonThrower.node()
+            for getter, setter, name in (
+                    (node.getButtonDownEvent, node.setButtonDownEvent, "NodeEditor_buttonDown"),
+                    (node.getButtonUpEvent, node.setButtonUpEvent, "NodeEditor_buttonUp")):
+                event = getter()
+                if event == "":
+                    # only listen for buttons if nobody else does already
+                    setter(name)
+                    self.ownButtonEvents.append((setter, name))
+                    event = name
+                self.accept(event, self.onButton)
+        self.request()
+        # run after all other tasks of the frame but before rendering
+        taskMgr.add(self.renderTask, "NodeEditor_renderOnDemand", sort=49)
+
+    def stop(self):
+        taskMgr.remove("NodeEditor_renderOnDemand")
+        self.ignoreAll()
+        for setter, name in self.ownButtonEvents:
+            setter("")
+        self.ownButtonEvents = []
+        self.setIdle(False)
+
+    def request(self, frames=None):
+        """Render at least the given number of next frames"""
+        self.framesLeft = max(self.framesLeft, frames or self.activeFrames)
+
+    def onWindowEvent(self, window):
+        self.request()
+
+    def onButton(self, button):
+        self.request()
+
+    def renderTask(self, task):
+        mwn = base.mouseWatcherNode
+        if mwn is not None and mwn.hasMouse():
+            mouse = (mwn.getMouseX(), mwn.getMouseY())
+            if mouse != self.lastMouse:
+                self.lastMouse = mouse
+                self.request()
+
+        if self.framesLeft > 0:
+            self.framesLeft -= 1
+            self.setIdle(False)
+        else:
+            self.setIdle(True)
+            self.sleep()
+        return task.cont
+
+    def sleep(self):
+        """Wait for the rest of the time an idle frame should take"""
+        clock = ClockObject.getGlobalClock()
+        if self.idleFrameEnd is not None:
+            remaining = 1.0 / self.idleFrameRate - (clock.getRealTime() - self.idleFrameEnd)
+            if remaining > 0:
+                time.sleep(remaining)
+        self.idleFrameEnd = clock.getRealTime()
+
+    def setIdle(self, idle):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        self.idleFrameEnd = None
+        if self.deactivateWindow and base.win is not None:
+            base.win.setActive(not idle)
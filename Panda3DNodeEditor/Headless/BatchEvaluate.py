@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import sys
+import json
+import glob
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.Tools import BinaryTools
+
+PROJECT_EXTENSIONS = (".logic", BinaryTools.EXTENSION)
+
+def evaluateFile(path):
+    """Load and evaluate the project file at the given path and return
+    a JSON serializable result record"""
+    try:
+        graph = HeadlessGraph()
+        graph.load(path)
+        graph.evaluate()
+        return {"file": path, "ok": True, "nodes": graph.getResults()}
+    except Exception as e:
+        logging.error(f"Couldn't evaluate project file {path}", exc_info=True)
+        return {"file": path, "ok": False, "error": str(e)}
+
+def collectFiles(paths, recursive=False):
+    """Returns a list of all project files given directly or found in
+    the given directories"""
+    files = []
+    for path in paths:
+        path = os.path.expandvars(os.path.expanduser(path))
+        if os.path.isdir(path):
+            found = []
+            for extension in PROJECT_EXTENSIONS:
+                pattern = os.path.join(path, "**", "*" + extension) if recursive \
+                    else os.path.join(path, "*" + extension)
+                found += glob.glob(pattern, recursive=recursive)
+            files += sorted(found)
+        else:
+            files.append(path)
+    return files
+
+def writeResults(results, outfile):
+    """Write the given result records as JSON lines in the order they
+    come in and return the number of failed evaluations"""
+    failed = 0
+    for result in results:
+        if not result["ok"]:
+            failed += 1
+        outfile.write(json.dumps(result, default=str) + "\n")
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluate node editor project files without opening a "
+                    "window and write the results as JSON lines")
+    parser.add_argument(
+        "paths", nargs="+",
+        help="project files or directories containing project files")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="file to write the results to, defaults to stdout")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument(
+        "-r", "--recursive", action="store_true",
+        help="search directories recursively")
+    args = parser.parse_args(argv)
+
+    files = collectFiles(args.paths, args.recursive)
+    if not files:
+        logging.warning("No project files found")
+        return 0
+
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        jobs = max(1, min(args.jobs, len(files)))
+        if jobs == 1:
+            failed = writeResults(map(evaluateFile, files), outfile)
+        else:
+            chunksize = max(1, len(files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                failed = writeResults(
+                    executor.map(evaluateFile, files, chunksize=chunksize),
+                    outfile)
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+
+from Panda3DNodeEditor.NodeCore.NodeConnector import NodeConnector
+from Panda3DNodeEditor.NodeCore.ConnectionIndex import ConnectionIndex
+from Panda3DNodeEditor.NodeCore.NodeEvaluator import NodeEvaluator
+from Panda3DNodeEditor.NodeCore.NodeRegistry import NodeRegistry
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+
+class HeadlessGraph:
+    """A node graph without any GUI.
+
+    Nodes are created without a parent so they won't create any widgets
+    and no messenger, task manager or window is needed to load and
+    evaluate a project file. The graph exposes the same nodeList and
+    connectionIndex attributes as the NodeManager so the logic is run by
+    the same NodeEvaluator as in the editor."""
+    def __init__(self, customNodeMap=None):
+        self.nodeList = []
+        self.connections = []
+        self.connectionIndex = ConnectionIndex()
+        self.evaluator = NodeEvaluator(self)
+        self.nodeRegistry = NodeRegistry(customNodeMap)
+
+    def clear(self):
+        self.nodeList = []
+        self.connections = []
+        self.connectionIndex.clear()
+        self.evaluator.invalidate()
+
+    def createNode(self, nodeType):
+        """Creates a node of the given type and returns it. Returns None
+        if the node could not be created.
+        nodeType can be either a node class type or a string representing such a type"""
+        if isinstance(nodeType, str):
+            typeName = nodeType
+            nodeType = self.nodeRegistry.resolve(typeName)
+            if nodeType is None:
+                logging.error(f"couldn't add unknown node type: {typeName}")
+                return None
+        try:
+            node = nodeType(None)
+        except Exception:
+            logging.error("Failed to load node type", exc_info=True)
+            return None
+        self.nodeList.append(node)
+        self.evaluator.invalidate()
+        return node
+
+    def connectSockets(self, socketA, socketB):
+        """Create a connector between the two given sockets and return it"""
+        connector = NodeConnector(socketA, socketB)
+        self.connections.append(connector)
+        self.connectionIndex.add(connector)
+        socketA.setConnected(True)
+        socketB.setConnected(True)
+        self.evaluator.invalidate()
+        return connector
+
+    def load(self, path):
+        """Load the JSON or binary project file at the given path
+        including the changes stored in its journal"""
+        self.loadData(JournalTools().loadProject(path))
+
+    def loadData(self, fileContent):
+        """Create the nodes and connections stored in the given project
+        file content"""
+        GraphBuilder(self).build(fileContent)
+
+    def evaluate(self):
+        """Run the logic of all nodes in the graph"""
+        self.evaluator.evaluate(self.nodeList)
+
+    def getResults(self):
+        """Returns a list with the type, name and socket values of all
+        nodes in the graph"""
+        results = []
+        for node in self.nodeList:
+            results.append({
+                "id": str(node.nodeID),
+                "type": node.__module__,
+                "name": node.name,
+                "inputs": [socket.getValue() for socket in node.inputList],
+                "outputs": [socket.getValue() for socket in node.outputList],
+            })
+        return results
+
+    def attachTo(self, nodeMgr):
+        """Move all nodes and connections of this graph into the given
+        node manager, creating their GUI on the way. The graph will be
+        empty afterwards."""
+        for node in self.nodeList:
+            node.attachView(nodeMgr.nodeViewNP)
+            node.setLOD(nodeMgr.lod)
+            nodeMgr.nodeList.append(node)
+            node.show()
+        for connector in self.connections:
+            connector.attachView(nodeMgr.connectionRenderer)
+            nodeMgr.connections.append(connector)
+            nodeMgr.connectionIndex.add(connector)
+        nodeMgr.evaluator.invalidate()
+        nodeMgr.updateAllLeaveNodes()
+        self.clear()
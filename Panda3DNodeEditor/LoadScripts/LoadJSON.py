@@ -7,14 +7,10 @@ See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
 """
 
 import os
-import json
-import logging
-
-# NOTE: LPoint3f is required for loading the position from json using eval
-from panda3d.core import LPoint3f
 
 from DirectFolderBrowser.DirectFolderBrowser import DirectFolderBrowser
-from uuid import UUID
+
+from Panda3DNodeEditor.LoadScripts.StreamLoader import StreamLoader
 
 class Load:
     def __init__(self, nodeMgr):
@@ -33,76 +29,4 @@ class Load:
         del self.browser
 
     def __executeLoad(self, path):
-        fileContent = None
-        try:
-            with open(path, 'r') as infile:
-                fileContent = json.load(infile)
-        except Exception as e:
-            print("Couldn't load project file {}".format(path))
-            print(e)
-            return
-
-        if fileContent is None:
-            print("Problems reading file: {}".format(infile))
-            return
-
-        # 1. Create all nodes
-        jsonNodes = fileContent["Nodes"]
-        newNodes = []
-        hasUnknownNodes = False
-        for jsonNode in jsonNodes:
-            node = self.nodeMgr.createNode(jsonNode["type"])
-            if node is None:
-                logging.error(f"Couldn't load node of type: {jsonNode['type']}")
-                hasUnknownNodes = True
-                continue
-            node.nodeID = UUID(jsonNode["id"])
-            node.setPos(eval(jsonNode["pos"]))
-            for i in range(len(jsonNode["inSockets"])):
-                inSocket = jsonNode["inSockets"][i]
-                node.inputList[i].socketID = UUID(inSocket["id"])
-                if "value" in inSocket:
-                    node.inputList[i].setValue(inSocket["value"])
-            for i in range(len(jsonNode["outSockets"])):
-                outSocket = jsonNode["outSockets"][i]
-                node.outputList[i].socketID = UUID(outSocket["id"])
-            node.show()
-            newNodes.append(node)
-
-        if hasUnknownNodes:
-            logging.info("Some nodes could not be loaded. Make sure all node extensions are available.")
-
-        # 2. Connect all nodes
-        jsonConnections = fileContent["Connections"]
-        for jsonConnection in jsonConnections:
-            # we have a connection of one of the to be copied nodes
-            nodeA = None
-            nodeB = None
-
-            for node in newNodes:
-                if node.nodeID == UUID(jsonConnection["nodeA_ID"]):
-                    nodeA = node
-                elif node.nodeID == UUID(jsonConnection["nodeB_ID"]):
-                    nodeB = node
-
-            if nodeA is None or nodeB is None:
-                logging.error(f"could not connect nodes: {nodeA} - {nodeB}")
-                continue
-
-            socketA = None
-            socketB = None
-            for socket in nodeA.inputList + nodeA.outputList + nodeB.inputList + nodeB.outputList:
-                if socket.socketID == UUID(jsonConnection["socketA_ID"]):
-                    socketA = socket
-                elif socket.socketID == UUID(jsonConnection["socketB_ID"]):
-                    socketB = socket
-
-            self.nodeMgr.connectPlugs(socketA, socketB)
-
-        # 3. Run logic from all leave nodes down to the end
-        self.nodeMgr.updateAllLeaveNodes()
-
-        base.messenger.send("NodeEditor_set_clean")
-
-        base.messenger.send("setLastPath", [path])
-
+        StreamLoader(self.nodeMgr, path).start()
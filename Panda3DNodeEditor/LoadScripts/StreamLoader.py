@@ -0,0 +1,208 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import time
+import logging
+
+from direct.showbase.DirectObject import DirectObject
+from direct.gui.DirectFrame import DirectFrame
+from direct.gui.DirectWaitBar import DirectWaitBar
+from direct.gui.DirectButton import DirectButton
+
+from Panda3DNodeEditor.Tools.JSONStreamReader import JSONStreamReader
+from Panda3DNodeEditor.Tools.BinaryTools import MAGIC
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+
+class StreamLoader(DirectObject):
+    """Loads a project file over multiple frames.
+
+    The file is parsed element by element and nodes are created in a
+    task which only works for frameBudget seconds each frame, so the
+    editor stays responsive and the first nodes show up right away.
+    Connections are wired once all nodes exist and the logic is run a
+    single time at the very end. The work of each frame is done in a
+    batch of the node manager, so the new nodes are laid out together
+    once per frame. A progress bar with a cancel button is
+    shown while loading, canceling clears the editor again.
+
+    Binary project files are decoded at once as they are fast to read,
+    only the creation of their nodes is spread over multiple frames. The
+    same is done for projects with a journal, which has to be applied to
+    the whole file content before creating any nodes."""
+    def __init__(self, nodeMgr, path, frameBudget=0.01):
+        DirectObject.__init__(self)
+        self.nodeMgr = nodeMgr
+        self.path = path
+        self.frameBudget = frameBudget
+
+        self.infile = None
+        self.reader = None
+        self.items = None
+        self.builder = GraphBuilder(nodeMgr)
+        self.connections = []
+        self.connectionsDone = 0
+        self.fileSize = 1
+        # number of elements of binary files
+        self.itemsDone = 0
+        self.itemsTotal = 1
+
+        self.frame = None
+        self.progressBar = None
+
+    def start(self):
+        """Open the file and start the loading task"""
+        try:
+            self.fileSize = max(1, os.path.getsize(self.path))
+            with open(self.path, 'rb') as infile:
+                isBinary = infile.read(len(MAGIC)) == MAGIC
+            journalTools = JournalTools()
+            if isBinary or os.path.exists(journalTools.getJournalPath(self.path)):
+                fileContent = journalTools.loadProject(self.path)
+                self.items = self.iterContent(fileContent)
+            else:
+                self.infile = open(self.path, 'r')
+                self.reader = JSONStreamReader(self.infile)
+                self.items = self.reader.iterate()
+        except Exception as e:
+            print("Couldn't load project file {}".format(self.path))
+            print(e)
+            return
+
+        self.createProgressBar()
+        self.accept("NodeEditor_cancelLoad", self.cancel)
+        taskMgr.add(self.loadTask, "NodeEditor_streamLoad")
+
+    def createProgressBar(self):
+        self.frame = DirectFrame(
+            frameColor=(0.25, 0.25, 0.25, 1),
+            frameSize=(-0.6, 0.6, -0.2, 0.15),
+            parent=base.aspect2d)
+        self.progressBar = DirectWaitBar(
+            text="Loading nodes",
+            text_scale=0.05,
+            text_pos=(0, 0.07),
+            text_fg=(1, 1, 1, 1),
+            value=0,
+            range=100,
+            barColor=(0.45, 0.45, 0.45, 1),
+            frameSize=(-0.5, 0.5, -0.02, 0.02),
+            parent=self.frame)
+        DirectButton(
+            text="Cancel",
+            text_scale=0.05,
+            pad=(0.02, 0.02),
+            pos=(0, 0, -0.13),
+            command=base.messenger.send,
+            extraArgs=["NodeEditor_cancelLoad"],
+            parent=self.frame)
+
+    def iterContent(self, fileContent):
+        """Yields the members of the already decoded file content the
+        same way the JSONStreamReader does"""
+        self.itemsTotal = max(1, sum(
+            len(value) if isinstance(value, list) else 1
+            for value in fileContent.values()))
+        for key, value in fileContent.items():
+            if isinstance(value, list):
+                for element in value:
+                    self.itemsDone += 1
+                    yield key, element
+            else:
+                self.itemsDone += 1
+                yield key, value
+
+    def loadTask(self, task):
+        deadline = time.perf_counter() + self.frameBudget
+        done = False
+        try:
+            with self.nodeMgr.batch():
+                while time.perf_counter() < deadline:
+                    if not self.step():
+                        done = True
+                        break
+            if done:
+                self.finish()
+                return task.done
+        except Exception:
+            logging.error(f"Couldn't load project file {self.path}", exc_info=True)
+            self.cancel()
+            return task.done
+        self.updateProgress()
+        return task.cont
+
+    def step(self):
+        """Process the next element of the file or connection. Returns
+        False once everything has been loaded"""
+        if self.items is not None:
+            item = next(self.items, None)
+            if item is None:
+                self.items = None
+                self.closeFile()
+                self.progressBar["text"] = "Connecting nodes"
+                return True
+            key, value = item
+            if key == "ProjectVersion":
+                self.builder.checkVersion(value)
+            elif key == "Nodes":
+                self.builder.addNode(value)
+            elif key == "Connections":
+                # connections can only be wired once all nodes exist
+                self.connections.append(value)
+            return True
+
+        if self.connectionsDone < len(self.connections):
+            self.builder.addConnection(self.connections[self.connectionsDone])
+            self.connectionsDone += 1
+            return True
+        return False
+
+    def updateProgress(self):
+        if self.items is not None:
+            # reading the file counts as the first 80% of the work
+            if self.reader is not None:
+                read = self.reader.charsRead / self.fileSize
+            else:
+                read = self.itemsDone / self.itemsTotal
+            self.progressBar["value"] = 80 * min(1, read)
+        else:
+            done = self.connectionsDone / max(1, len(self.connections))
+            self.progressBar["value"] = 80 + 20 * done
+
+    def finish(self):
+        self.cleanup()
+        if self.builder.hasUnknownNodes:
+            logging.info("Some nodes could not be loaded. Make sure all node extensions are available.")
+
+        # Run logic from all leave nodes down to the end
+        with self.nodeMgr.batch():
+            self.nodeMgr.updateAllLeaveNodes()
+
+        base.messenger.send("NodeEditor_set_clean")
+        base.messenger.send("setLastPath", [self.path])
+
+    def cancel(self):
+        """Stop loading and remove everything loaded so far"""
+        self.cleanup()
+        self.nodeMgr.cleanup()
+
+    def closeFile(self):
+        if self.infile is not None:
+            self.infile.close()
+            self.infile = None
+
+    def cleanup(self):
+        self.ignoreAll()
+        taskMgr.remove("NodeEditor_streamLoad")
+        self.items = None
+        self.closeFile()
+        if self.frame is not None:
+            self.frame.destroy()
+            self.frame = None
+            self.progressBar = None
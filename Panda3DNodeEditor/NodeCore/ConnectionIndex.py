@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import OUTSOCKET
+
+class ConnectionIndex:
+    """Lookup tables for the connectors of a node graph.
+
+    Connectors are indexed by the sockets they connect as well as by the
+    nodes they lead into and out of. Each table maps to an insertion
+    ordered dict, so adding, removing and finding connectors does not
+    depend on the total amount of connections in the graph."""
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # socket -> {connector: None}
+        self.socketConnectors = {}
+        # node -> {connector: (outSocket, inSocket)}
+        self.incoming = {}
+        self.outgoing = {}
+
+    def add(self, connector):
+        """Add the given connector to the index"""
+        sockets = self.getDirectedSockets(connector)
+        outSocket, inSocket = sockets
+        self.socketConnectors.setdefault(outSocket, {})[connector] = None
+        self.socketConnectors.setdefault(inSocket, {})[connector] = None
+        # both node tables share the same tuple
+        self.outgoing.setdefault(outSocket.node, {})[connector] = sockets
+        self.incoming.setdefault(inSocket.node, {})[connector] = sockets
+
+    def remove(self, connector):
+        """Remove the given connector from the index"""
+        outSocket, inSocket = self.getDirectedSockets(connector)
+        for table, key in (
+                (self.socketConnectors, outSocket),
+                (self.socketConnectors, inSocket),
+                (self.outgoing, outSocket.node),
+                (self.incoming, inSocket.node)):
+            entries = table.get(key)
+            if entries is None:
+                continue
+            entries.pop(connector, None)
+            if not entries:
+                del table[key]
+
+    def removeNode(self, node):
+        """Remove the node tables of the given node. The node must not
+        have any connectors left."""
+        self.incoming.pop(node, None)
+        self.outgoing.pop(node, None)
+        for socket in node.inputList + node.outputList:
+            self.socketConnectors.pop(socket, None)
+
+    def getDirectedSockets(self, connector):
+        """Returns the out and the in socket of the given connector"""
+        if connector.socketA.type == OUTSOCKET:
+            return connector.socketA, connector.socketB
+        return connector.socketB, connector.socketA
+
+    def getSocketConnectors(self, socket):
+        """Returns a list of all connectors attached to the given socket"""
+        return list(self.socketConnectors.get(socket, ()))
+
+    def isConnected(self, socket):
+        """Returns True if at least one connector is attached to the socket"""
+        return socket in self.socketConnectors
+
+    def getIncoming(self, node):
+        """Returns a list of all connectors leading into the given node"""
+        return list(self.incoming.get(node, ()))
+
+    def getOutgoing(self, node):
+        """Returns a list of all connectors leading out of the given node"""
+        return list(self.outgoing.get(node, ()))
+
+    def getNodeConnectors(self, node):
+        """Returns a list of all connectors attached to the given node"""
+        return self.getIncoming(node) + self.getOutgoing(node)
+
+    def findConnector(self, socketA, socketB):
+        """Returns the connector connecting the two given sockets or None"""
+        connectorsA = self.socketConnectors.get(socketA, {})
+        for connector in self.socketConnectors.get(socketB, ()):
+            if connector in connectorsA:
+                return connector
+        return None
@@ -0,0 +1,194 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import (
+    Geom,
+    GeomNode,
+    GeomLines,
+    GeomVertexData,
+    GeomVertexFormat,
+    GeomVertexWriter,
+    OmniBoundingVolume,
+    TransparencyAttrib,
+)
+from direct.showbase import ShowBaseGlobal
+
+DEFAULT_COLOR = (0.8, 0.8, 0.8, 1)
+HIDDEN_COLOR = (0, 0, 0, 0)
+
+class ConnectionChunk:
+    """A single GeomNode holding the vertices of a limited amount of
+    lines. Each line occupies one slot made up of two vertices."""
+    def __init__(self, parent, name, capacity):
+        self.capacity = capacity
+        # slot -> key of the line stored in that slot
+        self.keys = []
+
+        vdata = GeomVertexData(name, GeomVertexFormat.getV3c4(), Geom.UHDynamic)
+        prim = GeomLines(Geom.UHDynamic)
+        geom = Geom(vdata)
+        geom.addPrimitive(prim)
+        self.geomNode = GeomNode(name)
+        self.geomNode.addGeom(geom)
+        # the lines change all the time, don't recalculate the bounds
+        self.geomNode.setBounds(OmniBoundingVolume())
+        self.geomNode.setFinal(True)
+        self.np = parent.attachNewNode(self.geomNode)
+
+    def isFull(self):
+        return len(self.keys) >= self.capacity
+
+    def resize(self):
+        """Fit the vertex data and primitive to the amount of used slots"""
+        numVertices = len(self.keys) * 2
+        geom = self.geomNode.modifyGeom(0)
+        geom.modifyVertexData().setNumRows(numVertices)
+        geom.modifyPrimitive(0).setNonindexedVertices(0, numVertices)
+
+    def getWriters(self):
+        """Returns writers for the vertex and color columns"""
+        vdata = self.geomNode.modifyGeom(0).modifyVertexData()
+        return GeomVertexWriter(vdata, "vertex"), GeomVertexWriter(vdata, "color")
+
+    def destroy(self):
+        self.np.removeNode()
+        self.keys = []
+
+class ConnectionRenderer:
+    """Draws all connection lines of the editor in a few batched
+    GeomNodes instead of one node per line.
+
+    Lines are identified by an arbitrary hashable key, usually the
+    NodeConnector they belong to. Updating a line only rewrites its two
+    vertices in place and line colors are stored as vertex colors."""
+    def __init__(self, parent, thickness=2, chunkSize=4096, sort=0):
+        self.parent = parent
+        self.chunkSize = chunkSize
+        self.root = parent.attachNewNode("connections", sort)
+        self.root.setRenderModeThickness(thickness)
+        self.root.setTransparency(TransparencyAttrib.M_alpha)
+        self.chunks = []
+        # key -> [chunk, slot, start, end, color, visible]
+        self.lines = {}
+
+    def __getFreeChunk(self):
+        for chunk in self.chunks:
+            if not chunk.isFull():
+                return chunk
+        chunk = ConnectionChunk(
+            self.root, f"connections_{len(self.chunks)}", self.chunkSize)
+        self.chunks.append(chunk)
+        return chunk
+
+    def __writeSlot(self, vertex, color, line):
+        chunk, slot, start, end, lineColor, visible = line
+        vertex.setRow(slot * 2)
+        vertex.setData3f(start[0], start[1], start[2])
+        vertex.setData3f(end[0], end[1], end[2])
+        color.setRow(slot * 2)
+        c = lineColor if visible else HIDDEN_COLOR
+        color.setData4f(c[0], c[1], c[2], c[3])
+        color.setData4f(c[0], c[1], c[2], c[3])
+
+    def add(self, key, start, end, color=DEFAULT_COLOR):
+        """Add a new line from start to end identified by key"""
+        if key in self.lines:
+            self.setLine(key, start, end)
+            self.setColor(key, color)
+            return
+        chunk = self.__getFreeChunk()
+        line = [chunk, len(chunk.keys), tuple(start), tuple(end), tuple(color), True]
+        chunk.keys.append(key)
+        self.lines[key] = line
+        chunk.resize()
+        self.__writeSlot(*chunk.getWriters(), line)
+
+    def remove(self, key):
+        """Remove the line identified by key"""
+        line = self.lines.pop(key, None)
+        if line is None:
+            return
+        chunk, slot = line[0], line[1]
+        lastKey = chunk.keys.pop()
+        if lastKey is not key:
+            # move the last line of the chunk into the freed slot
+            chunk.keys[slot] = lastKey
+            lastLine = self.lines[lastKey]
+            lastLine[1] = slot
+            self.__writeSlot(*chunk.getWriters(), lastLine)
+        chunk.resize()
+
+    def has(self, key):
+        return key in self.lines
+
+    def setLine(self, key, start, end):
+        """Move the line identified by key to the given positions"""
+        line = self.lines[key]
+        line[2] = tuple(start)
+        line[3] = tuple(end)
+        self.__writeSlot(*line[0].getWriters(), line)
+
+    def setLines(self, lines):
+        """Update many lines at once. lines is an iterable of
+        (key, start, end) tuples."""
+        writers = {}
+        for key, start, end in lines:
+            line = self.lines[key]
+            line[2] = tuple(start)
+            line[3] = tuple(end)
+            chunk = line[0]
+            if chunk not in writers:
+                writers[chunk] = chunk.getWriters()
+            self.__writeSlot(*writers[chunk], line)
+
+    def setColor(self, key, color):
+        """Set the color of the line identified by key"""
+        line = self.lines[key]
+        color = tuple(color)
+        if line[4] == color:
+            return
+        line[4] = color
+        self.__writeSlot(*line[0].getWriters(), line)
+
+    def setVisible(self, key, visible):
+        """Show or hide the line identified by key"""
+        line = self.lines[key]
+        if line[5] == visible:
+            return
+        line[5] = visible
+        self.__writeSlot(*line[0].getWriters(), line)
+
+    def setThickness(self, thickness):
+        self.root.setRenderModeThickness(thickness)
+
+    def show(self):
+        self.root.show()
+
+    def hide(self):
+        self.root.hide()
+
+    def clear(self):
+        """Remove all lines"""
+        for chunk in self.chunks:
+            chunk.destroy()
+        self.chunks = []
+        self.lines = {}
+
+    def destroy(self):
+        self.clear()
+        self.root.removeNode()
+
+defaultRenderer = None
+
+def getDefaultRenderer():
+    """Returns a renderer drawing to aspect2d which is shared by all
+    connectors that have not been given a dedicated renderer"""
+    global defaultRenderer
+    if defaultRenderer is None:
+        defaultRenderer = ConnectionRenderer(ShowBaseGlobal.aspect2d)
+    return defaultRenderer
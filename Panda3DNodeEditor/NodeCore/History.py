@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+import time
+import logging
+from uuid import UUID
+
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import INSOCKET
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+
+# records which undo each other
+INVERSE_OPS = {
+    "addNode": "removeNode",
+    "removeNode": "addNode",
+    "connect": "disconnect",
+    "disconnect": "connect"}
+
+class History:
+    """Undo and redo stack of the changes made in a node manager.
+
+    Every change set passed to the mutation listeners of the node manager
+    becomes one entry. Entries are stored as JSON strings which only hold
+    the ids, positions and values needed to revert the change, so even
+    undoing the removal of many nodes doesn't keep any node objects
+    alive. The oldest entries are dropped once all entries together take
+    more than maxBytes.
+
+    Value edits of the same socket and moves of the same nodes following
+    each other within coalesceTime seconds are merged into one entry, so
+    holding a spinbox button or dragging a node in multiple steps can be
+    undone at once."""
+    def __init__(self, nodeMgr, maxBytes=16*1024*1024, coalesceTime=1.0):
+        self.nodeMgr = nodeMgr
+        self.maxBytes = maxBytes
+        self.coalesceTime = coalesceTime
+
+        # entries are lists of [key, time, data]
+        self.undoStack = []
+        self.redoStack = []
+        self.usedBytes = 0
+        # set while changes of the history itself are applied
+        self.applying = False
+
+        self.nodeMgr.addMutationListener(self.addChangeSet)
+
+    def clear(self):
+        self.undoStack = []
+        self.redoStack = []
+        self.usedBytes = 0
+
+    def canUndo(self):
+        return len(self.undoStack) > 0
+
+    def canRedo(self):
+        return len(self.redoStack) > 0
+
+    def getCoalesceKey(self, changeSet):
+        """Returns a key which is equal for change sets that can be
+        merged or None if the change set can't be merged"""
+        ops = {record["op"] for record in changeSet}
+        if ops == {"value"} and len(changeSet) == 1:
+            return ("value", changeSet[0]["socket"])
+        if ops == {"move"}:
+            return ("move", frozenset(record["id"] for record in changeSet))
+        return None
+
+    def addChangeSet(self, changeSet):
+        if self.applying:
+            return
+        self.redoStack = []
+
+        key = self.getCoalesceKey(changeSet)
+        now = time.monotonic()
+        if key is not None and self.undoStack:
+            lastKey, lastTime, lastData = self.undoStack[-1]
+            if lastKey == key and now - lastTime < self.coalesceTime:
+                # keep the start state of the last entry
+                startStates = {
+                    record.get("socket", record.get("id")): record["from"]
+                    for record in json.loads(lastData)}
+                changeSet = [
+                    dict(record, **{"from": startStates[record.get("socket", record.get("id"))]})
+                    for record in changeSet]
+                self.usedBytes -= len(lastData)
+                self.undoStack.pop()
+
+        data = json.dumps(changeSet)
+        self.undoStack.append([key, now, data])
+        self.usedBytes += len(data)
+
+        while self.usedBytes > self.maxBytes and len(self.undoStack) > 1:
+            self.usedBytes -= len(self.undoStack.pop(0)[2])
+
+    def undo(self):
+        if not self.undoStack:
+            return
+        entry = self.undoStack.pop()
+        self.usedBytes -= len(entry[2])
+        changeSet = json.loads(entry[2])
+        self.apply([self.invert(record) for record in reversed(changeSet)])
+        self.redoStack.append(entry)
+
+    def redo(self):
+        if not self.redoStack:
+            return
+        entry = self.redoStack.pop()
+        self.apply(json.loads(entry[2]))
+        # don't merge with changes following the redo
+        entry[0] = None
+        self.undoStack.append(entry)
+        self.usedBytes += len(entry[2])
+
+    def invert(self, record):
+        """Returns the record reverting the given record"""
+        op = record["op"]
+        if op in INVERSE_OPS:
+            return dict(record, op=INVERSE_OPS[op])
+        return dict(record, **{"from": record["to"], "to": record["from"]})
+
+    def apply(self, changeSet):
+        """Apply the given records to the graph of the node manager and
+        pass them on to the other mutation listeners"""
+        nodeMgr = self.nodeMgr
+        builder = GraphBuilder(nodeMgr)
+        builder.nodes = {str(node.nodeID): node for node in nodeMgr.nodeList}
+        builder.sockets = {
+            str(socket.socketID): socket
+            for node in nodeMgr.nodeList
+            for socket in node.inputList + node.outputList}
+        connectors = {str(connector.connectorID): connector for connector in nodeMgr.connections}
+
+        # nodes which need their logic or layout updated
+        affectedNodes = set()
+        movedNodes = []
+        removedConnectors = []
+        removedNodes = []
+
+        nodeMgr.mutationsSuppressed += 1
+        try:
+            for record in changeSet:
+                op = record["op"]
+                if op == "addNode":
+                    node = builder.addNode(record["node"])
+                    if node is not None:
+                        affectedNodes.add(node)
+                elif op == "removeNode":
+                    node = builder.nodes.pop(record["node"]["id"], None)
+                    if node is not None:
+                        removedNodes.append(node)
+                        for socket in node.inputList + node.outputList:
+                            builder.sockets.pop(str(socket.socketID), None)
+                elif op == "connect":
+                    connector = builder.addConnection(record["connection"])
+                    if connector is not None:
+                        connector.connectorID = UUID(record["connection"]["id"])
+                        connectors[record["connection"]["id"]] = connector
+                        affectedNodes.add(connector.socketA.node)
+                        affectedNodes.add(connector.socketB.node)
+                elif op == "disconnect":
+                    connector = connectors.pop(record["connection"]["id"], None)
+                    if connector is not None:
+                        removedConnectors.append(connector)
+                elif op == "move":
+                    node = builder.nodes.get(record["id"])
+                    if node is not None:
+                        node.setPos(builder.jsonTools.getPos(record["to"]))
+                        movedNodes.append(node)
+                elif op == "value":
+                    socket = builder.sockets.get(record["socket"])
+                    if socket is not None:
+                        socket.setValue(record["to"])
+                        socket.commitValue()
+                        affectedNodes.add(socket.node)
+                else:
+                    logging.warning(f"Can't apply unknown change {op}")
+
+            # remove all connectors at once as removing them one by one
+            # has to search the connection list each time
+            nodeMgr.removeConnectors(removedConnectors)
+            for connector in removedConnectors:
+                for socket in (connector.socketA, connector.socketB):
+                    if socket.type is INSOCKET:
+                        socket.value = None
+                    affectedNodes.add(socket.node)
+
+            if removedNodes:
+                # the connectors of these nodes have already been removed
+                # by the disconnect records preceding the removal
+                nodeMgr.removeNode(removedNodes)
+        finally:
+            nodeMgr.mutationsSuppressed -= 1
+
+        affectedNodes.difference_update(removedNodes)
+        nodeMgr.evaluator.evaluate(affectedNodes)
+        if movedNodes:
+            base.messenger.send("NodeEditor_updateConnections", [movedNodes])
+
+        self.applying = True
+        try:
+            nodeMgr.notifyMutation(changeSet)
+        finally:
+            self.applying = False
+        base.messenger.send("NodeEditor_set_dirty")
@@ -6,28 +6,72 @@ Simplified BSD (BSD 2-Clause) License.
 See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
 """
 from uuid import uuid4
-from direct.showbase import ShowBaseGlobal
-from direct.directtools.DirectGeometry import LineNodePath
+
+from Panda3DNodeEditor.NodeCore.ConnectionRenderer import (
+    getDefaultRenderer,
+    DEFAULT_COLOR)
+
+CHECKED_COLOR = (0, 1, 0, 1)
+ERROR_COLOR = (1, 0, 0, 1)
 
 class NodeConnector:
-    def __init__(self, socketA, socketB):
-        self.connectorID = uuid4()
+    """Connects an output with an input socket. Connectors between
+    sockets without a GUI are not drawn until attachView is called."""
+    __slots__ = ("_connectorID", "socketA", "socketB", "renderer")
+
+    def __init__(self, socketA, socketB, renderer=None):
+        # the id is only created once it is needed
+        self._connectorID = None
         self.socketA = socketA
         self.socketB = socketB
-        self.line = LineNodePath(ShowBaseGlobal.aspect2d, thickness=2, colorVec=(0.8,0.8,0.8,1))
-        self.draw()
+        self.renderer = None
+        if renderer is None and socketA.plug is not None:
+            renderer = getDefaultRenderer()
+        if renderer is not None:
+            self.attachView(renderer)
+
+    @property
+    def connectorID(self):
+        if self._connectorID is None:
+            self._connectorID = uuid4()
+        return self._connectorID
 
-        self.show = self.line.show
-        self.hide = self.line.hide
+    @connectorID.setter
+    def connectorID(self, connectorID):
+        self._connectorID = connectorID
+
+    def attachView(self, renderer):
+        """Start drawing this connector with the given renderer"""
+        if self.renderer is not None:
+            return
+        self.renderer = renderer
+        self.renderer.add(self, *self.getLinePoints(), DEFAULT_COLOR)
+
+    def getLinePoints(self):
+        """Returns the start and end point of the line as seen from the
+        renderers parent"""
+        parent = self.renderer.parent
+        return (
+            self.socketA.plug.getPos(parent),
+            self.socketB.plug.getPos(parent))
 
     def update(self):
-        self.line.reset()
         self.draw()
 
     def draw(self):
-        self.line.moveTo(self.socketA.plug.getPos(ShowBaseGlobal.aspect2d))
-        self.line.drawTo(self.socketB.plug.getPos(ShowBaseGlobal.aspect2d))
-        self.line.create()
+        if self.renderer is None:
+            return
+        self.renderer.setLine(self, *self.getLinePoints())
+
+    def show(self):
+        if self.renderer is None:
+            return
+        self.renderer.setVisible(self, True)
+
+    def hide(self):
+        if self.renderer is None:
+            return
+        self.renderer.setVisible(self, False)
 
     def has(self, socket):
         """Returns True if one of the sockets this connector connects is
@@ -39,17 +83,20 @@ class NodeConnector:
         return (a == self.socketA or a == self.socketB) and (b == self.socketA or b == self.socketB)
 
     def disconnect(self):
-        self.line.reset()
+        if self.renderer is not None:
+            self.renderer.remove(self)
         self.socketA.setConnected(False)
         self.socketB.setConnected(False)
 
     def setChecked(self):
-        self.line.setColor(0,1,0,1)
-        self.update()
+        if self.renderer is None:
+            return
+        self.renderer.setColor(self, CHECKED_COLOR)
 
     def setError(self, hasError):
-        self.line.setColor(1,0,0,1)
-        self.update()
+        if self.renderer is None:
+            return
+        self.renderer.setColor(self, ERROR_COLOR)
 
     def __str__(self):
         return f"Connection {self.socketA.name} to {self.socketB.name}"
@@ -0,0 +1,220 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+
+class NodeEvaluator:
+    """Runs the logic of the nodes managed by the given node manager.
+
+    A topologically sorted schedule is built from the connections of the
+    graph and cached until the connections change. Nodes which need to be
+    re-evaluated are flagged dirty and on evaluation only the dirty nodes
+    and the nodes downstream of them will have their logic called, each
+    of them exactly once and after all of its inputs have been set.
+
+    Nodes which are part of a cycle can not be sorted. They will still be
+    evaluated once per run, but the connectors forming the cycle will be
+    flagged with an error and the cycles are logged and stored in
+    self.cycles.
+
+    While suspended, nodes passed for evaluation are only flagged dirty
+    and all of them are evaluated at once when the evaluator is resumed.
+
+    Evaluating only passes values between sockets. If a ViewSync is set,
+    the evaluated nodes and the states of the traversed connectors are
+    handed to it to update the widgets later on, otherwise connectors are
+    colored right away."""
+    def __init__(self, nodeMgr):
+        self.nodeMgr = nodeMgr
+
+        # node -> position in the evaluation schedule
+        self.order = {}
+        # list of node lists, each list containing the nodes of one cycle
+        self.cycles = []
+        # connectors that connect nodes of the same cycle
+        self.cyclicConnectors = set()
+
+        self.dirtyNodes = set()
+        self.scheduleValid = False
+        # evaluations are deferred while this is greater than 0
+        self.suspended = 0
+
+        # NodeProfiler timing the logic of each node if enabled
+        self.profiler = None
+        # ViewSync updating the widgets of evaluated nodes
+        self.viewSync = None
+
+    def invalidate(self):
+        """Mark the cached schedule as outdated. Must be called whenever
+        connections or nodes are added or removed."""
+        self.scheduleValid = False
+
+    def markDirty(self, node):
+        """Flag the given node to be evaluated on the next run"""
+        self.dirtyNodes.add(node)
+
+    def discard(self, nodes):
+        """Remove the flag of the given nodes, must be called for nodes
+        removed from the graph"""
+        self.dirtyNodes.difference_update(nodes)
+        if self.profiler is not None:
+            self.profiler.discard(nodes)
+
+    def suspend(self):
+        """Defer all evaluations until resume has been called as often
+        as this method"""
+        self.suspended += 1
+
+    def resume(self):
+        """Evaluate all nodes flagged while suspended once the last
+        suspension ends"""
+        self.suspended -= 1
+        if self.suspended == 0:
+            self.evaluate()
+
+    def buildSchedule(self):
+        """Build the evaluation order from the current connections of the
+        node manager"""
+        outgoing = self.nodeMgr.connectionIndex.outgoing
+        nodes = list(self.nodeMgr.nodeList)
+        components = self.__stronglyConnectedComponents(nodes)
+
+        # Tarjan yields the components in reverse topological order
+        self.order = {}
+        self.cycles = []
+        self.cyclicConnectors = set()
+        position = 0
+        for component in reversed(components):
+            for node in component:
+                self.order[node] = position
+                position += 1
+            if len(component) > 1:
+                self.cycles.append(component)
+                members = set(component)
+                for node in component:
+                    for connector, (outSocket, inSocket) in outgoing.get(node, {}).items():
+                        if inSocket.node in members:
+                            self.cyclicConnectors.add(connector)
+
+        if self.cycles:
+            for cycle in self.cycles:
+                logging.warning(
+                    "Found cycle in node graph: {}".format(
+                        " -> ".join(node.name for node in cycle)))
+
+        self.scheduleValid = True
+
+    def __stronglyConnectedComponents(self, nodes):
+        """Iterative version of Tarjans algorithm, returns the strongly
+        connected components of the graph in reverse topological order"""
+        outgoing = self.nodeMgr.connectionIndex.outgoing
+        index = {}
+        lowLink = {}
+        onStack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in nodes:
+            if root in index:
+                continue
+            work = [(root, iter(outgoing.get(root, {}).items()))]
+            index[root] = lowLink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack.add(root)
+            while work:
+                node, edges = work[-1]
+                descended = False
+                for connector, (outSocket, inSocket) in edges:
+                    child = inSocket.node
+                    if child not in index:
+                        index[child] = lowLink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        onStack.add(child)
+                        work.append((child, iter(outgoing.get(child, {}).items())))
+                        descended = True
+                        break
+                    elif child in onStack:
+                        lowLink[node] = min(lowLink[node], index[child])
+                if descended:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowLink[parent] = min(lowLink[parent], lowLink[node])
+                if lowLink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    component.reverse()
+                    components.append(component)
+        return components
+
+    def getDownstreamNodes(self, nodes):
+        """Returns a set of the given nodes and all nodes connected to
+        their outputs down to the last connected node"""
+        outgoing = self.nodeMgr.connectionIndex.outgoing
+        found = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node in found:
+                continue
+            found.add(node)
+            for connector, (outSocket, inSocket) in outgoing.get(node, {}).items():
+                if inSocket.node not in found:
+                    stack.append(inSocket.node)
+        return found
+
+    def evaluate(self, nodes=None):
+        """Evaluate the given nodes, all nodes flagged dirty and all nodes
+        downstream of them in topological order"""
+        if nodes is not None:
+            self.dirtyNodes.update(nodes)
+        if self.suspended > 0 or not self.dirtyNodes:
+            return
+        if not self.scheduleValid:
+            self.buildSchedule()
+
+        affected = self.getDownstreamNodes(self.dirtyNodes)
+        self.dirtyNodes = set()
+
+        # nodes which have been created after the schedule was built
+        # can't have connections yet, hence they can run first
+        order = self.order
+        outgoing = self.nodeMgr.connectionIndex.outgoing
+        schedule = sorted(affected, key=lambda node: order.get(node, -1))
+
+        profiler = self.profiler
+        viewSync = self.viewSync
+        if profiler is not None:
+            profiler.beginPropagation()
+        for node in schedule:
+            if profiler is None:
+                node.logic()
+            else:
+                profiler.runLogic(node)
+            for connector, (outSocket, inSocket) in outgoing.get(node, {}).items():
+                inSocket.receiveValue(outSocket.getValue())
+                hasError = connector in self.cyclicConnectors
+                if viewSync is not None:
+                    viewSync.setConnectorState(connector, hasError)
+                elif hasError:
+                    connector.setError(True)
+                else:
+                    connector.setChecked()
+        if viewSync is not None:
+            viewSync.addNodes(schedule)
+        if profiler is not None:
+            profiler.endPropagation()
@@ -7,21 +7,42 @@ See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
 """
 
 import logging
+from contextlib import contextmanager
+
+from panda3d.core import Point3
+from direct.showbase import ShowBaseGlobal
 
-import Panda3DNodeEditor
-from Panda3DNodeEditor import NodeCore
-from Panda3DNodeEditor.NodeCore.Nodes import *
 from Panda3DNodeEditor.NodeCore.Nodes.NodeBase import NodeBase
-from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import OUTSOCKET, INSOCKET
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import (
+    OUTSOCKET,
+    INSOCKET,
+    LOD_FULL,
+    LOD_SIMPLE)
 from Panda3DNodeEditor.NodeCore.NodeConnector import NodeConnector
+from Panda3DNodeEditor.NodeCore.ConnectionIndex import ConnectionIndex
+from Panda3DNodeEditor.NodeCore.ConnectionRenderer import ConnectionRenderer
+from Panda3DNodeEditor.NodeCore.NodeEvaluator import NodeEvaluator
+from Panda3DNodeEditor.NodeCore.SpatialIndex import SpatialIndex
+from Panda3DNodeEditor.NodeCore.NodeRegistry import NodeRegistry
+from Panda3DNodeEditor.NodeCore.History import History
+from Panda3DNodeEditor.NodeCore.NodePool import NodePool
+from Panda3DNodeEditor.NodeCore.ViewSync import ViewSync
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
 
 class NodeManager:
-    def __init__(self, nodeViewNP=None, customNodeMap=None):
+    def __init__(self, nodeViewNP=None, customNodeMap=None, historyMaxBytes=16*1024*1024):
         # Node Management
         self.nodeList = []
 
         # Socket connection Management
         self.connections = []
+        self.connectionIndex = ConnectionIndex()
+        # The lines are drawn relative to the node view, so panning and
+        # zooming the view doesn't require any line updates. Draw them
+        # after the nodes as they have been drawn on top of them before.
+        self.connectionRenderer = ConnectionRenderer(
+            nodeViewNP if nodeViewNP is not None else ShowBaseGlobal.aspect2d,
+            sort=1000)
         self.startSocket = None
         self.endSocket = None
 
@@ -30,18 +51,75 @@ class NodeManager:
 
         self.nodeViewNP = nodeViewNP
 
+        # Node bounds as seen from the node view for fast hit tests
+        self.spatialIndex = SpatialIndex()
+
+        # Viewport culling
+        self.cullingEnabled = False
+        # the visible area of the node view including a margin
+        self.viewRect = None
+        # nodes currently attached to and stashed from the scene graph
+        self.shownNodes = set()
+        self.culledNodes = set()
+
+        # Level of detail all nodes are drawn with
+        self.lod = LOD_FULL
+
         self.customNodeMap = customNodeMap
+        self.nodeRegistry = NodeRegistry(customNodeMap)
+
+        # Logic evaluation
+        self.evaluator = NodeEvaluator(self)
+        # widgets are updated with the evaluation results once per frame
+        self.viewSync = ViewSync()
+        self.evaluator.viewSync = self.viewSync
+
+        # Removed nodes kept for reuse
+        self.nodePool = NodePool()
+
+        # Mutation tracking
+        # functions called with the list of records describing each
+        # change made by the user
+        self.mutationListeners = []
+        # listeners won't be notified while this is greater than 0
+        self.mutationsSuppressed = 0
+        self.jsonTools = JSONTools()
+
+        # Undo and redo
+        self.history = History(self, historyMaxBytes)
+
+        # Batched changes
+        self.batchDepth = 0
+        self.batchDirty = False
+        # nodes which need their layout updated at the end of the batch
+        self.batchLayoutNodes = {}
+        self.batchLayoutAll = False
+
+        # Deferred node updates
+        # nodes waiting to be updated before the next frame is rendered
+        self.pendingUpdates = {}
+        self.updateNodesTaskName = f"NodeEditor_updateNodes-{id(self)}"
 
     def cleanup(self):
         self.deselectAll()
         self.removeAllNodes()
+        # the pooled nodes would keep their frames in the node view
+        self.nodePool.clear()
+        self.pendingUpdates = {}
+        taskMgr.remove(self.updateNodesTaskName)
 
         self.startSocket = None
         self.endSocket = None
 
         self.nodeList = []
         self.connections = []
+        self.connectionIndex.clear()
+        self.spatialIndex.clear()
+        self.shownNodes = set()
+        self.culledNodes = set()
         self.selectedNodes = []
+        self.evaluator.invalidate()
+        self.history.clear()
 
         base.messenger.send("NodeEditor_set_clean")
 
@@ -56,29 +134,15 @@ class NodeManager:
         if the node could not be created.
         nodeType can be either a node class type or a string representing such a type"""
         if isinstance(nodeType, str):
-            try:
-                logging.debug(f"try load node from string: {nodeType}.Node")
-                nodeType = eval(nodeType + ".Node")
-            except:
-                logging.debug("loading custom node")
-                nodeClassName = nodeType.split(".")[-1]
-                # try for the custom nodes
-                for entry, customNodeType in self.customNodeMap.items():
-                    if type(customNodeType) == dict:
-                        for sub_entry, sub_customNodeType in customNodeType.items():
-                            if sub_customNodeType[0] == nodeClassName:
-                                nodeType = sub_customNodeType[1]
-                    else:
-                        if customNodeType[0] == nodeClassName:
-                            nodeType = customNodeType[1]
-                if nodeType is None:
-                    logging.error(f"couldn't add unknown node type: {nodeType}")
-                else:
-                    logging.debug(f"found Node type: {nodeType}")
+            typeName = nodeType
+            nodeType = self.nodeRegistry.resolve(typeName)
+            if nodeType is None:
+                logging.error(f"couldn't add unknown node type: {typeName}")
+                return None
         try:
-            node = nodeType(self.nodeViewNP)
+            node = self.__newNode(nodeType)
             self.nodeList.append(node)
-            base.messenger.send("NodeEditor_set_dirty")
+            self.setDirty()
             return node
         except Exception as e:
             logging.error("Failed to load node type", exc_info=True)
@@ -87,47 +151,108 @@ class NodeManager:
     def addNode(self, nodeType):
         """Create a node of the given type"""
         self.deselectAll()
-        node = None
         if isinstance(nodeType, str):
-            node = eval(nodeType + ".Node")(self.nodeViewNP)
-        else:
-            node = nodeType(self.nodeViewNP)
+            typeName = nodeType
+            nodeType = self.nodeRegistry.resolve(typeName)
+            if nodeType is None:
+                logging.error(f"couldn't add unknown node type: {typeName}")
+                return None
+        node = self.__newNode(nodeType)
         node.create()
         self.nodeList.append(node)
-        base.messenger.send("NodeEditor_set_dirty")
+        self.commitValues(node)
+        self.notifyMutation([self.getAddNodeRecord(node)])
+        self.setDirty()
+        return node
+
+    def __newNode(self, nodeType):
+        """Returns a node of the given type taken from the pool and set up
+        to be added to this manager"""
+        node = self.nodePool.create(nodeType, self.nodeViewNP)
+        node.nodeMgr = self
+        node.setLOD(self.lod)
         return node
 
     def removeNode(self, selectedNodes=[]):
         """Remove all selected nodes"""
+        with self.batch():
+            self.__removeNodes(selectedNodes)
+
+    def __removeNodes(self, selectedNodes):
         if selectedNodes == []:
             selectedNodes = self.selectedNodes
+        removedNodes = set(selectedNodes)
+
+        # collect the connectors of all removed nodes
+        removedConnectors = {}
+        for node in removedNodes:
+            for connector in self.connectionIndex.getNodeConnectors(node):
+                removedConnectors[connector] = None
+
+        changeSet = []
+        if self.isRecording():
+            changeSet = [self.getDisconnectRecord(connector) for connector in removedConnectors]
+            changeSet += [self.getRemoveNodeRecord(node) for node in selectedNodes]
+
+        # nodes which lost an input or output and need to be updated
+        affectedNodes = set()
+        inSockets = {}
+        for connector in removedConnectors:
+            for socket in (connector.socketA, connector.socketB):
+                if socket.node in removedNodes:
+                    continue
+                if socket.type is INSOCKET:
+                    socket.value = None
+                    inSockets[socket] = None
+                affectedNodes.add(socket.node)
+        self.removeConnectors(removedConnectors)
+
         for node in selectedNodes:
-            for connector in self.connections[:]:
-                if connector.socketA.node is node or connector.socketB.node is node:
-                    connector.disconnect()
-                    self.connections.remove(connector)
-                    # Update logic of the disconnected existing socket node
-                    if connector.socketA.node is node:
-                        self.updateSocketNodeLogic(connector.socketB)
-                    else:
-                        self.updateSocketNodeLogic(connector.socketA)
-            self.nodeList.remove(node)
-            node.destroy()
-            del node
+            self.connectionIndex.removeNode(node)
+            self.spatialIndex.remove(node)
+            self.shownNodes.discard(node)
+            self.culledNodes.discard(node)
+            self.nodePool.release(node)
+        self.nodeList[:] = [node for node in self.nodeList if node not in removedNodes]
+        self.selectedNodes = [node for node in self.selectedNodes if node not in removedNodes]
+        self.evaluator.invalidate()
+        self.evaluator.discard(removedNodes)
+        self.viewSync.discardNodes(removedNodes)
+        for node in removedNodes:
+            self.batchLayoutNodes.pop(node, None)
+
+        # Update logic of the disconnected existing socket nodes
+        self.evaluator.evaluate(affectedNodes)
+
+        if self.isRecording():
+            changeSet += [
+                self.getValueRecord(socket)
+                for socket in inSockets if not socket.connected]
+
+        if removedNodes:
+            self.setDirty()
+        self.notifyMutation(changeSet)
 
     def removeAllNodes(self):
         """Remove all nodes and connections that are currently in the editor"""
-
-        # Remove all connections
-        for connector in self.connections[:]:
-            connector.disconnect()
-            self.connections.remove(connector)
-
-        # Remove all nodes
-        for node in self.nodeList[:]:
-            self.nodeList.remove(node)
-            node.destroy()
-            del node
+        with self.batch():
+            # Remove all connections
+            for connector in self.connections:
+                connector.disconnect()
+            self.connections[:] = []
+            self.connectionIndex.clear()
+            self.evaluator.invalidate()
+
+            # Remove all nodes
+            for node in self.nodeList:
+                self.nodePool.release(node)
+            self.evaluator.discard(self.nodeList)
+            self.viewSync.clear()
+            self.batchLayoutNodes = {}
+            self.nodeList[:] = []
+            self.spatialIndex.clear()
+            self.shownNodes = set()
+            self.culledNodes = set()
 
         base.messenger.send("NodeEditor_set_clean")
 
@@ -148,7 +273,7 @@ class NodeManager:
         if selected:
             # Select
             # Only select if it's not already selected
-            if node not in self.selectedNodes:
+            if not node.selected:
                 node.select(True)
                 self.selectedNodes.append(node)
         else:
@@ -158,10 +283,13 @@ class NodeManager:
 
     def deselectAll(self, excludedNode=None):
         """Deselect all nodes"""
-        for node in self.nodeList:
-            if node is excludedNode: continue
+        keep = []
+        for node in self.selectedNodes:
+            if node is excludedNode:
+                keep.append(node)
+                continue
             node.select(False)
-        self.selectedNodes = []
+        self.selectedNodes = keep
 
     def copyNodes(self):
         """Copy all selected nodes (light copies) and start dragging
@@ -169,18 +297,26 @@ class NodeManager:
 
         if self.selectedNodes == []: return
 
+        with self.batch():
+            self.__copyNodes()
+
+    def __copyNodes(self):
         # a mapping of old to new nodes
         nodeMapping = {}
         socketMapping = {}
 
+        changeSet = []
+
         # create shallow copies of all nodes
         newNodeList = []
         for node in self.selectedNodes:
-            newNode = type(node)(self.nodeViewNP)
-            newNode.show()
+            newNode = self.__newNode(type(node))
             newNode.frame.setPos(node.frame.getPos())
+            newNode.show()
             newNodeList.append(newNode)
             self.nodeList.append(newNode)
+            self.commitValues(newNode)
+            changeSet.append(self.getAddNodeRecord(newNode))
             nodeMapping[node] = newNode
             for i in range(len(node.inputList)):
                 socketMapping[node.inputList[i]] = newNode.inputList[i]
@@ -188,20 +324,17 @@ class NodeManager:
                 socketMapping[node.outputList[i]] = newNode.outputList[i]
 
         # get connections of to be copied nodes
-        for connector in self.connections:
-            if connector.socketA.node in self.selectedNodes and connector.socketB.node in self.selectedNodes:
+        for node in self.selectedNodes:
+            for connector in self.connectionIndex.getOutgoing(node):
+                if connector.socketA.node not in nodeMapping \
+                or connector.socketB.node not in nodeMapping:
+                    continue
                 # we have a connection of one of the to be copied nodes
-                newNodeA = nodeMapping[connector.socketA.node]
-                newNodeB = nodeMapping[connector.socketB.node]
-
                 newSocketA = socketMapping[connector.socketA]
                 newSocketB = socketMapping[connector.socketB]
 
-                self.connectPlugs()
-                connector = NodeConnector(newSocketA, newSocketB)
-                self.connections.append(connector)
-                newSocketA.setConnected(True)
-                newSocketB.setConnected(True)
+                newConnector = self.connectSockets(newSocketA, newSocketB)
+                changeSet.append(self.getConnectRecord(newConnector))
 
         # deselect all nodes
         self.deselectAll()
@@ -218,8 +351,178 @@ class NodeManager:
 
         self.updateAllLeaveNodes()
 
+        self.notifyMutation(changeSet)
+        self.setDirty()
+
+    #-------------------------------------------------------------------
+    # BATCHED CHANGES
+    #-------------------------------------------------------------------
+    @contextmanager
+    def batch(self):
+        """Context manager for changing many nodes and connections at
+        once. Within it, the logic of nodes isn't run, layouts aren't
+        updated and the editor isn't marked dirty. Each of these is done
+        a single time for all changes when the outermost batch ends."""
+        self.beginBatch()
+        try:
+            yield self
+        finally:
+            self.endBatch()
+
+    def beginBatch(self):
+        if self.batchDepth == 0:
+            self.batchDirty = False
+            self.batchLayoutNodes = {}
+            self.batchLayoutAll = False
+        self.batchDepth += 1
+        self.evaluator.suspend()
+
+    def endBatch(self):
+        try:
+            # run the logic while still batching, so the layout changes
+            # caused by it will be done together with all others
+            self.evaluator.resume()
+        finally:
+            self.batchDepth -= 1
+        if self.batchDepth > 0:
+            return
+
+        if self.batchLayoutAll:
+            self.updateLayout()
+        elif self.batchLayoutNodes:
+            self.updateLayout(list(self.batchLayoutNodes))
+        self.batchLayoutNodes = {}
+        self.batchLayoutAll = False
+
+        if self.batchDirty:
+            self.batchDirty = False
+            base.messenger.send("NodeEditor_set_dirty")
+
+    def isBatching(self):
+        return self.batchDepth > 0
+
+    def setDirty(self):
+        """Mark the editor as having unsaved changes"""
+        if self.batchDepth > 0:
+            self.batchDirty = True
+            return
         base.messenger.send("NodeEditor_set_dirty")
 
+    #-------------------------------------------------------------------
+    # SPATIAL QUERIES
+    #-------------------------------------------------------------------
+    def getNodeBounds(self, node):
+        """Returns the (left, right, bottom, top) edges of the given node
+        as seen from the node view"""
+        pos = node.frame.getPos()
+        fs = node.frame["frameSize"]
+        return (
+            pos.getX() + fs[0], pos.getX() + fs[1],
+            pos.getZ() + fs[2], pos.getZ() + fs[3])
+
+    def updateNodeBounds(self, nodes=None):
+        """Update the stored bounds of the given nodes or of all nodes if
+        no nodes are given. Must be called after nodes have been moved or
+        resized."""
+        if nodes is None:
+            nodes = self.nodeList
+        for node in nodes:
+            if node.frame.isEmpty():
+                # the node has been destroyed in the meantime
+                continue
+            bounds = self.getNodeBounds(node)
+            self.spatialIndex.insert(node, bounds)
+            if self.cullingEnabled and self.viewRect is not None:
+                l, r, b, t = self.viewRect
+                self.__setNodeCulled(
+                    node,
+                    not (bounds[0] < r and bounds[1] > l and bounds[2] < t and bounds[3] > b))
+
+    def nodesInRect(self, left, right, bottom, top, np=None):
+        """Returns a list of all nodes intersecting the given rectangle.
+        The rectangle is seen from the given NodePath which defaults to
+        the node view."""
+        if np is not None and np != self.nodeViewNP:
+            a = self.nodeViewNP.getRelativePoint(np, Point3(left, 0, bottom))
+            b = self.nodeViewNP.getRelativePoint(np, Point3(right, 0, top))
+            left, right = min(a.getX(), b.getX()), max(a.getX(), b.getX())
+            bottom, top = min(a.getZ(), b.getZ()), max(a.getZ(), b.getZ())
+        return self.spatialIndex.query(left, right, bottom, top)
+
+    def nodeAt(self, x, z, np=None):
+        """Returns the node at the given position or None. The position is
+        seen from the given NodePath which defaults to the node view. If
+        multiple nodes overlap the position, the node added last will
+        be returned."""
+        if np is not None and np != self.nodeViewNP:
+            p = self.nodeViewNP.getRelativePoint(np, Point3(x, 0, z))
+            x, z = p.getX(), p.getZ()
+        nodes = self.spatialIndex.queryPoint(x, z)
+        return nodes[-1] if nodes else None
+
+    #-------------------------------------------------------------------
+    # LEVEL OF DETAIL
+    #-------------------------------------------------------------------
+    def setLOD(self, lod):
+        """Switch the level of detail of all nodes and connections"""
+        if lod == self.lod:
+            return
+        self.lod = lod
+        with self.batch():
+            for node in self.nodeList:
+                node.setLOD(lod)
+                # the sockets changed their size, so lay out the node now
+                node.update()
+            # connectors and bounds of all nodes are updated once the
+            # batch ends
+            self.updateLayout()
+        self.connectionRenderer.setThickness(1 if lod >= LOD_SIMPLE else 2)
+
+    #-------------------------------------------------------------------
+    # VIEWPORT CULLING
+    #-------------------------------------------------------------------
+    def setCulling(self, enabled):
+        """Enable or disable the culling of nodes outside of the view. When
+        disabled, all culled nodes will be shown again."""
+        if enabled == self.cullingEnabled:
+            return
+        self.cullingEnabled = enabled
+        if enabled:
+            self.shownNodes = set(self.nodeList) - self.culledNodes
+            if self.viewRect is not None:
+                self.cullNodes(*self.viewRect)
+        else:
+            for node in self.culledNodes:
+                node.setCulled(False)
+            self.culledNodes = set()
+            self.shownNodes = set()
+
+    def cullNodes(self, left, right, bottom, top):
+        """Stash all nodes outside the given area of the node view and
+        bring back all culled nodes inside of it. The cost only depends
+        on the amount of nodes in and recently leaving the area."""
+        self.viewRect = (left, right, bottom, top)
+        if not self.cullingEnabled:
+            return
+        visibleNodes = set(self.spatialIndex.query(left, right, bottom, top))
+        for node in self.shownNodes - visibleNodes:
+            self.__setNodeCulled(node, True)
+        for node in visibleNodes & self.culledNodes:
+            self.__setNodeCulled(node, False)
+
+    def __setNodeCulled(self, node, culled):
+        if culled:
+            if node in self.culledNodes:
+                return
+            self.shownNodes.discard(node)
+            self.culledNodes.add(node)
+        else:
+            if node in self.shownNodes:
+                return
+            self.culledNodes.discard(node)
+            self.shownNodes.add(node)
+        node.setCulled(culled)
+
     #-------------------------------------------------------------------
     # CONNECTION MANAGEMENT
     #-------------------------------------------------------------------
@@ -256,18 +559,23 @@ class NodeManager:
         if (self.startSocket.type == INSOCKET and self.startSocket.connected) \
         or (self.endSocket.type == INSOCKET and self.endSocket.connected):
             # check if this is our connection. If so, we want to disconnect
-            for connector in self.connections[:]:
-                if connector.connects(self.startSocket, self.endSocket):
-                    connector.disconnect()
-                    self.connections.remove(connector)
-
-                    # Update logic of the sockets' nodes
-                    self.updateDisconnectedNodesLogic(self.startSocket, self.endSocket)
-
-                    self.startSocket = None
-                    self.endSocket = None
-                    base.messenger.send("NodeEditor_set_dirty")
-                    return
+            connector = self.connectionIndex.findConnector(self.startSocket, self.endSocket)
+            if connector is not None:
+                changeSet = [self.getDisconnectRecord(connector)]
+                self.removeConnectors([connector])
+
+                # Update logic of the sockets' nodes
+                self.updateDisconnectedNodesLogic(self.startSocket, self.endSocket)
+
+                inSocket = self.startSocket if self.startSocket.type is INSOCKET else self.endSocket
+                if self.isRecording() and not inSocket.connected:
+                    changeSet.append(self.getValueRecord(inSocket))
+
+                self.startSocket = None
+                self.endSocket = None
+                self.notifyMutation(changeSet)
+                self.setDirty()
+                return
             if (self.startSocket.type == INSOCKET and not self.startSocket.allowMultiConnect) \
             or (self.endSocket.type == INSOCKET and not self.endSocket.allowMultiConnect):
                 return
@@ -277,24 +585,55 @@ class NodeManager:
         # The same applies to "IN" type sockets
         if self.startSocket.node is not self.endSocket.node \
         and self.startSocket.type != self.endSocket.type:
-            connector = NodeConnector(self.startSocket, self.endSocket)
-            self.connections.append(connector)
-            self.startSocket.setConnected(True)
-            self.endSocket.setConnected(True)
+            connector = self.connectSockets(self.startSocket, self.endSocket)
             outSocketNode = self.startSocket.node if self.startSocket.type is OUTSOCKET else self.endSocket.node
             self.updateConnectedNodes(outSocketNode)
             self.startSocket = None
             self.endSocket = None
-            base.messenger.send("NodeEditor_set_dirty")
+            self.notifyMutation([self.getConnectRecord(connector)])
+            self.setDirty()
             return connector
 
+    def connectSockets(self, socketA, socketB):
+        """Create a connector between the two given sockets without any
+        further checks or logic updates and return it"""
+        connector = NodeConnector(socketA, socketB, self.connectionRenderer)
+        self.connections.append(connector)
+        self.connectionIndex.add(connector)
+        socketA.setConnected(True)
+        socketB.setConnected(True)
+        self.evaluator.invalidate()
+        return connector
+
+    def removeConnectors(self, connectors):
+        """Disconnect and remove all given connectors"""
+        removed = dict.fromkeys(connectors)
+        if not removed:
+            return
+        sockets = {}
+        self.viewSync.discardConnectors(removed)
+        for connector in removed:
+            connector.disconnect()
+            self.connectionIndex.remove(connector)
+            sockets[connector.socketA] = None
+            sockets[connector.socketB] = None
+
+        if len(removed) == 1:
+            self.connections.remove(next(iter(removed)))
+        else:
+            self.connections[:] = [c for c in self.connections if c not in removed]
+
+        # sockets with multiple connections may still be connected
+        for socket in sockets:
+            if self.connectionIndex.isConnected(socket):
+                socket.setConnected(True)
+        self.evaluator.invalidate()
+
     def showConnections(self):
-        for connector in self.connections:
-            connector.show()
+        self.connectionRenderer.show()
 
     def hideConnections(self):
-        for connector in self.connections:
-            connector.hide()
+        self.connectionRenderer.hide()
 
     def updateAllLeaveNodes(self):
         leaves = []
@@ -302,73 +641,167 @@ class NodeManager:
             if node.isLeaveNode():
                 leaves.append(node)
 
-        for leave in leaves:
-            leave.logic()
-            self.updateConnectedNodes(leave)
+        self.evaluator.evaluate(leaves)
 
     def updateDisconnectedNodesLogic(self, socketA, socketB):
         """
         Updates the logic of the nodes of socket A and socket B.
         The respective input plug type sockets value will be set to None.
         """
-        # Update logic of out socket node
         outSocketNode = socketA.node if socketA.type is OUTSOCKET else socketB.node
-        outSocketNode.logic()
-        self.updateConnectedNodes(outSocketNode)
-
-        # Update logic of in socket node
         inSocketNode = socketA.node if socketA.type is INSOCKET else socketB.node
         inSocket = socketA if socketA.type is INSOCKET else socketB
         inSocket.value = None
-        inSocketNode.logic()
-        self.updateConnectedNodes(inSocketNode)
+        self.evaluator.evaluate([outSocketNode, inSocketNode])
 
     def updateSocketNodeLogic(self, socket):
         """Update the logic of the given node and all nodes connected
         down the given"""
         if socket.type is INSOCKET:
             socket.value = None
-        socket.node.logic()
-        self.updateConnectedNodes(socket.node)
+        self.evaluator.evaluate([socket.node])
 
     def updateConnectedNodes(self, leaveNode):
-        self.processedConnections = []
-        self.startNode = leaveNode
-        self.__updateConnectedNodes(leaveNode)
-
-    def __updateConnectedNodes(self, leaveNode):
-        """Update logic of all nodes connected the leave nodes
-        out sockets recursively down to the last connected node."""
-        for connector in self.connections:
-            for outSocket in leaveNode.outputList:
-                outSock = None
-                inSock = None
-
-                if connector.socketA is outSocket:
-                    inSock = connector.socketB
-                    outSock = connector.socketA
-                elif connector.socketB is outSocket:
-                    inSock = connector.socketA
-                    outSock = connector.socketB
-                else:
-                    continue
-
-                connector.setChecked()
-                outSock.node.logic()
-                inSock.setValue(outSock.getValue())
-                inSock.node.logic()
-
-                if connector in self.processedConnections:
-                    # this connector is leading to a recursion
-                    connector.setError(True)
-                    continue
-                self.processedConnections.append(connector)
-
-                self.__updateConnectedNodes(inSock.node)
-
-                self.processedConnections.remove(connector)
+        """Update logic of the given node and all nodes connected to its
+        out sockets down to the last connected node. Each node will be
+        evaluated exactly once."""
+        self.evaluator.evaluate([leaveNode])
+
+    def updateConnections(self, nodes=None):
+        """Update line positions of all connections attached to the given
+        nodes or of all connections if no nodes are given"""
+        if nodes is None:
+            connectors = self.connections
+        else:
+            connectors = {}
+            for node in nodes:
+                for connector in self.connectionIndex.getNodeConnectors(node):
+                    connectors[connector] = None
+        self.connectionRenderer.setLines(
+            (connector, *connector.getLinePoints())
+            for connector in connectors)
+
+    def requestNodeUpdate(self, node):
+        """Update the given node once before the next frame is rendered"""
+        if not self.pendingUpdates:
+            # run after the view sync and before the frame gets rendered
+            taskMgr.add(self.updatePendingNodes, self.updateNodesTaskName, sort=48)
+        self.pendingUpdates[node] = None
+
+    def cancelNodeUpdate(self, node):
+        self.pendingUpdates.pop(node, None)
+
+    def updatePendingNodes(self, task=None):
+        """Run all requested node updates now"""
+        nodes = self.pendingUpdates
+        self.pendingUpdates = {}
+        if task is None:
+            taskMgr.remove(self.updateNodesTaskName)
+        for node in nodes:
+            node.update()
+        if task is not None:
+            return task.done
+
+    def updateLayout(self, nodes=None):
+        """Update the connections and stored bounds of the given nodes or
+        of all nodes if none are given after they have been moved or
+        resized. Within a batch, the update is deferred to its end."""
+        if self.batchDepth > 0:
+            if nodes is None:
+                self.batchLayoutAll = True
+            elif not self.batchLayoutAll:
+                self.batchLayoutNodes.update(dict.fromkeys(nodes))
+            return
+        self.updateConnections(nodes)
+        self.updateNodeBounds(nodes)
 
-    def updateConnections(self, args=None):
-        """Update line positions of all connections"""
-        for connector in self.connections:
-            connector.update()
+    #-------------------------------------------------------------------
+    # MUTATION TRACKING
+    #-------------------------------------------------------------------
+    def addMutationListener(self, listener):
+        """Register a function which will be called with a list of
+        records for every change made to the graph by the user. Each
+        record is a JSON serializable dict with the operation stored in
+        op being one of addNode, removeNode, connect, disconnect, move or
+        value. All records of a list belong to the same user action."""
+        if listener not in self.mutationListeners:
+            self.mutationListeners.append(listener)
+
+    def removeMutationListener(self, listener):
+        if listener in self.mutationListeners:
+            self.mutationListeners.remove(listener)
+
+    def isRecording(self):
+        """Returns True if changes should be passed to listeners"""
+        return len(self.mutationListeners) > 0 and self.mutationsSuppressed == 0
+
+    def notifyMutation(self, changeSet):
+        """Pass the given list of records to all mutation listeners"""
+        if not changeSet or not self.isRecording():
+            return
+        for listener in list(self.mutationListeners):
+            listener(changeSet)
+
+    def commitValues(self, node):
+        """Remember the current values of the nodes input sockets to be
+        able to record later changes"""
+        for socket in node.inputList:
+            socket.commitValue()
+
+    def recordMoves(self, startPositions):
+        """Record the moves of the nodes given as keys from the positions
+        given as values to their current positions"""
+        changeSet = []
+        for node, startPos in startPositions.items():
+            if node.frame is not None and node.frame.isEmpty():
+                # the node has been removed in the meantime
+                continue
+            pos = list(node.getPos())
+            if pos != list(startPos):
+                changeSet.append({
+                    "op": "move",
+                    "id": str(node.nodeID),
+                    "from": list(startPos),
+                    "to": pos})
+        self.notifyMutation(changeSet)
+
+    def recordValueChange(self, socket):
+        """Record the value of the given socket if it has been changed
+        since the last recorded change"""
+        record = self.getValueRecord(socket)
+        if record["from"] == record["to"]:
+            return
+        self.notifyMutation([record])
+
+    def undo(self):
+        """Revert the last change"""
+        self.history.undo()
+
+    def redo(self):
+        """Repeat the last reverted change"""
+        self.history.redo()
+
+    def getAddNodeRecord(self, node):
+        return {"op": "addNode", "node": self.jsonTools.getNode(node)}
+
+    def getRemoveNodeRecord(self, node):
+        return {"op": "removeNode", "node": self.jsonTools.getNode(node)}
+
+    def getValueRecord(self, socket):
+        """Returns the record of changing the value of the given socket
+        from the last recorded to its current value. Disconnected input
+        sockets always need this record as the values of connected
+        sockets aren't stored."""
+        oldValue = self.jsonTools.getValue(socket.commitValue())
+        return {
+            "op": "value",
+            "node": str(socket.node.nodeID),
+            "socket": str(socket.socketID),
+            "from": oldValue,
+            "to": self.jsonTools.getValue(socket.committedValue)}
+
+    def getConnectRecord(self, connector):
+        return {"op": "connect", "connection": self.jsonTools.getConnection(connector)}
+
+    def getDisconnectRecord(self, connector):
+        return {"op": "disconnect", "connection": self.jsonTools.getConnection(connector)}
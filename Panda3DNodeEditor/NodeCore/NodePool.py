@@ -0,0 +1,60 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+class NodePool:
+    """Keeps removed nodes to reuse them instead of creating new ones.
+
+    Creating a node builds all of its widgets which is by far the most
+    expensive part of adding and copying nodes. Removed nodes are stashed
+    together with their widgets and handed out again the next time a
+    node of the same type is needed, after their ids, values and states
+    have been reset. At most maxSize nodes are kept per type, all other
+    nodes are destroyed as usual."""
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        # node type -> list of released nodes
+        self.pools = {}
+        # node type -> values of the input sockets of a new node
+        self.defaultValues = {}
+
+    def create(self, nodeType, parent):
+        """Returns a node of the given type, reusing a released one if
+        available"""
+        pool = self.pools.get(nodeType)
+        if pool:
+            node = pool.pop()
+            node.reset(self.defaultValues[nodeType])
+            return node
+
+        node = nodeType(parent)
+        if nodeType not in self.defaultValues:
+            self.defaultValues[nodeType] = [socket.getValue() for socket in node.inputList]
+        return node
+
+    def release(self, node):
+        """Take the given node which has been removed from the graph. It
+        will be destroyed if the pool of its type is full."""
+        nodeType = type(node)
+        pool = self.pools.setdefault(nodeType, [])
+        if len(pool) >= self.maxSize or not node.poolable \
+        or nodeType not in self.defaultValues:
+            node.destroy()
+            return
+        node.ignoreAll()
+        node.cancelUpdate()
+        if node.frame is not None:
+            node.frame.hide()
+            node.frame.stash()
+        pool.append(node)
+
+    def clear(self):
+        """Destroy all released nodes"""
+        for pool in self.pools.values():
+            for node in pool:
+                node.destroy()
+        self.pools = {}
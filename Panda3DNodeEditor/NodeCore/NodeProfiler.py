@@ -0,0 +1,231 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import time
+import logging
+from collections import deque
+
+class NodeProfiler:
+    """Measures the time spent in the logic of each node.
+
+    Once enabled, the evaluator runs the logic of every node through this
+    profiler, which counts the calls and sums up the time per node as
+    well as the duration of every evaluation run. With the overlay shown,
+    nodes are tinted from white to red by the average time their logic
+    takes, relative to the slowest node. The tint is applied with the
+    view sync once per frame and only to the nodes evaluated since then,
+    unless the slowest time changed."""
+    def __init__(self, evaluator, maxPropagations=100):
+        self.evaluator = evaluator
+        # node id -> [calls, total time, max time, calls in the last run]
+        self.nodeStats = {}
+        # (start time, duration, number of evaluated nodes) of the last runs
+        self.propagations = deque(maxlen=maxPropagations)
+        self.overlayShown = False
+        self.propagationStart = None
+        self.propagationNodes = set()
+
+        # highest average time of all nodes and the id of its node
+        self.slowest = 0
+        self.slowestID = None
+
+        # nodes waiting for their tint to be updated, used as ordered set
+        self.overlayNodes = {}
+        self.overlayAll = False
+
+    def isEnabled(self):
+        return self.evaluator.profiler is self
+
+    def enable(self):
+        self.evaluator.profiler = self
+
+    def disable(self):
+        if self.isEnabled():
+            self.evaluator.profiler = None
+        self.hideOverlay()
+
+    def toggle(self):
+        """Enable the profiler and show its overlay or disable it and log
+        the slowest nodes"""
+        if self.isEnabled():
+            self.logSummary()
+            self.disable()
+        else:
+            self.reset()
+            self.enable()
+            self.showOverlay()
+
+    def reset(self):
+        self.nodeStats = {}
+        self.propagations.clear()
+        self.slowest = 0
+        self.slowestID = None
+        if self.overlayShown:
+            self.updateOverlay()
+
+    def discard(self, nodes):
+        """Drop the timings of the given nodes, must be called for nodes
+        removed from the graph"""
+        slowestRemoved = False
+        for node in nodes:
+            self.nodeStats.pop(node.nodeID, None)
+            self.overlayNodes.pop(node, None)
+            if node.nodeID == self.slowestID:
+                slowestRemoved = True
+        if slowestRemoved and self.findSlowest() and self.overlayShown:
+            self.requestOverlayUpdate()
+
+    def beginPropagation(self):
+        self.propagationStart = time.perf_counter()
+        self.propagationNodes = set()
+
+    def runLogic(self, node):
+        """Run and time the logic of the given node"""
+        start = time.perf_counter()
+        try:
+            node.logic()
+        finally:
+            duration = time.perf_counter() - start
+            stats = self.nodeStats.get(node.nodeID)
+            if stats is None:
+                stats = self.nodeStats[node.nodeID] = [0, 0.0, 0.0, 0]
+            if node not in self.propagationNodes:
+                self.propagationNodes.add(node)
+                stats[3] = 0
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            stats[3] += 1
+
+    def endPropagation(self):
+        duration = time.perf_counter() - self.propagationStart
+        self.propagations.append((self.propagationStart, duration, len(self.propagationNodes)))
+
+        slowestChanged = False
+        for node in self.propagationNodes:
+            calls, totalTime = self.nodeStats[node.nodeID][:2]
+            average = totalTime / calls
+            if average > self.slowest:
+                self.slowest = average
+                self.slowestID = node.nodeID
+                slowestChanged = True
+            elif node.nodeID == self.slowestID and average < self.slowest:
+                # the slowest node got faster, another one may be slower now
+                slowestChanged = self.findSlowest() or slowestChanged
+
+        if not self.overlayShown:
+            return
+        if slowestChanged:
+            # the tints of all nodes are relative to the slowest one
+            self.requestOverlayUpdate()
+        else:
+            self.requestOverlayUpdate(self.propagationNodes)
+
+    def findSlowest(self):
+        """Search the highest average time of all nodes and return True
+        if it changed"""
+        slowest = 0
+        slowestID = None
+        for nodeID, stats in self.nodeStats.items():
+            average = stats[1] / stats[0]
+            if average > slowest:
+                slowest = average
+                slowestID = nodeID
+        changed = slowest != self.slowest
+        self.slowest = slowest
+        self.slowestID = slowestID
+        return changed
+
+    def getNodeStats(self):
+        """Returns a list of dicts with the timings of all nodes currently
+        in the graph, the slowest nodes in total first"""
+        nodes = self.evaluator.nodeMgr.nodeList
+        stats = []
+        for node in nodes:
+            if node.nodeID not in self.nodeStats:
+                continue
+            calls, totalTime, maxTime, lastCalls = self.nodeStats[node.nodeID]
+            stats.append({
+                "node": node,
+                "id": str(node.nodeID),
+                "type": node.__module__,
+                "name": node.name,
+                "calls": calls,
+                "totalTime": totalTime,
+                "averageTime": totalTime / calls,
+                "maxTime": maxTime,
+                "lastPropagationCalls": lastCalls})
+        stats.sort(key=lambda entry: entry["totalTime"], reverse=True)
+        return stats
+
+    def getPropagations(self):
+        """Returns a list of (start time, duration, number of evaluated
+        nodes) tuples of the last evaluation runs"""
+        return list(self.propagations)
+
+    def logSummary(self, count=10):
+        durations = [duration for start, duration, numNodes in self.propagations]
+        if durations:
+            logging.info(
+                f"{len(durations)} evaluation runs, "
+                f"average {sum(durations) / len(durations) * 1000:.3f} ms, "
+                f"max {max(durations) * 1000:.3f} ms")
+        for entry in self.getNodeStats()[:count]:
+            logging.info(
+                f"{entry['name']} ({entry['type']}): {entry['calls']} calls, "
+                f"total {entry['totalTime'] * 1000:.3f} ms, "
+                f"average {entry['averageTime'] * 1000:.3f} ms")
+
+    def showOverlay(self):
+        self.overlayShown = True
+        self.updateOverlay()
+
+    def hideOverlay(self):
+        if not self.overlayShown:
+            return
+        self.overlayShown = False
+        self.overlayNodes = {}
+        self.overlayAll = False
+        for node in self.evaluator.nodeMgr.nodeList:
+            if node.frame is not None:
+                node.frame.clearColorScale()
+
+    def requestOverlayUpdate(self, nodes=None):
+        """Tint the given nodes or all nodes if none are given with the
+        next view sync"""
+        if nodes is None:
+            self.overlayAll = True
+        elif not self.overlayAll:
+            self.overlayNodes.update(dict.fromkeys(nodes))
+        viewSync = self.evaluator.viewSync
+        if viewSync is None:
+            self.syncOverlay()
+        else:
+            viewSync.addCallback(self.syncOverlay)
+
+    def syncOverlay(self):
+        """Apply the requested overlay updates"""
+        nodes = None if self.overlayAll else list(self.overlayNodes)
+        self.overlayNodes = {}
+        self.overlayAll = False
+        if self.overlayShown:
+            self.updateOverlay(nodes)
+
+    def updateOverlay(self, nodes=None):
+        """Tint the given nodes or all nodes if none are given by the
+        average time of their logic"""
+        if nodes is None:
+            nodes = self.evaluator.nodeMgr.nodeList
+        for node in nodes:
+            if node.frame is None:
+                continue
+            stats = self.nodeStats.get(node.nodeID)
+            heat = 0
+            if stats is not None and self.slowest > 0:
+                heat = stats[1] / stats[0] / self.slowest
+            node.frame.setColorScale(1, 1 - heat, 1 - heat, 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+import importlib
+
+from Panda3DNodeEditor.NodeCore import Nodes
+
+BUILTIN_PACKAGE = "Panda3DNodeEditor.NodeCore.Nodes"
+
+class NodeRegistry:
+    """Maps the names node types are referred to by to the node classes.
+
+    A node class can be found by the module path stored in project files,
+    by the short module name used in the node menu for the built-in nodes
+    and by the class name given in the custom node map. All names are
+    collected once, so resolving a type is a single dict lookup."""
+    def __init__(self, customNodeMap=None):
+        # name -> node class
+        self.types = {}
+        self.registerBuiltins()
+        if customNodeMap:
+            self.registerCustomNodeMap(customNodeMap)
+
+    def registerBuiltins(self):
+        """Register all nodes found in the NodeCore/Nodes package"""
+        for moduleName in Nodes.__all__:
+            if moduleName == "NodeBase":
+                continue
+            try:
+                module = importlib.import_module(f"{BUILTIN_PACKAGE}.{moduleName}")
+            except Exception:
+                logging.error(f"Failed to import node module {moduleName}", exc_info=True)
+                continue
+            nodeType = getattr(module, "Node", None)
+            if nodeType is None:
+                continue
+            self.register(nodeType, moduleName)
+
+    def registerCustomNodeMap(self, customNodeMap):
+        """Register all custom nodes given in the same format as the
+        custom node map passed to the editor"""
+        for entry, customNodeType in customNodeMap.items():
+            if isinstance(customNodeType, dict):
+                for subEntry, subCustomNodeType in customNodeType.items():
+                    if isinstance(subCustomNodeType, (list, tuple)):
+                        self.register(subCustomNodeType[1], subCustomNodeType[0])
+            elif isinstance(customNodeType, (list, tuple)):
+                self.register(customNodeType[1], customNodeType[0])
+
+    def register(self, nodeType, *names):
+        """Register the given node class with its module path and any
+        additional names it should be found by"""
+        for name in (nodeType.__module__,) + names:
+            known = self.types.get(name)
+            if known is not None and known is not nodeType:
+                logging.debug(f"node type {name} now refers to {nodeType}")
+            self.types[name] = nodeType
+
+    def unregister(self, nodeType):
+        """Remove all names of the given node class or the class
+        registered with the given name"""
+        if isinstance(nodeType, str):
+            nodeType = self.types.get(nodeType)
+            if nodeType is None:
+                return
+        for name in [n for n, t in self.types.items() if t is nodeType]:
+            del self.types[name]
+
+    def resolve(self, nodeType):
+        """Returns the node class for the given name or None if the type
+        is unknown. Node classes are returned as they are."""
+        if not isinstance(nodeType, str):
+            return nodeType
+        found = self.types.get(nodeType)
+        if found is None:
+            # custom nodes are stored with their module path but have
+            # been registered by their class name
+            found = self.types.get(nodeType.rsplit(".", 1)[-1])
+        return found
@@ -20,27 +20,73 @@ from panda3d.core import (
 from DirectGuiExtension import DirectGuiHelper as DGH
 
 from Panda3DNodeEditor.NodeCore.Sockets.OutSocket import OutSocket
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import LOD_FULL, LOD_SIMPLE
 
 class NodeBase(DirectObject):
+    """Base class of all nodes. If the node is created with a parent of
+    None, no GUI will be created and the node can be used to evaluate
+    graphs without a window. The GUI can be created later on by calling
+    attachView.
+
+    The layout of a node is only computed again after it has been
+    invalidated, for which invalidateLayout has to be called whenever
+    the size of a sockets widgets changes. The measured width of each
+    socket is kept until that socket gets invalidated."""
+    # removed nodes of this type may be kept and reused by the node pool
+    poolable = True
+
+    # colors are shared by all nodes unless set on a node or node type
+    normalColor = (0.25, 0.25, 0.25, 1)
+    highlightColor = (0.45, 0.45, 0.45, 1)
+    errorColor = (1, 0.25, 0.25, 1)
+    errorHighlightColor = (1, 0.45, 0.45, 1)
+
     def __init__(self, name, parent):
         self.right = 0.5
         self.left = -0.5
         self.name = name
-        self.nodeID = uuid4()
+        # the id is only created once it is needed
+        self._nodeID = None
         self.inputList = []
         self.outputList = []
         self.selected = False
         self.allowRecursion = False
         self.hasError = False
-
-        self.normalColor = (0.25, 0.25, 0.25, 1)
-        self.highlightColor = (0.45, 0.45, 0.45, 1)
-        self.errorColor = (1, 0.25, 0.25, 1)
-        self.errorHighlightColor = (1, 0.45, 0.45, 1)
-
+        self.lod = LOD_FULL
+        # the node manager this node has been added to, which runs its
+        # deferred updates
+        self.nodeMgr = None
+
+        # Layout cache
+        # socket -> measured width of its frame
+        self.socketWidths = {}
+        self.layoutValid = False
+
+        # position used as long as no frame has been created, None
+        # stands for the origin
+        self.pos = None
+        self.frame = None
+        if parent is not None:
+            self.attachView(parent)
+
+    @property
+    def nodeID(self):
+        if self._nodeID is None:
+            self._nodeID = uuid4()
+        return self._nodeID
+
+    @nodeID.setter
+    def nodeID(self, nodeID):
+        self._nodeID = nodeID
+
+    def attachView(self, parent):
+        """Create the GUI of this node and its sockets as child of the
+        given parent"""
+        if self.frame is not None:
+            return
         self.frame = DirectFrame(
             state = DGG.NORMAL,
-            text=name,
+            text=self.name,
             text_align=TextNode.A_left,
             text_scale=0.1,
             text_pos=(self.left, 0.12),
@@ -48,12 +94,50 @@ class NodeBase(DirectObject):
             frameColor=self.normalColor,
             frameSize=(self.left, self.right, -.6, 0.2),
             parent=parent)
+        if self.pos is not None:
+            self.frame.setPos(self.pos)
+            self.pos = None
 
         self.setupBind()
         self.hide()
 
-        self.setPos = self.frame.setPos
-        self.getPos = self.frame.getPos
+        for socket in self.inputList + self.outputList:
+            socket.attachView()
+        self.setColor()
+
+    def setPos(self, *args):
+        if self.frame is None:
+            # only positions relative to the parent are supported here
+            self.pos = Point3(*args)
+            return
+        self.frame.setPos(*args)
+
+    def getPos(self, *args):
+        if self.frame is None:
+            return Point3(0) if self.pos is None else Point3(self.pos)
+        return self.frame.getPos(*args)
+
+    def reset(self, inValues):
+        """Reset this removed node to the state of a new node with the
+        given input socket values, so the node pool can reuse it. Nodes
+        keeping any additional state should overwrite this method or set
+        poolable to False."""
+        self._nodeID = None
+        self.selected = False
+        self.hasError = False
+        self.pos = None
+        self.invalidateLayout()
+        for socket in self.inputList + self.outputList:
+            socket.reset()
+        for socket, value in zip(self.inputList, inValues):
+            socket.setValue(value)
+        if self.frame is not None:
+            self.left = -0.5
+            self.right = 0.5
+            self.frame["frameSize"] = (self.left, self.right, -.6, 0.2)
+            self.frame.unstash()
+            self.frame.clearColorScale()
+            self.setColor()
 
     def addIn(self, name, socketType, allowMultiConnect=False, extraArgs=None):
         """Add a new input socket of the given socket type"""
@@ -63,11 +147,13 @@ class NodeBase(DirectObject):
             inSocket = socketType(self, name)
         inSocket.allowMultiConnect = allowMultiConnect
         self.inputList.append(inSocket)
+        self.layoutValid = False
 
     def addOut(self, name):
         """Add a new output socket"""
         outSocket = OutSocket(self, name)
         self.outputList.append(outSocket)
+        self.layoutValid = False
 
     def isLeaveNode(self):
         """Returns true if this is a leave node.
@@ -86,20 +172,70 @@ class NodeBase(DirectObject):
 
     def logic(self):
         """Run the logic of this node, process all in and output data.
-        This is a stub and should be overwritten by the derived classes"""
+        This is a stub and should be overwritten by the derived classes.
+        The logic should only compute values and not touch any widgets,
+        which is done in updateView."""
         pass
 
+    def updateView(self):
+        """Show the current values in the widgets of this node. Called at
+        most once per frame for nodes which have been evaluated since the
+        last frame. Nodes showing results of their logic should overwrite
+        this method and call it from there."""
+        for socket in self.inputList + self.outputList:
+            socket.updateView()
+
     def update(self):
-        """Show all sockets and resize the frame to fit all sockets in"""
+        """Show all sockets and resize the frame to fit all sockets in.
+        The layout is only computed if it has been invalidated."""
+        if self.frame is None:
+            return
+        self.cancelUpdate()
+        if not self.layoutValid:
+            self.layout()
+
+        base.messenger.send("NodeEditor_updateConnections", [[self]])
+
+    def requestUpdate(self):
+        """Update this node once at the end of the current frame instead
+        of right away, no matter how often this is called. Nodes which
+        don't belong to a node manager are updated right away."""
+        if self.frame is None:
+            return
+        if self.nodeMgr is None:
+            self.update()
+            return
+        self.nodeMgr.requestNodeUpdate(self)
+
+    def cancelUpdate(self):
+        """Drop a requested update, e.g. as the node has been updated
+        already or got removed"""
+        if self.nodeMgr is not None:
+            self.nodeMgr.cancelNodeUpdate(self)
+
+    def invalidateLayout(self, socket=None):
+        """Lay out this node again on the next update. Only the width of
+        the given socket will be measured again or the widths of all
+        sockets if no socket is given."""
+        if socket is None:
+            self.socketWidths = {}
+        else:
+            self.socketWidths.pop(socket, None)
+        self.layoutValid = False
+
+    def layout(self):
+        """Place the sockets and resize the frame to fit them all in"""
         z = 0
 
         fs = self.frame["frameSize"]
         maxWidth = fs[1]
 
-
         for socket in self.inputList + self.outputList:
             if socket.frame:
-                maxWidth = max(maxWidth, DGH.getRealWidth(socket.frame))
+                width = self.socketWidths.get(socket)
+                if width is None:
+                    width = self.socketWidths[socket] = DGH.getRealWidth(socket.frame)
+                maxWidth = max(maxWidth, width)
         self.left = -maxWidth / 2
         self.right = maxWidth / 2
 
@@ -115,8 +251,7 @@ class NodeBase(DirectObject):
 
         self.frame["frameSize"] = (self.left, self.right, z, fs[3])
         self.frame["text_pos"] = (self.left, 0.12)
-
-        base.messenger.send("NodeEditor_updateConnections")
+        self.layoutValid = True
 
     def create(self):
         """Place and show the node under the mouse and start draging it."""
@@ -129,14 +264,48 @@ class NodeBase(DirectObject):
 
     def show(self):
         """Shows the Node frame and updates its sockets"""
+        if self.frame is None:
+            return
         self.update()
         self.frame.show()
 
     def hide(self):
         """Hide the Node frame"""
+        if self.frame is None:
+            return
         self.frame.hide()
 
+    def setLOD(self, lod):
+        """Switch the level of detail this node and its sockets are drawn
+        with. No widgets will be recreated, they are only stashed."""
+        if lod == self.lod:
+            return
+        self.lod = lod
+        if self.frame is None:
+            return
+        # hidden widgets change the size of the sockets
+        self.invalidateLayout()
+        if lod >= LOD_SIMPLE:
+            self.frame.component("text0").hide()
+        else:
+            self.frame.component("text0").show()
+        for socket in self.inputList + self.outputList:
+            socket.setLOD(lod)
+
+    def setCulled(self, culled):
+        """Remove the node from the rendered scene graph or bring it back
+        without destroying any of its widgets"""
+        if self.frame is None:
+            return
+        if culled:
+            self.frame.stash()
+        else:
+            self.frame.unstash()
+
     def destroy(self):
+        self.cancelUpdate()
+        if self.frame is None:
+            return
         self.frame.destroy()
 
     def enable(self):
@@ -159,6 +328,8 @@ class NodeBase(DirectObject):
         self.setColor()
 
     def setColor(self):
+        if self.frame is None:
+            return
         if self.selected and not self.hasError:
             self.frame["frameColor"] = self.highlightColor
         elif self.selected and self.hasError:
@@ -27,19 +27,36 @@ class Node(NodeBase):
         NodeBase.__init__(self, "OUT", parent)
         self.addIn("In 1", InSocket)
 
-    def logic(self):
+    def reset(self, inValues):
+        NodeBase.reset(self, inValues)
+        # clear the value shown by the last use of this node
+        self.updateView()
+
+    def updateView(self):
         """Simply write the value in the nodes textfield"""
-        if self.inputList[0].value is None:
-            self.inputList[0].text["text"] = "In 1"
-            self.inputList[0].text.resetFrameSize()
-            self.inputList[0].resize(1)
-            self.update()
+        NodeBase.updateView(self)
+        if self.frame is None:
+            return
+        socket = self.inputList[0]
+        if socket.value is None:
+            text = "In 1"
+        else:
+            text = str(socket.getValue())
+        if text == socket.text["text"]:
+            # the shown value didn't change, neither did the layout
             return
-        self.inputList[0].text["text"] = str(self.inputList[0].getValue())
-        self.inputList[0].text["frameSize"] = None
-        self.inputList[0].text.resetFrameSize()
 
-        newSize = max(1, DGH.getRealWidth(self.inputList[0].text) + 0.2)
-        self.inputList[0].resize(newSize)
+        socket.text["text"] = text
+        if socket.value is None:
+            socket.text.resetFrameSize()
+            socket.resize(1)
+        else:
+            socket.text["frameSize"] = None
+            socket.text.resetFrameSize()
+            newSize = max(1, DGH.getRealWidth(socket.text) + 0.2)
+            socket.resize(newSize)
 
-        self.update()
+        # lay out the node once per frame, no matter how often the value
+        # changes until then
+        self.invalidateLayout(socket)
+        self.requestUpdate()
@@ -12,15 +12,24 @@ from direct.gui import DirectGuiGlobals as DGG
 from panda3d.core import TextNode
 
 class BoolSocket(SocketBase):
+    __slots__ = ("text", "checkbox")
+
     def __init__(self, node, name):
         SocketBase.__init__(self, node, name)
 
         self.type = INSOCKET
 
+        self.value = False
+        self.checkbox = None
+
+        if node.frame is not None:
+            self.createGUI()
+
+    def createGUI(self):
         self.frame = DirectFrame(
             frameColor=(0.25, 0.25, 0.25, 1),
             frameSize=(-1, 0, -self.height, 0),
-            parent=node.frame,
+            parent=self.node.frame,
         )
 
         SocketBase.createPlug(self, self.frame)
@@ -40,7 +49,7 @@ class BoolSocket(SocketBase):
         )'''
 
         self.checkbox = DirectCheckButton(
-            text = name,
+            text=self.name,
             pos=(0.5,0,0),
             scale=.1,
             command=self.updateConnectedNodes,
@@ -48,11 +57,36 @@ class BoolSocket(SocketBase):
 
         self.resize(1)
 
+    def setWidgetsVisible(self, visible):
+        if self.checkbox is None:
+            return
+        if visible:
+            self.checkbox.unstash()
+        else:
+            self.checkbox.stash()
+
     def setValue(self, value):
-        self.checkbox["indicatorValue"] = value
+        self.receiveValue(value)
+        if self.checkbox is None:
+            return
+        self.checkbox["indicatorValue"] = self.value
         self.checkbox.setIndicatorValue()
 
+    def receiveValue(self, value):
+        if isinstance(value, str):
+            # values of project files written before version 0.2
+            value = value in ("True", "1")
+        self.value = value
+
+    def updateView(self):
+        # connected sockets show the value passed on to them
+        if self.checkbox is not None and self.connected:
+            self.checkbox["indicatorValue"] = self.value
+            self.checkbox.setIndicatorValue()
+
     def getValue(self):
+        if self.checkbox is None or self.connected:
+            return self.value
         return self.checkbox["indicatorValue"]
 
     def show(self, z, left):
@@ -64,6 +98,9 @@ class BoolSocket(SocketBase):
         #self.text["frameSize"] = (0, newWidth, -self.height/2, self.height/2)
 
     def setConnected(self, connected):
+        if self.checkbox is None:
+            self.connected = connected
+            return
         if connected:
             self.checkbox["state"] = DGG.DISABLED
         else:
@@ -10,15 +10,23 @@ from direct.gui.DirectLabel import DirectLabel
 from panda3d.core import TextNode
 
 class InSocket(SocketBase):
+    __slots__ = ("text",)
+
     def __init__(self, node, name):
         SocketBase.__init__(self, node, name)
 
         self.type = INSOCKET
 
+        self.text = None
+
+        if node.frame is not None:
+            self.createGUI()
+
+    def createGUI(self):
         self.frame = DirectFrame(
             frameColor=(0.25, 0.25, 0.25, 1),
             frameSize=(-1, 0, -self.height, 0),
-            parent=node.frame,
+            parent=self.node.frame,
         )
 
         SocketBase.createPlug(self, self.frame)
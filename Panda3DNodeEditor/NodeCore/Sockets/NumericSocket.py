@@ -3,6 +3,8 @@
 
 # This file was created using the DirectGUI Designer
 
+import logging
+
 from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import SocketBase, INSOCKET
 
 from direct.gui.DirectFrame import DirectFrame
@@ -12,16 +14,29 @@ from panda3d.core import TextNode
 
 from DirectGuiExtension.DirectSpinBox import DirectSpinBox
 
+# value of new sockets and of values which aren't numbers
+DEFAULT_VALUE = 5
+
 class NumericSocket(SocketBase):
+    __slots__ = ("text", "spinBox")
+
     def __init__(self, node, name):
         SocketBase.__init__(self, node, name)
 
         self.type = INSOCKET
 
+        self.value = DEFAULT_VALUE
+        self.text = None
+        self.spinBox = None
+
+        if node.frame is not None:
+            self.createGUI()
+
+    def createGUI(self):
         self.frame = DirectFrame(
             frameColor=(0.25, 0.25, 0.25, 1),
             frameSize=(-1, 0, -self.height, 0),
-            parent=node.frame,
+            parent=self.node.frame,
         )
 
         SocketBase.createPlug(self, self.frame)
@@ -41,7 +56,7 @@ class NumericSocket(SocketBase):
 
         self.spinBox = DirectSpinBox(
             pos=(0.5,0,0),
-            value=5,
+            value=DEFAULT_VALUE,
             minValue=-100,
             maxValue=100,
             repeatdelay=0.125,
@@ -55,12 +70,47 @@ class NumericSocket(SocketBase):
 
         self.resize(1)
 
+    def setWidgetsVisible(self, visible):
+        if self.spinBox is None:
+            return
+        if visible:
+            self.spinBox.unstash()
+        else:
+            self.spinBox.stash()
+
     def setValue(self, value):
-        self.spinBox.setValue(value)
+        self.value = self.toNumber(value)
+        if self.spinBox is None:
+            return
+        self.spinBox.setValue(self.value)
+
+    def receiveValue(self, value):
+        self.value = self.toNumber(value)
+
+    def updateView(self):
+        # connected sockets show the value passed on to them
+        if self.spinBox is not None and self.connected:
+            self.spinBox.setValue(self.value)
 
     def getValue(self):
+        if self.spinBox is None or self.connected:
+            return self.value
         return self.spinBox.getValue()
 
+    def toNumber(self, value):
+        """Convert values read from project files to numbers"""
+        if isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                pass
+            try:
+                return float(value)
+            except ValueError:
+                logging.warning(f"numeric socket value {value!r} is not a number, using {DEFAULT_VALUE}")
+                return DEFAULT_VALUE
+        return value
+
     def show(self, z, left):
         self.frame.setZ(z)
         self.frame.setX(left)
@@ -70,6 +120,9 @@ class NumericSocket(SocketBase):
         self.text["frameSize"] = (0, newWidth, -self.height/2, self.height/2)
 
     def setConnected(self, connected):
+        if self.spinBox is None:
+            self.connected = connected
+            return
         if connected:
             self.spinBox["state"] = DGG.DISABLED
             self.spinBox.incButton["state"] = DGG.DISABLED
@@ -14,17 +14,28 @@ from direct.gui import DirectGuiGlobals as DGG
 from panda3d.core import TextNode
 
 class OptionSelectSocket(SocketBase):
+    __slots__ = ("options", "text", "optionsfield")
+
+    height = 0.21
+
     def __init__(self, node, name, options):
         SocketBase.__init__(self, node, name)
 
-        self.height = 0.21
-
         self.type = INSOCKET
 
+        self.options = options
+        self.value = options[0] if options else None
+        self.text = None
+        self.optionsfield = None
+
+        if node.frame is not None:
+            self.createGUI()
+
+    def createGUI(self):
         self.frame = DirectFrame(
             frameColor=(0.25, 0.25, 0.25, 1),
             frameSize=(-1, 0, -self.height, 0),
-            parent=node.frame,
+            parent=self.node.frame,
         )
 
         SocketBase.createPlug(self, self.frame)
@@ -45,7 +56,7 @@ class OptionSelectSocket(SocketBase):
         self.optionsfield = DirectOptionMenu(
             pos=(0.5,0,-0.01),
             borderWidth=(0.1,0.1),
-            items=options,
+            items=self.options,
             parent=self.frame,
             command=self.updateConnectedNodes,
             state=DGG.DISABLED)
@@ -54,20 +65,47 @@ class OptionSelectSocket(SocketBase):
         self.resize(1.7)
 
     def disable(self):
+        if self.optionsfield is None:
+            return
         self.optionsfield["state"] = DGG.DISABLED
 
     def enable(self):
+        if self.optionsfield is None:
+            return
         if not self.connected:
             self.optionsfield["state"] = DGG.NORMAL
 
+    def setWidgetsVisible(self, visible):
+        if self.optionsfield is None:
+            return
+        if visible:
+            self.optionsfield.unstash()
+        else:
+            self.optionsfield.stash()
+
     def setValue(self, value):
+        self.value = value
+        self.updateOptionsField()
+
+    def receiveValue(self, value):
+        self.value = value
+
+    def updateView(self):
+        # connected sockets show the value passed on to them
+        if self.connected:
+            self.updateOptionsField()
+
+    def updateOptionsField(self):
+        if self.optionsfield is None:
+            return
         try:
-            self.optionsfield.set(value)
+            self.optionsfield.set(self.value)
         except:
-            logging.error(f"couldn't set the value {value} for the option selection")
-            return
+            logging.error(f"couldn't set the value {self.value} for the option selection")
 
     def getValue(self):
+        if self.optionsfield is None or self.connected:
+            return self.value
         return self.optionsfield.get()
 
     def show(self, z, left):
@@ -79,6 +117,9 @@ class OptionSelectSocket(SocketBase):
         self.text["frameSize"] = (0, newWidth, -self.height/2, self.height/2)
 
     def setConnected(self, connected):
+        if self.optionsfield is None:
+            self.connected = connected
+            return
         if connected:
             self.optionsfield["state"] = DGG.DISABLED
         else:
@@ -15,18 +15,72 @@ from direct.gui import DirectGuiGlobals as DGG
 OUTSOCKET = 0
 INSOCKET = 1
 
+# Levels of detail nodes and sockets can be drawn with
+LOD_FULL = 0
+# no input widgets
+LOD_REDUCED = 1
+# only the plain node frame without any text or sockets
+LOD_SIMPLE = 2
+
 class SocketBase:
+    """Base class of all sockets. Sockets only store their state in
+    slots, derived classes should declare __slots__ for their own
+    attributes too, to keep big graphs small in memory."""
+    __slots__ = (
+        "_socketID",
+        "node",
+        "name",
+        "type",
+        "value",
+        "committedValue",
+        "connected",
+        "frame",
+        "plug",
+        "allowMultiConnect")
+
+    height = 0.2
+
     def __init__(self, node, name):
-        self.socketID = uuid4()
+        # the id is only created once it is needed
+        self._socketID = None
         self.node = node
         self.name = name
-        self.height = 0.2
         self.type = None
         self.value = None
+        # the value of the last recorded edit of this socket
+        self.committedValue = None
         self.connected = False
         self.frame = None
+        self.plug = None
         self.allowMultiConnect = False
 
+    @property
+    def socketID(self):
+        if self._socketID is None:
+            self._socketID = uuid4()
+        return self._socketID
+
+    @socketID.setter
+    def socketID(self, socketID):
+        self._socketID = socketID
+
+    def createGUI(self):
+        """Create the widgets of this socket as children of the nodes
+        frame. This is a stub and should be overwritten by the derived
+        classes"""
+        pass
+
+    def attachView(self):
+        """Create the GUI of a socket whose node has been created without
+        a view and carry over its current value and state"""
+        if self.frame is not None:
+            return
+        value = self.getValue()
+        self.createGUI()
+        if value is not None:
+            self.setValue(value)
+        self.setConnected(self.connected)
+
     def enable(self):
         """Enable any elements on the node"""
         pass
@@ -36,6 +90,21 @@ class SocketBase:
         the mouse watcher and the drag/drop feature"""
         pass
 
+    def setLOD(self, lod):
+        """Switch the level of detail this socket is drawn with"""
+        if self.frame is None:
+            return
+        if lod >= LOD_SIMPLE:
+            self.frame.stash()
+        else:
+            self.frame.unstash()
+        self.setWidgetsVisible(lod == LOD_FULL)
+
+    def setWidgetsVisible(self, visible):
+        """Show or hide the input widgets of this socket. This is a stub
+        and should be overwritten by sockets with input widgets"""
+        pass
+
     def getValue(self):
         """Returns a string serializable value stored in this node"""
         return self.value
@@ -43,6 +112,32 @@ class SocketBase:
     def setValue(self, value):
         self.value = value
 
+    def receiveValue(self, value):
+        """Take a value passed on from a connected output while evaluating.
+        Sockets with input widgets should only store the value here and
+        show it in updateView."""
+        self.setValue(value)
+
+    def updateView(self):
+        """Show the current value in the widgets of this socket. This is a
+        stub and should be overwritten by sockets with input widgets"""
+        pass
+
+    def reset(self):
+        """Give this socket a new id and disconnect it, so the node it
+        belongs to can be reused"""
+        self._socketID = None
+        self.value = None
+        self.committedValue = None
+        self.setConnected(False)
+
+    def commitValue(self):
+        """Remember the current value as the last recorded one and return
+        the previously recorded value"""
+        oldValue = self.committedValue
+        self.committedValue = self.getValue()
+        return oldValue
+
     def createPlug(self, parent):
         self.plug = DirectFrame(
             state = DGG.NORMAL,
@@ -75,9 +170,13 @@ class SocketBase:
 
     def updateConnectedNodes(self, *args):
         base.messenger.send("updateConnectedNodes", [self.node])
+        base.messenger.send("NodeEditor_socketValueChanged", [self])
+        base.messenger.send("NodeEditor_set_dirty")
 
     def setConnected(self, connected):
         self.connected = connected
+        if self.plug is None:
+            return
         if self.connected:
             self.plug["image"] = "icons/PlugConnectedGood.png"
         else:
@@ -3,6 +3,8 @@
 
 # This file was created using the DirectGUI Designer
 
+import logging
+
 from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import SocketBase, INSOCKET
 
 from direct.gui.DirectFrame import DirectFrame
@@ -12,17 +14,27 @@ from direct.gui import DirectGuiGlobals as DGG
 from panda3d.core import TextNode
 
 class TextSocket(SocketBase):
+    __slots__ = ("text", "textfield")
+
+    height = 0.21
+
     def __init__(self, node, name):
         SocketBase.__init__(self, node, name)
 
-        self.height = 0.21
-
         self.type = INSOCKET
 
+        self.value = ""
+        self.text = None
+        self.textfield = None
+
+        if node.frame is not None:
+            self.createGUI()
+
+    def createGUI(self):
         self.frame = DirectFrame(
             frameColor=(0.25, 0.25, 0.25, 1),
             frameSize=(-1, 0, -self.height, 0),
-            parent=node.frame,
+            parent=self.node.frame,
         )
 
         SocketBase.createPlug(self, self.frame)
@@ -54,22 +66,46 @@ class TextSocket(SocketBase):
         self.resize(1.7)
 
     def disable(self):
+        if self.textfield is None:
+            return
         self.textfield["state"] = DGG.DISABLED
 
     def enable(self):
+        if self.textfield is None:
+            return
         if not self.connected:
             self.textfield["state"] = DGG.NORMAL
 
+    def setWidgetsVisible(self, visible):
+        if self.textfield is None:
+            return
+        if visible:
+            self.textfield.unstash()
+        else:
+            self.textfield.stash()
+
     def setValue(self, value):
-        textAsString = ""
+        if self.receiveValue(value) and self.textfield is not None:
+            self.textfield.enterText(self.value)
+
+    def receiveValue(self, value):
+        """Store the value as string, returns False if it can't be
+        converted"""
         try:
-            textAsString = str(value)
+            self.value = str(value)
         except:
             logging.error("couldn't convert node input value to string")
-            return
-        self.textfield.enterText(textAsString)
+            return False
+        return True
+
+    def updateView(self):
+        # connected sockets show the value passed on to them
+        if self.textfield is not None and self.connected:
+            self.textfield.enterText(self.value)
 
     def getValue(self):
+        if self.textfield is None or self.connected:
+            return self.value
         return self.textfield.get()
 
     def show(self, z, left):
@@ -81,6 +117,9 @@ class TextSocket(SocketBase):
         self.text["frameSize"] = (0, newWidth, -self.height/2, self.height/2)
 
     def setConnected(self, connected):
+        if self.textfield is None:
+            self.connected = connected
+            return
         if connected:
             self.textfield["state"] = DGG.DISABLED
         else:
@@ -0,0 +1,124 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from math import floor
+
+class SpatialIndex:
+    """A uniform grid storing axis aligned bounding boxes of arbitrary
+    items for fast area and point queries.
+
+    Bounds are given as (left, right, bottom, top) tuples. Each item is
+    stored in all grid cells its bounds overlap, so queries only have to
+    look at the items of the cells covered by the queried area."""
+    def __init__(self, cellSize=2.0):
+        self.cellSize = cellSize
+        self.clear()
+
+    def clear(self):
+        # (x, z) -> {item: None}
+        self.cells = {}
+        # item -> (left, right, bottom, top)
+        self.bounds = {}
+        # item -> cell range the item is stored in
+        self.itemCells = {}
+        # item -> insertion order of the item
+        self.sequence = {}
+        self.nextSequence = 0
+
+    def __getCellRange(self, left, right, bottom, top):
+        cs = self.cellSize
+        return (
+            floor(left / cs), floor(right / cs),
+            floor(bottom / cs), floor(top / cs))
+
+    def __iterCells(self, cellRange):
+        minX, maxX, minZ, maxZ = cellRange
+        for x in range(minX, maxX + 1):
+            for z in range(minZ, maxZ + 1):
+                yield (x, z)
+
+    def insert(self, item, bounds):
+        """Add the item with the given bounds or update the bounds if the
+        item is already stored in the index"""
+        bounds = tuple(bounds)
+        cellRange = self.__getCellRange(*bounds)
+        if item in self.bounds:
+            if self.itemCells[item] == cellRange:
+                self.bounds[item] = bounds
+                return
+            self.__removeFromCells(item)
+        else:
+            self.sequence[item] = self.nextSequence
+            self.nextSequence += 1
+        self.bounds[item] = bounds
+        self.itemCells[item] = cellRange
+        for cell in self.__iterCells(cellRange):
+            self.cells.setdefault(cell, {})[item] = None
+
+    def remove(self, item):
+        """Remove the item from the index"""
+        if item not in self.bounds:
+            return
+        self.__removeFromCells(item)
+        del self.bounds[item]
+        del self.itemCells[item]
+        del self.sequence[item]
+
+    def __removeFromCells(self, item):
+        for cell in self.__iterCells(self.itemCells[item]):
+            items = self.cells.get(cell)
+            if items is None:
+                continue
+            items.pop(item, None)
+            if not items:
+                del self.cells[cell]
+
+    def has(self, item):
+        return item in self.bounds
+
+    def getBounds(self, item):
+        return self.bounds.get(item)
+
+    def query(self, left, right, bottom, top):
+        """Returns a list of all items whose bounds intersect the given
+        rectangle"""
+        cellRange = self.__getCellRange(left, right, bottom, top)
+        minX, maxX, minZ, maxZ = cellRange
+        numCells = (maxX - minX + 1) * (maxZ - minZ + 1)
+        if numCells > len(self.cells):
+            # the area is bigger than the populated part of the grid
+            candidateCells = [
+                items for (x, z), items in self.cells.items()
+                if minX <= x <= maxX and minZ <= z <= maxZ]
+        else:
+            candidateCells = [
+                self.cells[cell] for cell in self.__iterCells(cellRange)
+                if cell in self.cells]
+
+        found = {}
+        for items in candidateCells:
+            for item in items:
+                if item in found:
+                    continue
+                l, r, b, t = self.bounds[item]
+                if l < right and r > left and b < top and t > bottom:
+                    found[item] = None
+        return list(found)
+
+    def queryPoint(self, x, z):
+        """Returns a list of all items whose bounds contain the given
+        point, the item inserted last comes last"""
+        cs = self.cellSize
+        items = self.cells.get((floor(x / cs), floor(z / cs)), {})
+        found = []
+        for item in items:
+            l, r, b, t = self.bounds[item]
+            if l <= x <= r and b <= z <= t:
+                found.append(item)
+        found.sort(key=self.sequence.__getitem__)
+        return found
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+class ViewSync:
+    """Applies the results of evaluations to the widgets once per frame.
+
+    The evaluator only passes values from socket to socket and reports
+    the evaluated nodes and traversed connectors here. Right before the
+    frame gets rendered, the connectors are colored by their last state
+    and the updateView method of each evaluated node is called once, no
+    matter how many evaluations touched them since the last frame."""
+    def __init__(self):
+        # node -> None, used as ordered set
+        self.nodes = {}
+        # connector -> True if it is part of a cycle
+        self.connectors = {}
+        # functions called after the nodes have been updated
+        self.callbacks = {}
+        self.scheduled = False
+        # each instance needs its own task
+        self.taskName = f"NodeEditor_viewSync-{id(self)}"
+
+    def addNodes(self, nodes):
+        """Update the view of the given nodes with the next sync"""
+        if not self.scheduled:
+            self.schedule()
+        self.nodes.update(dict.fromkeys(nodes))
+
+    def setConnectorState(self, connector, hasError):
+        """Color the given connector as checked or erroneous with the
+        next sync"""
+        if not self.scheduled:
+            self.schedule()
+        self.connectors[connector] = hasError
+
+    def addCallback(self, callback):
+        """Call the given function with the next sync, once no matter how
+        often it has been added"""
+        if not self.scheduled:
+            self.schedule()
+        self.callbacks[callback] = None
+
+    def discardNodes(self, nodes):
+        """Must be called for nodes removed from the graph"""
+        for node in nodes:
+            self.nodes.pop(node, None)
+
+    def discardConnectors(self, connectors):
+        """Must be called for connectors removed from the graph"""
+        for connector in connectors:
+            self.connectors.pop(connector, None)
+
+    def clear(self):
+        self.nodes = {}
+        self.connectors = {}
+        self.callbacks = {}
+        self.unschedule()
+
+    def schedule(self):
+        # run before the nodes get laid out and the frame gets rendered
+        taskMgr.add(self.sync, self.taskName, sort=47)
+        self.scheduled = True
+
+    def unschedule(self):
+        if self.scheduled:
+            taskMgr.remove(self.taskName)
+            self.scheduled = False
+
+    def sync(self, task=None):
+        """Apply all collected changes to the widgets now"""
+        connectors = self.connectors
+        nodes = self.nodes
+        callbacks = self.callbacks
+        self.connectors = {}
+        self.nodes = {}
+        self.callbacks = {}
+        if task is None:
+            self.unschedule()
+        self.scheduled = False
+
+        for connector, hasError in connectors.items():
+            if hasError:
+                connector.setError(True)
+            else:
+                connector.setChecked()
+        for node in nodes:
+            node.updateView()
+        for callback in callbacks:
+            callback()
+        if task is not None:
+            return task.done
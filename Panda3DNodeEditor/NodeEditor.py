@@ -21,12 +21,23 @@ from direct.showbase.DirectObject import DirectObject
 from direct.directtools.DirectGeometry import LineNodePath
 
 from Panda3DNodeEditor.SaveScripts.SaveJSON import Save
+from Panda3DNodeEditor.SaveScripts.AutoSave import AutoSave
+from Panda3DNodeEditor.SaveScripts.Journal import Journal
 from Panda3DNodeEditor.LoadScripts.LoadJSON import Load
 from Panda3DNodeEditor.GUI.MainView import MainView
+from Panda3DNodeEditor.GUI.RenderOnDemand import RenderOnDemand
 from Panda3DNodeEditor.NodeCore.NodeManager import NodeManager
+from Panda3DNodeEditor.NodeCore.NodeProfiler import NodeProfiler
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import (
+    LOD_FULL,
+    LOD_REDUCED,
+    LOD_SIMPLE)
 
 class NodeEditor(DirectObject):
-    def __init__(self, parent, customNodeMap={}, customExporterMap={}):
+    def __init__(self, parent, customNodeMap={}, customExporterMap={},
+            autoSaveInterval=60, autoSaveRetention=3, journaledSaves=False,
+            undoMemoryLimit=16*1024*1024, renderOnDemand=False,
+            deactivateIdleWindow=False):
 
         DirectObject.__init__(self)
 
@@ -50,7 +61,36 @@ class NodeEditor(DirectObject):
         #
         # NODE MANAGER
         #
-        self.nodeMgr = NodeManager(self.viewNP, customNodeMap)
+        self.nodeMgr = NodeManager(self.viewNP, customNodeMap, undoMemoryLimit)
+
+        # Timing of the node logic, disabled by default
+        self.profiler = NodeProfiler(self.nodeMgr.evaluator)
+
+        # Periodic backup of the editor content, saved in the background
+        self.autoSave = AutoSave(
+            self.nodeMgr,
+            interval=autoSaveInterval,
+            retention=autoSaveRetention)
+
+        # Save only the changes made since the last save to a journal
+        # next to the project file instead of rewriting the project
+        self.journal = Journal(self.nodeMgr) if journaledSaves else None
+
+        # Only render frames after inputs and changes of the editor
+        self.renderOnDemand = None
+        if renderOnDemand:
+            self.renderOnDemand = RenderOnDemand(deactivateWindow=deactivateIdleWindow)
+
+        # Viewport culling
+        # the margin around the visible area in which nodes will be kept
+        # alive, given as fraction of the visible area
+        self.cullMargin = 0.25
+
+        # Level of detail
+        # the view scales below which nodes will be drawn with less detail
+        self.lodThresholds = {
+            LOD_REDUCED: 0.3,
+            LOD_SIMPLE: 0.2}
 
         # Drag view
         self.mouseSpeed = 1
@@ -60,11 +100,21 @@ class NodeEditor(DirectObject):
         # Box select
         # variables to store the start and current pos of the mousepointer
         self.startPos = LPoint2f(0,0)
-        self.lastPos = LPoint2f(0,0)
-        # variables for the to be drawn box
+        self.lastPos = None
+        # the box is a unit card which is moved and scaled to span from
+        # the start to the current mouse position
         self.boxCardMaker = CardMaker("SelectionBox")
         self.boxCardMaker.setColor(1,1,1,0.25)
-        self.box = None
+        self.boxCardMaker.setFrame(0, 1, 0, 1)
+        self.box = render2d.attachNewNode(self.boxCardMaker.generate())
+        self.box.setBin("gui-popup", 25)
+        self.box.setTransparency(TransparencyAttrib.M_alpha)
+        self.box.setTwoSided(True)
+        self.box.hide()
+
+        # Drag line
+        # created on the first connection drag and reused afterwards
+        self.line = None
 
         #
         # MENU BAR
@@ -87,9 +137,9 @@ class NodeEditor(DirectObject):
         Enable the editor.
         """
         self.enable_events()
-
-        # Task for handling dragging of the camera/view
-        taskMgr.add(self.updateCam, "NodeEditor_task_camActualisation", priority=-4)
+        self.autoSave.start()
+        if self.renderOnDemand is not None:
+            self.renderOnDemand.start()
 
         self.viewNP.show()
         self.nodeMgr.showConnections()
@@ -99,6 +149,9 @@ class NodeEditor(DirectObject):
         Disable the editor.
         """
         self.ignore_all()
+        self.autoSave.stop()
+        if self.renderOnDemand is not None:
+            self.renderOnDemand.stop()
         taskMgr.remove("NodeEditor_task_camActualisation")
 
         self.viewNP.hide()
@@ -131,14 +184,22 @@ class NodeEditor(DirectObject):
         # Duplicate/Copy nodes
         self.accept("shift-d", self.nodeMgr.copyNodes)
         self.accept("NodeEditor_copyNodes", self.nodeMgr.copyNodes)
+        # Undo and redo
+        self.accept("control-z", self.nodeMgr.undo)
+        self.accept("control-y", self.nodeMgr.redo)
+        self.accept("control-shift-z", self.nodeMgr.redo)
+        self.accept("NodeEditor_undo", self.nodeMgr.undo)
+        self.accept("NodeEditor_redo", self.nodeMgr.redo)
         # Refresh node logics
         self.accept("ctlr-r", self.nodeMgr.updateAllLeaveNodes)
         self.accept("NodeEditor_refreshNodes", self.nodeMgr.updateAllLeaveNodes)
+        self.accept("NodeEditor_toggleProfiler", self.profiler.toggle)
 
         #
         # SOCKET RELATED EVENTS
         #
         self.accept("updateConnectedNodes", self.nodeMgr.updateConnectedNodes)
+        self.accept("NodeEditor_socketValueChanged", self.nodeMgr.recordValueChange)
         # Socket connection with drag and drop
         self.accept("startPlug", self.nodeMgr.setStartPlug)
         self.accept("endPlug", self.nodeMgr.setEndPlug)
@@ -151,7 +212,7 @@ class NodeEditor(DirectObject):
         #
         # CONNECTION RELATED EVENTS
         #
-        self.accept("NodeEditor_updateConnections", self.nodeMgr.updateConnections)
+        self.accept("NodeEditor_updateConnections", self.updateNodeLayout)
 
         #
         # PROJECT MANAGEMENT
@@ -178,6 +239,7 @@ class NodeEditor(DirectObject):
         # Zooming
         self.accept("NodeEditor_zoom", self.zoom)
         self.accept("NodeEditor_zoom_reset", self.zoomReset)
+        self.accept("NodeEditor_toggleCulling", self.toggleCulling)
         self.accept("wheel_up", self.zoom, [True])
         self.accept("wheel_down", self.zoom, [False])
 
@@ -194,17 +256,26 @@ class NodeEditor(DirectObject):
     # PROJECT FUNCTIONS
     # ------------------------------------------------------------------
     def newProject(self):
+        base.messenger.send("NodeEditor_cancelLoad")
         self.nodeMgr.cleanup()
-        self.lastSavePath = None
+        self.setLastPath(None)
 
     def saveProject(self):
+        if self.journal is not None and self.journal.canSave(self.lastSavePath):
+            self.journal.save()
+            return
         Save(self.nodeMgr.nodeList, self.nodeMgr.connections, filepath=self.lastSavePath)
+        if self.lastSavePath is not None:
+            self.setLastPath(self.lastSavePath)
 
     def saveAsProject(self):
         Save(self.nodeMgr.nodeList, self.nodeMgr.connections)
 
     def loadProject(self):
+        base.messenger.send("NodeEditor_cancelLoad")
         self.nodeMgr.cleanup()
+        if self.journal is not None:
+            self.journal.unbind()
         Load(self.nodeMgr)
 
     def customExport(self, exporter):
@@ -212,15 +283,25 @@ class NodeEditor(DirectObject):
 
     def setLastPath(self, path):
         self.lastSavePath = path
+        if self.journal is not None:
+            self.journal.bind(path)
 
     def set_dirty(self):
         base.messenger.send("request_dirty_name")
         self.dirty = True
+        self.requestRender()
 
     def set_clean(self):
         base.messenger.send("request_clean_name")
         self.dirty = False
         self.hasSaved = True
+        self.requestRender()
+
+    def requestRender(self):
+        """Make sure the changes of the editor get rendered if frames
+        are only rendered on demand"""
+        if self.renderOnDemand is not None:
+            self.renderOnDemand.request()
 
     # ------------------------------------------------------------------
     # CAMERA SPECIFIC FUNCTIONS
@@ -234,20 +315,28 @@ class NodeEditor(DirectObject):
             self.mousePos = Point2(x, y)
         # set the variable according to if we want to move the camera or not
         self.startCameraMovement = moveCamera
+        # the camera task only runs while the view is dragged
+        if moveCamera:
+            if not taskMgr.hasTaskNamed("NodeEditor_task_camActualisation"):
+                taskMgr.add(self.updateCam, "NodeEditor_task_camActualisation", priority=-4)
+        else:
+            taskMgr.remove("NodeEditor_task_camActualisation")
 
     def updateCam(self, task):
         """Task that will move the editor area/camera around according
         to mouse movements"""
-        # variables to store the mouses current x and y position
-        x = 0.0
-        y = 0.0
-        if base.mouseWatcherNode.hasMouse():
-            # get the mouse position
-            x = base.mouseWatcherNode.getMouseX()
-            y = base.mouseWatcherNode.getMouseY()
-        if base.mouseWatcherNode.hasMouse() \
-        and self.mousePos is not None \
-        and self.startCameraMovement:
+        if not base.mouseWatcherNode.hasMouse():
+            return task.cont
+        # get the mouse position
+        x = base.mouseWatcherNode.getMouseX()
+        y = base.mouseWatcherNode.getMouseY()
+        if self.mousePos is None:
+            self.mousePos = Point2(x, y)
+            return task.cont
+        if x == self.mousePos.getX() and y == self.mousePos.getY():
+            # the mouse hasn't moved, nothing to do
+            return task.cont
+        if self.startCameraMovement:
             # Move the viewer node aspect independent
             wp = base.win.getProperties()
             aspX = 1.0
@@ -265,7 +354,7 @@ class NodeEditor(DirectObject):
             self.viewNP.setX(self.viewNP, -mouseMoveX)
             self.viewNP.setZ(self.viewNP, -mouseMoveY)
 
-            self.nodeMgr.updateConnections()
+            self.updateCulling()
 
         # continue the task until it got manually stopped
         return task.cont
@@ -283,12 +372,47 @@ class NodeEditor(DirectObject):
             s = self.viewNP.getScale()
             if s.getX()-zoomFactor > maxZoomOut and s.getY()-zoomFactor > maxZoomOut and s.getZ()-zoomFactor > maxZoomOut:
                 self.viewNP.setScale(s.getX()-zoomFactor,s.getY()-zoomFactor,s.getZ()-zoomFactor)
-        self.nodeMgr.updateConnections()
+        self.updateLOD()
+        self.updateCulling()
 
     def zoomReset(self):
         """Set the zoom level back to the default"""
         self.viewNP.setScale(0.5)
-        self.nodeMgr.updateConnections()
+        self.updateLOD()
+        self.updateCulling()
+
+    def updateLOD(self):
+        """Switch the level of detail of the nodes according to the current
+        zoom level"""
+        scale = self.viewNP.getScale().getX()
+        lod = LOD_FULL
+        for level, threshold in self.lodThresholds.items():
+            if scale < threshold:
+                lod = max(lod, level)
+        self.nodeMgr.setLOD(lod)
+
+    # ------------------------------------------------------------------
+    # VIEWPORT CULLING
+    # ------------------------------------------------------------------
+    def toggleCulling(self):
+        """Enable or disable the culling of nodes outside of the view"""
+        self.nodeMgr.setCulling(not self.nodeMgr.cullingEnabled)
+        self.updateCulling()
+
+    def updateCulling(self):
+        """Stash all nodes which moved out of the visible area and bring
+        back the ones that moved in"""
+        if not self.nodeMgr.cullingEnabled:
+            return
+        bottomLeft = self.viewNP.getRelativePoint(render2d, Point3(-1, 0, -1))
+        topRight = self.viewNP.getRelativePoint(render2d, Point3(1, 0, 1))
+        marginX = (topRight.getX() - bottomLeft.getX()) * self.cullMargin
+        marginZ = (topRight.getZ() - bottomLeft.getZ()) * self.cullMargin
+        self.nodeMgr.cullNodes(
+            bottomLeft.getX() - marginX,
+            topRight.getX() + marginX,
+            bottomLeft.getZ() - marginZ,
+            topRight.getZ() + marginZ)
 
     # ------------------------------------------------------------------
     # DRAG LINE
@@ -296,29 +420,32 @@ class NodeEditor(DirectObject):
     def startLineDrawing(self, startPos):
         """Start a task that will draw a line from the given start
         position to the cursor"""
-        self.line = LineNodePath(render2d, thickness=2, colorVec=(0.8,0.8,0.8,1))
+        if self.line is None:
+            self.line = LineNodePath(render2d, thickness=2, colorVec=(0.8,0.8,0.8,1))
+        # create the line once, the task only moves its end point
+        self.line.reset()
         self.line.moveTo(startPos)
+        self.line.drawTo(startPos)
+        self.line.create()
+        self.line.show()
         t = taskMgr.add(self.drawLineTask, "drawLineTask")
-        t.startPos = startPos
+        t.lastMouse = None
 
     def drawLineTask(self, task):
         """Draws a line from a given start position to the cursor"""
         mwn = base.mouseWatcherNode
         if mwn.hasMouse():
-            pos = Point3(mwn.getMouse()[0], 0, mwn.getMouse()[1])
-
-            self.line.reset()
-            self.line.moveTo(task.startPos)
-            self.line.drawTo(pos)
-            self.line.create()
+            mouse = LPoint2f(mwn.getMouse())
+            if mouse != task.lastMouse:
+                task.lastMouse = mouse
+                self.line.setVertex(1, Point3(mouse.getX(), 0, mouse.getY()))
         return task.cont
 
     def stopLineDrawing(self):
         """Stop the task that draws a line to the cursor"""
         taskMgr.remove("drawLineTask")
         if self.line is not None:
-            self.line.reset()
-            self.line = None
+            self.line.hide()
 
     # ------------------------------------------------------------------
     # EDITOR NODE DRAGGING UPDATE
@@ -330,8 +457,10 @@ class NodeEditor(DirectObject):
         self.draggedNode = node
         self.draggedNode.disable()
         self.tempNodePositions = {}
+        self.dragStartPositions = {}
         for node in self.nodeMgr.selectedNodes:
             self.tempNodePositions[node] = node.frame.getPos(render2d)
+            self.dragStartPositions[node] = node.getPos()
 
     def updateNodeMove(self, mouseA, mouseB):
         """Will be called as long as a node is beeing dragged around"""
@@ -340,7 +469,7 @@ class NodeEditor(DirectObject):
                 editVec = Vec3(self.tempNodePositions[node] - mouseA)
                 newPos = mouseB + editVec
                 node.frame.setPos(render2d, newPos)
-        self.nodeMgr.updateConnections()
+        self.nodeMgr.updateConnections(self.nodeMgr.selectedNodes)
 
     def updateNodeStop(self, node=None):
         """Will be called when a node dragging stopped"""
@@ -348,7 +477,15 @@ class NodeEditor(DirectObject):
         self.draggedNode.enable()
         self.draggedNode = None
         self.tempNodePositions = {}
-        self.nodeMgr.updateConnections()
+        self.updateNodeLayout(self.nodeMgr.selectedNodes)
+        self.nodeMgr.recordMoves(self.dragStartPositions)
+        self.dragStartPositions = {}
+
+    def updateNodeLayout(self, nodes=None):
+        """Update the connections and stored bounds of the given nodes or
+        of all nodes if none are given after they have been moved or
+        resized"""
+        self.nodeMgr.updateLayout(nodes)
 
     # ------------------------------------------------------------------
     # SELECTION BOX
@@ -364,134 +501,46 @@ class NodeEditor(DirectObject):
         """Stop the draw box task and remove the box"""
         if not taskMgr.hasTaskNamed("dragBoxDrawTask"): return
         taskMgr.remove("dragBoxDrawTask")
+        self.box.hide()
         if self.startPos is None or self.lastPos is None: return
         self.nodeMgr.deselectAll()
 
-        if self.box is not None:
-            for node in self.nodeMgr.getAllNodes():
-                # store some view scales for calculations
-                viewXScale = self.viewNP.getScale().getX()
-                viewZScale = self.viewNP.getScale().getZ()
-
-                # calculate the node edges
-                p = node.frame.get_parent()
-                nodeLeft = node.getLeft(p) * viewXScale / base.a2dRight
-                nodeRight = node.getRight(p) * viewXScale / base.a2dRight
-                nodeBottom = node.getBottom(p) * viewZScale / base.a2dTop
-                nodeTop = node.getTop(p) * viewZScale / base.a2dTop
-
-                # calculate bounding box edges
-                left = min(self.lastPos.getX(), self.startPos.getX())
-                right = max(self.lastPos.getX(), self.startPos.getX())
-                top = max(self.lastPos.getY(), self.startPos.getY())
-                bottom = min(self.lastPos.getY(), self.startPos.getY())
-
-                l_in_l = left > nodeLeft
-                r_in_r = right < nodeRight
-                b_in_t = bottom < nodeTop
-                t_in_b = top > nodeBottom
-
-                r_in_l = right > nodeLeft
-                l_in_r = left < nodeRight
-                t_in_t = top < nodeTop
-                b_in_b = bottom > nodeBottom
-
-                l_out_l = left < nodeLeft
-                r_out_r = right > nodeRight
-                b_out_b = bottom < nodeBottom
-                t_out_t = top > nodeTop
-
-                nodeHit = False
-
-                #
-                # Side checks
-                #
-                if l_in_l and r_in_r and t_in_b and t_in_t:
-                    # Box hits middle from below
-                    nodeHit = True
-                elif l_in_l and r_in_r and b_in_t and b_in_b:
-                    # Box hits middle from above
-                    nodeHit = True
-                elif t_in_t and b_in_b and r_in_l and r_in_r:
-                    # Box hits middle from left
-                    nodeHit = True
-                elif t_in_t and b_in_b and l_in_r and l_in_l:
-                    # Box hits middle from right
-                    nodeHit = True
-
-                #
-                # Corner checks
-                #
-                elif r_in_l and r_in_r and b_in_t and b_in_b:
-                    # Box hits top left corner
-                    nodeHit = True
-                elif l_in_r and l_in_l and b_in_t and b_in_b:
-                    # Box hits top right corner
-                    nodeHit = True
-                elif l_in_r and l_in_l and t_in_b and t_in_t:
-                    # Box hits bottom right corner
-                    nodeHit = True
-                elif r_in_l and r_in_r and t_in_b and t_in_t:
-                    # Box hits bottom left corner
-                    nodeHit = True
-
-                #
-                # surrounding checks
-                #
-                elif l_in_r and l_in_l and t_out_t and b_out_b:
-                    # box encases the left of the node
-                    nodeHit = True
-                elif r_in_l and r_in_r and t_out_t and b_out_b:
-                    # box encases the right of the node
-                    nodeHit = True
-                elif t_in_b and t_in_t and r_out_r and l_out_l:
-                    # box encases the bottom of the node
-                    nodeHit = True
-                elif b_in_t and b_in_b and r_out_r and l_out_l:
-                    # box encases the top of the node
-                    nodeHit = True
-
-                #
-                # Node fully encased
-                #
-                elif l_out_l and r_out_r and b_out_b and t_out_t:
-                    # box encased fully
-                    nodeHit = True
-
-                if nodeHit:
-                    self.nodeMgr.selectNode(node, True, True)
-
-            # Cleanup the selection box
-            self.box.removeNode()
-            self.startPos = None
-            self.lastPos = None
+        # calculate bounding box edges
+        left = min(self.lastPos.getX(), self.startPos.getX())
+        right = max(self.lastPos.getX(), self.startPos.getX())
+        top = max(self.lastPos.getY(), self.startPos.getY())
+        bottom = min(self.lastPos.getY(), self.startPos.getY())
+
+        for node in self.nodeMgr.nodesInRect(left, right, bottom, top, render2d):
+            self.nodeMgr.selectNode(node, True, True)
+
+        self.startPos = None
+        self.lastPos = None
 
     def dragBoxDrawTask(self, task):
         """This task will track the mouse position and actualize the box's size
         according to the first click position of the mouse"""
-        if base.mouseWatcherNode.hasMouse():
-            if self.startPos is None:
-                self.startPos = LPoint2f(base.mouseWatcherNode.getMouse())
-            # get the current mouse position
-            self.lastPos = LPoint2f(base.mouseWatcherNode.getMouse())
-        else:
+        if not base.mouseWatcherNode.hasMouse():
             return task.cont
+        # get the current mouse position
+        mousePos = LPoint2f(base.mouseWatcherNode.getMouse())
+        if self.startPos is None:
+            self.startPos = mousePos
+        if mousePos == self.lastPos:
+            # the mouse hasn't moved, the box is still up to date
+            return task.cont
+        self.lastPos = mousePos
 
-        # check if we already have a box
-        if self.box != None:
-            # if so, remove that old box
-            self.box.removeNode()
         # set the box's size
-        self.boxCardMaker.setFrame(
-        	self.lastPos.getX(),
-        	self.startPos.getX(),
-        	self.startPos.getY(),
-        	self.lastPos.getY())
-        # generate, setup and draw the box
-        node = self.boxCardMaker.generate()
-        self.box = render2d.attachNewNode(node)
-        self.box.setBin("gui-popup", 25)
-        self.box.setTransparency(TransparencyAttrib.M_alpha)
+        width = self.lastPos.getX() - self.startPos.getX()
+        height = self.lastPos.getY() - self.startPos.getY()
+        if width == 0 or height == 0:
+            # a box without an area can't be scaled to
+            self.box.hide()
+        else:
+            self.box.setPos(self.startPos.getX(), 0, self.startPos.getY())
+            self.box.setScale(width, 1, height)
+            self.box.show()
 
         # run until the task is manually stopped
         return task.cont
@@ -0,0 +1,162 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+import glob
+import time
+import logging
+import tempfile
+import threading
+
+from direct.showbase.DirectObject import DirectObject
+
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+class AutoSave(DirectObject):
+    """Periodically saves the editor content to a backup file.
+
+    The state of the nodes is copied into a snapshot on the main thread,
+    spread over as many frames as needed to stay within frameBudget
+    seconds per frame. If the graph changes while the snapshot is taken,
+    it is thrown away and retried on the next interval. The snapshot is
+    turned into JSON and written on a worker thread, first to a temporary
+    file which then replaces the target, so a crash never leaves a half
+    written backup behind. Only the newest retention backups are kept.
+
+    Nothing is written if the graph didn't change since the last save."""
+    def __init__(self, nodeMgr, interval=60, retention=3, directory=None, frameBudget=0.001):
+        DirectObject.__init__(self)
+        self.nodeMgr = nodeMgr
+        # seconds between two saves
+        self.interval = interval
+        # number of backup files to keep
+        self.retention = retention
+        self.directory = directory if directory is not None else \
+            os.path.join(tempfile.gettempdir(), "NodeEditorAutoSave")
+        self.frameBudget = frameBudget
+
+        self.jsonTools = JSONTools()
+        # incremented on every change of the graph
+        self.changeCount = 0
+        # change count of the content that has been saved last
+        self.savedChangeCount = 0
+
+        self.snapshotState = None
+        self.writer = None
+
+    def start(self):
+        self.accept("NodeEditor_set_dirty", self.setDirty)
+        self.accept("NodeEditor_set_clean", self.setClean)
+        self.schedule()
+
+    def stop(self):
+        self.ignoreAll()
+        taskMgr.remove("NodeEditor_autoSave")
+        taskMgr.remove("NodeEditor_autoSaveSnapshot")
+        self.snapshotState = None
+
+    def setDirty(self):
+        self.changeCount += 1
+
+    def setClean(self):
+        """The content has been saved or loaded, nothing to back up"""
+        self.changeCount += 1
+        self.savedChangeCount = self.changeCount
+
+    def schedule(self):
+        taskMgr.remove("NodeEditor_autoSave")
+        taskMgr.doMethodLater(self.interval, self.startSnapshot, "NodeEditor_autoSave")
+
+    def startSnapshot(self, task=None):
+        """Start taking a snapshot if anything changed since the last save"""
+        if self.changeCount == self.savedChangeCount \
+        or (self.writer is not None and self.writer.is_alive()):
+            self.schedule()
+            return
+        self.snapshotState = {
+            "changeCount": self.changeCount,
+            "nodes": list(self.nodeMgr.nodeList),
+            "connections": list(self.nodeMgr.connections),
+            "nodeIndex": 0,
+            "connectorIndex": 0,
+            "nodeSnapshots": [],
+            "connectorSnapshots": []}
+        taskMgr.add(self.snapshotTask, "NodeEditor_autoSaveSnapshot")
+
+    def snapshotTask(self, task):
+        state = self.snapshotState
+        if state is None:
+            return task.done
+        if state["changeCount"] != self.changeCount:
+            # the graph changed while we were taking the snapshot
+            self.snapshotState = None
+            self.schedule()
+            return task.done
+
+        deadline = time.perf_counter() + self.frameBudget
+        nodes = state["nodes"]
+        connections = state["connections"]
+        while time.perf_counter() < deadline:
+            nodeIndex = state["nodeIndex"]
+            connectorIndex = state["connectorIndex"]
+            if nodeIndex < len(nodes):
+                for node in nodes[nodeIndex:nodeIndex + 32]:
+                    state["nodeSnapshots"].append(self.jsonTools.snapshotNode(node))
+                state["nodeIndex"] = nodeIndex + 32
+            elif connectorIndex < len(connections):
+                for connector in connections[connectorIndex:connectorIndex + 128]:
+                    state["connectorSnapshots"].append(self.jsonTools.snapshotConnector(connector))
+                state["connectorIndex"] = connectorIndex + 128
+            else:
+                self.snapshotState = None
+                snapshot = (state["nodeSnapshots"], state["connectorSnapshots"])
+                self.writer = threading.Thread(
+                    target=self.write,
+                    args=(snapshot, state["changeCount"]),
+                    name="NodeEditor_autoSaveWriter",
+                    daemon=True)
+                self.writer.start()
+                self.schedule()
+                return task.done
+        return task.cont
+
+    def write(self, snapshot, changeCount):
+        """Write the snapshot to a new backup file. Runs on the worker
+        thread and must not touch any editor objects."""
+        try:
+            data = json.dumps(self.jsonTools.fromSnapshot(snapshot))
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(
+                self.directory,
+                time.strftime("NEAutoSave-%Y%m%d-%H%M%S.logic"))
+            fd, tmpPath = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as outfile:
+                    outfile.write(data)
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+                os.replace(tmpPath, path)
+            except BaseException:
+                os.remove(tmpPath)
+                raise
+            self.removeOldBackups()
+            # only mark as saved if nothing changed in the meantime
+            if self.savedChangeCount < changeCount:
+                self.savedChangeCount = changeCount
+            logging.info(f"Auto saved project to {path}")
+        except Exception:
+            logging.error("Auto save failed", exc_info=True)
+
+    def removeOldBackups(self):
+        backups = sorted(glob.glob(os.path.join(self.directory, "NEAutoSave-*.logic")))
+        for path in backups[:max(0, len(backups) - self.retention)]:
+            try:
+                os.remove(path)
+            except OSError:
+                logging.warning(f"Couldn't remove old auto save {path}")
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+import logging
+
+from Panda3DNodeEditor.SaveScripts.SaveJSON import Save
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+
+class Journal:
+    """Saves projects by appending the changes made since the last save
+    to a journal next to the project file.
+
+    The changes are collected from the mutation listener of the node
+    manager, so saving after a few edits only writes those edits instead
+    of the whole project. Once the journal holds more than
+    compactThreshold records, the next save writes the full project again
+    and removes the journal. Loading a project applies its journal."""
+    def __init__(self, nodeMgr, compactThreshold=1000):
+        self.nodeMgr = nodeMgr
+        self.compactThreshold = compactThreshold
+        self.journalTools = JournalTools()
+
+        # the project file the journal belongs to
+        self.path = None
+        # number of records stored in the journal file
+        self.recordCount = 0
+        # changes made since the last save
+        self.pending = []
+
+        self.nodeMgr.addMutationListener(self.addChangeSet)
+
+    def destroy(self):
+        self.nodeMgr.removeMutationListener(self.addChangeSet)
+
+    def addChangeSet(self, changeSet):
+        self.pending.append(changeSet)
+
+    def bind(self, path):
+        """Start journaling changes for the project stored at path. Must
+        be called after the project has been fully saved or loaded."""
+        self.path = path
+        self.pending = []
+        self.recordCount = 0
+        if path is None:
+            return
+        changeSets = self.journalTools.readChangeSets(path)
+        journalPath = self.journalTools.getJournalPath(path)
+        if changeSets is None and os.path.exists(journalPath):
+            # the journal belongs to an older version of the project
+            os.remove(journalPath)
+        elif changeSets is not None:
+            self.recordCount = sum(len(changeSet) for changeSet in changeSets)
+
+    def unbind(self):
+        self.bind(None)
+
+    def canSave(self, path):
+        """Returns True if the project at path can be saved by appending
+        to its journal"""
+        return path is not None and path == self.path and os.path.exists(path)
+
+    def save(self):
+        """Append all changes since the last save to the journal or write
+        the full project if the journal grew too big"""
+        numRecords = sum(len(changeSet) for changeSet in self.pending)
+        if self.recordCount + numRecords > self.compactThreshold:
+            self.compact()
+            return
+
+        if self.pending:
+            journalPath = self.journalTools.getJournalPath(self.path)
+            isNew = not os.path.exists(journalPath)
+            with open(journalPath, 'a') as outfile:
+                if isNew:
+                    header = {"base": self.journalTools.getBaseHeader(self.path)}
+                    outfile.write(json.dumps(header) + "\n")
+                for changeSet in self.pending:
+                    outfile.write(json.dumps(changeSet) + "\n")
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            self.recordCount += numRecords
+            self.pending = []
+            logging.info(f"Appended {numRecords} changes to {journalPath}")
+
+        base.messenger.send("NodeEditor_set_clean")
+
+    def compact(self):
+        """Write the full project and remove its journal"""
+        Save(self.nodeMgr.nodeList, self.nodeMgr.connections, filepath=self.path)
+        journalPath = self.journalTools.getJournalPath(self.path)
+        if os.path.exists(journalPath):
+            os.remove(journalPath)
+        self.bind(self.path)
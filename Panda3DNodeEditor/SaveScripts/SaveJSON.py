@@ -17,6 +17,7 @@ from direct.gui.DirectDialog import YesNoDialog
 
 from DirectFolderBrowser.DirectFolderBrowser import DirectFolderBrowser
 from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+from Panda3DNodeEditor.Tools import BinaryTools
 
 class Save:
     def __init__(self, nodes, connections, exceptionSave=False, filepath=None):
@@ -48,7 +49,11 @@ class Save:
         del self.browser
 
     def __executeSave(self, path):
-        with open(path, 'w') as outfile:
-            json.dump(self.jsonElements, outfile, indent=2)
+        if path.endswith(BinaryTools.EXTENSION):
+            with open(path, 'wb') as outfile:
+                outfile.write(BinaryTools.BinaryTools().dumps(self.jsonElements))
+        else:
+            with open(path, 'w') as outfile:
+                json.dump(self.jsonElements, outfile, indent=2)
 
         base.messenger.send("NodeEditor_set_clean")
@@ -0,0 +1,417 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import sys
+import struct
+from array import array
+from itertools import repeat
+
+MAGIC = b"NEBP"
+FORMAT_VERSION = 1
+# file extension selecting the binary format when saving
+EXTENSION = ".blogic"
+
+# value tags
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STRING = 5
+TAG_LIST = 6
+TAG_DICT = 7
+# marks a socket without a stored value
+TAG_ABSENT = 8
+TAG_BIGINT = 9
+# lists only containing floats, like positions
+TAG_FLOAT_LIST = 10
+
+# tags of values that are stored in the value stream instead of a column
+STREAM_TAGS = (TAG_LIST, TAG_DICT, TAG_BIGINT, TAG_FLOAT_LIST)
+
+NODE_KEYS = ("id", "type", "pos", "inSockets", "outSockets")
+SOCKET_KEYS = ("id", "value")
+CONNECTION_KEYS = ("id", "nodeA_ID", "nodeB_ID", "socketA_ID", "socketB_ID")
+
+U8 = struct.Struct("<B")
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+
+# returned for sockets without a stored value
+ABSENT = object()
+
+
+class BinaryTools:
+    """Converts project data as created by JSONTools to a compact binary
+    layout and back without losing any information.
+
+    All strings are stored once in a string table and referenced by
+    index. Ids are stored as 16 raw bytes and connections refer to the
+    ids of their nodes and sockets by index. Values are split into a tag
+    column and one column per simple value type, so they can be read
+    with a few bulk operations, nested values follow as tagged stream.
+    Members that are not part of the known project layout are stored as
+    tagged values as well. Ids have to be UUIDs in their canonical
+    string form."""
+
+    def isBinary(self, data):
+        """Returns True if the given bytes start like a binary project"""
+        return data[:len(MAGIC)] == MAGIC
+
+    #-------------------------------------------------------------------
+    # WRITING
+    #-------------------------------------------------------------------
+    def dumps(self, jsonElements):
+        """Returns the given project data as bytes"""
+        self.strings = {}
+        nodes = jsonElements.get("Nodes", [])
+        connections = jsonElements.get("Connections", [])
+        extra = {k: v for k, v in jsonElements.items() if k not in ("Nodes", "Connections")}
+
+        nodeIDs = []
+        socketIDs = []
+        types = array("I")
+        inCounts = array("I")
+        outCounts = array("I")
+        positions = []
+        values = []
+        nodeExtras = []
+        for i, node in enumerate(nodes):
+            nodeIDs.append(node["id"])
+            types.append(self.__string(node["type"]))
+            inCounts.append(len(node["inSockets"]))
+            outCounts.append(len(node["outSockets"]))
+            positions.append(node["pos"])
+            for socket in node["inSockets"] + node["outSockets"]:
+                if len(socket) > 2 or any(k not in SOCKET_KEYS for k in socket):
+                    raise ValueError(f"Unknown socket members in {socket}")
+                socketIDs.append(socket["id"])
+                values.append(socket.get("value", ABSENT))
+            if len(node) > len(NODE_KEYS):
+                nodeExtras.append((i, {k: v for k, v in node.items() if k not in NODE_KEYS}))
+
+        # connections refer to the node and socket ids by index
+        ids = nodeIDs + socketIDs
+        idIndex = {uuid: i for i, uuid in enumerate(ids)}
+        connectionIDs = []
+        references = array("I")
+        referencedIDs = []
+        connectionExtras = []
+        for i, connection in enumerate(connections):
+            connectionIDs.append(connection["id"])
+            for key in CONNECTION_KEYS[1:]:
+                uuid = connection[key]
+                index = idIndex.get(uuid)
+                if index is None:
+                    # a node or socket that is not part of this project,
+                    # these are stored after the connection ids
+                    index = idIndex[uuid] = len(ids) + len(connections) + len(referencedIDs)
+                    referencedIDs.append(uuid)
+                references.append(index)
+            if len(connection) > len(CONNECTION_KEYS):
+                connectionExtras.append((i, {k: v for k, v in connection.items() if k not in CONNECTION_KEYS}))
+
+        chunks = [
+            U32.pack(len(nodes)),
+            U32.pack(len(socketIDs)),
+            U32.pack(len(connections)),
+            U32.pack(len(referencedIDs)),
+            self.__uuids(ids + connectionIDs + referencedIDs),
+            self.__array(types),
+            self.__array(inCounts),
+            self.__array(outCounts),
+            self.__array(references)]
+        self.__column(chunks, positions)
+        self.__column(chunks, values)
+        self.__extras(chunks, nodeExtras)
+        self.__extras(chunks, connectionExtras)
+        self.__value(chunks, extra)
+
+        # the string table is complete now and has to come first
+        strings = [s.encode("utf-8") for s in self.strings]
+        header = [
+            MAGIC,
+            U8.pack(FORMAT_VERSION),
+            U32.pack(len(strings)),
+            self.__array(array("I", [len(s) for s in strings])),
+            b"".join(strings)]
+        self.strings = None
+        return b"".join(header + chunks)
+
+    def __string(self, string):
+        index = self.strings.get(string)
+        if index is None:
+            index = self.strings[string] = len(self.strings)
+        return index
+
+    def __array(self, values):
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    def __uuids(self, ids):
+        for uuid in ids:
+            if len(uuid) != 36 or uuid[8] != "-" or uuid[13] != "-" \
+            or uuid[18] != "-" or uuid[23] != "-" or uuid != uuid.lower():
+                raise ValueError(f"Not a canonical UUID: {uuid}")
+        return bytes.fromhex("".join(ids).replace("-", ""))
+
+    def __column(self, chunks, values):
+        """Append a column of values. Simple values are stored in typed
+        arrays, all others follow as tagged values."""
+        tags = bytearray()
+        strings = array("I")
+        ints = array("q")
+        floats = array("d")
+        stream = []
+        for value in values:
+            if value is ABSENT:
+                tags.append(TAG_ABSENT)
+            elif value is None:
+                tags.append(TAG_NONE)
+            elif value is True:
+                tags.append(TAG_TRUE)
+            elif value is False:
+                tags.append(TAG_FALSE)
+            elif isinstance(value, str):
+                tags.append(TAG_STRING)
+                strings.append(self.__string(value))
+            elif isinstance(value, float):
+                tags.append(TAG_FLOAT)
+                floats.append(value)
+            elif isinstance(value, int) and -2**63 <= value < 2**63:
+                tags.append(TAG_INT)
+                ints.append(value)
+            else:
+                streamStart = len(stream)
+                self.__value(stream, value)
+                tags.append(stream[streamStart][0])
+        chunks.append(bytes(tags))
+        for column in (strings, ints, floats):
+            chunks.append(U32.pack(len(column)))
+            chunks.append(self.__array(column))
+        chunks += stream
+
+    def __extras(self, chunks, extras):
+        """Append the members of nodes or connections that are not part of
+        the known layout as (index, dict) pairs"""
+        chunks.append(U32.pack(len(extras)))
+        for index, members in extras:
+            chunks.append(U32.pack(index))
+            self.__value(chunks, members)
+
+    def __value(self, chunks, value):
+        """Append the tagged value to the given list of chunks"""
+        if value is None:
+            chunks.append(U8.pack(TAG_NONE))
+        elif value is True:
+            chunks.append(U8.pack(TAG_TRUE))
+        elif value is False:
+            chunks.append(U8.pack(TAG_FALSE))
+        elif isinstance(value, int):
+            if -2**63 <= value < 2**63:
+                chunks.append(U8.pack(TAG_INT) + I64.pack(value))
+            else:
+                chunks.append(U8.pack(TAG_BIGINT) + U32.pack(self.__string(str(value))))
+        elif isinstance(value, float):
+            chunks.append(U8.pack(TAG_FLOAT) + F64.pack(value))
+        elif isinstance(value, str):
+            chunks.append(U8.pack(TAG_STRING) + U32.pack(self.__string(value)))
+        elif isinstance(value, (list, tuple)):
+            if value and all(type(item) is float for item in value):
+                chunks.append(
+                    U8.pack(TAG_FLOAT_LIST) + U32.pack(len(value))
+                    + struct.pack(f"<{len(value)}d", *value))
+                return
+            chunks.append(U8.pack(TAG_LIST) + U32.pack(len(value)))
+            for item in value:
+                self.__value(chunks, item)
+        elif isinstance(value, dict):
+            chunks.append(U8.pack(TAG_DICT) + U32.pack(len(value)))
+            for key, item in value.items():
+                chunks.append(U32.pack(self.__string(key)))
+                self.__value(chunks, item)
+        else:
+            raise ValueError(f"Can't store value of type {type(value)}")
+
+    #-------------------------------------------------------------------
+    # READING
+    #-------------------------------------------------------------------
+    def loads(self, data):
+        """Returns the project data stored in the given bytes"""
+        if not self.isBinary(data):
+            raise ValueError("Not a binary project file")
+        self.data = memoryview(data)
+        self.offset = len(MAGIC)
+        try:
+            return self.__load()
+        finally:
+            self.data.release()
+            self.data = None
+            self.stringTable = None
+
+    def __load(self):
+        version = self.__read(U8)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary project version {version}")
+
+        # string table
+        lengths = self.__readArray("I", self.__read(U32))
+        strings = []
+        offset = self.offset
+        for length in lengths:
+            strings.append(str(self.data[offset:offset + length], "utf-8"))
+            offset += length
+        self.offset = offset
+        self.stringTable = strings
+
+        numNodes = self.__read(U32)
+        numSockets = self.__read(U32)
+        numConnections = self.__read(U32)
+        numReferenced = self.__read(U32)
+        ids = self.__readUUIDs(numNodes + numSockets + numConnections + numReferenced)
+        types = self.__readArray("I", numNodes)
+        inCounts = self.__readArray("I", numNodes)
+        outCounts = self.__readArray("I", numNodes)
+        references = self.__readArray("I", numConnections * 4)
+        positions = self.__readColumn(numNodes)
+        values = self.__readColumn(numSockets)
+
+        socketIDs = ids[numNodes:numNodes + numSockets]
+        sockets = [
+            {"id": socketID} if value is ABSENT else {"id": socketID, "value": value}
+            for socketID, value in zip(socketIDs, values)]
+        nodes = []
+        start = 0
+        for i in range(numNodes):
+            middle = start + inCounts[i]
+            end = middle + outCounts[i]
+            nodes.append({
+                "id": ids[i],
+                "type": strings[types[i]],
+                "pos": positions[i],
+                "inSockets": sockets[start:middle],
+                "outSockets": sockets[middle:end]})
+            start = end
+
+        refs = [ids[i] for i in references]
+        connections = [
+            {
+                "id": connectionID,
+                "nodeA_ID": nodeA,
+                "nodeB_ID": nodeB,
+                "socketA_ID": socketA,
+                "socketB_ID": socketB}
+            for connectionID, nodeA, nodeB, socketA, socketB in zip(
+                ids[numNodes + numSockets:numNodes + numSockets + numConnections],
+                refs[0::4], refs[1::4], refs[2::4], refs[3::4])]
+
+        self.__readExtras(nodes)
+        self.__readExtras(connections)
+
+        jsonElements = self.__readValue()
+        jsonElements["Nodes"] = nodes
+        jsonElements["Connections"] = connections
+        return jsonElements
+
+    def __read(self, fmt):
+        value = fmt.unpack_from(self.data, self.offset)[0]
+        self.offset += fmt.size
+        return value
+
+    def __readArray(self, typecode, count):
+        values = array(typecode)
+        end = self.offset + count * values.itemsize
+        values.frombytes(self.data[self.offset:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.offset = end
+        return values
+
+    def __readUUIDs(self, count):
+        end = self.offset + count * 16
+        hexDigits = self.data[self.offset:end].hex().encode("ascii")
+        self.offset = end
+        # place the 32 hex digits of each id into its 36 character string
+        # form, one strided copy per character position
+        text = bytearray(b"-" * (count * 36))
+        target = 0
+        for source in range(32):
+            if target in (8, 13, 18, 23):
+                target += 1
+            text[target::36] = hexDigits[source::32]
+            target += 1
+        text = text.decode("ascii")
+        return [text[i:i + 36] for i in range(0, count * 36, 36)]
+
+    def __readColumn(self, count):
+        """Read a column of count values"""
+        tags = bytes(self.data[self.offset:self.offset + count])
+        self.offset += count
+        strings = self.__readArray("I", self.__read(U32))
+        ints = self.__readArray("q", self.__read(U32))
+        floats = self.__readArray("d", self.__read(U32))
+        sources = {
+            TAG_NONE: repeat(None),
+            TAG_FALSE: repeat(False),
+            TAG_TRUE: repeat(True),
+            TAG_ABSENT: repeat(ABSENT),
+            TAG_STRING: map(self.stringTable.__getitem__, strings),
+            TAG_INT: iter(ints),
+            TAG_FLOAT: iter(floats)}
+        stream = self.__iterStream()
+        for tag in STREAM_TAGS:
+            sources[tag] = stream
+        try:
+            return [next(sources[tag]) for tag in tags]
+        except KeyError as e:
+            raise ValueError(f"Unknown value tag {e}")
+
+    def __iterStream(self):
+        while True:
+            yield self.__readValue()
+
+    def __readExtras(self, elements):
+        for i in range(self.__read(U32)):
+            index = self.__read(U32)
+            elements[index].update(self.__readValue())
+
+    def __readValue(self):
+        """Read a tagged value"""
+        tag = self.data[self.offset]
+        self.offset += 1
+        if tag == TAG_STRING:
+            return self.stringTable[self.__read(U32)]
+        elif tag == TAG_FLOAT:
+            return self.__read(F64)
+        elif tag == TAG_INT:
+            return self.__read(I64)
+        elif tag == TAG_NONE:
+            return None
+        elif tag == TAG_TRUE:
+            return True
+        elif tag == TAG_FALSE:
+            return False
+        elif tag == TAG_FLOAT_LIST:
+            count = self.__read(U32)
+            values = list(struct.unpack_from(f"<{count}d", self.data, self.offset))
+            self.offset += count * 8
+            return values
+        elif tag == TAG_LIST:
+            return [self.__readValue() for i in range(self.__read(U32))]
+        elif tag == TAG_DICT:
+            result = {}
+            for i in range(self.__read(U32)):
+                key = self.stringTable[self.__read(U32)]
+                result[key] = self.__readValue()
+            return result
+        elif tag == TAG_BIGINT:
+            return int(self.stringTable[self.__read(U32)])
+        raise ValueError(f"Unknown value tag {tag}")
@@ -0,0 +1,43 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import sys
+import json
+import argparse
+
+from Panda3DNodeEditor.Tools import BinaryTools
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+
+def convert(sourcePath, targetPath):
+    """Convert the project file at sourcePath to the format selected by
+    the extension of targetPath. Changes stored in the journal of the
+    source file are included in the converted project."""
+    binaryTools = BinaryTools.BinaryTools()
+    jsonElements = JournalTools().loadProject(sourcePath)
+
+    if targetPath.endswith(BinaryTools.EXTENSION):
+        with open(targetPath, 'wb') as outfile:
+            outfile.write(binaryTools.dumps(jsonElements))
+    else:
+        with open(targetPath, 'w') as outfile:
+            json.dump(jsonElements, outfile, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert node editor project files between the JSON and "
+                    f"the binary format. Target files ending in "
+                    f"{BinaryTools.EXTENSION} will be written in the binary "
+                    "format, all others as JSON.")
+    parser.add_argument("source", help="the project file to convert")
+    parser.add_argument("target", help="the file to write the converted project to")
+    args = parser.parse_args(argv)
+    convert(args.source, args.target)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
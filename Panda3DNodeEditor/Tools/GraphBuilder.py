@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+from uuid import UUID
+
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+class GraphBuilder:
+    """Creates the nodes and connections stored in a project file.
+
+    The graph can be anything providing createNode and connectSockets
+    like the NodeManager or the HeadlessGraph. All created nodes and
+    sockets are indexed by the id string they have been stored with, so
+    each connection is wired with two dict lookups. No logic is run while
+    building, the caller should evaluate the graph once it is done."""
+    def __init__(self, graph):
+        self.graph = graph
+        self.jsonTools = JSONTools()
+        # id string -> node
+        self.nodes = {}
+        # id string -> socket
+        self.sockets = {}
+        self.hasUnknownNodes = False
+        # version of the loaded project file
+        self.version = None
+
+    def build(self, fileContent):
+        """Create all nodes and connections of the given file content and
+        return the list of created nodes"""
+        self.checkVersion(fileContent.get("ProjectVersion"))
+        for jsonNode in fileContent["Nodes"]:
+            self.addNode(jsonNode)
+
+        if self.hasUnknownNodes:
+            logging.info("Some nodes could not be loaded. Make sure all node extensions are available.")
+
+        for jsonConnection in fileContent["Connections"]:
+            self.addConnection(jsonConnection)
+
+        return list(self.nodes.values())
+
+    def checkVersion(self, version):
+        """Warn about files written by a newer version of the editor"""
+        self.version = version
+        if not self.jsonTools.isSupportedVersion(version):
+            logging.warning(f"Unsupported project version {version}, loading may fail")
+
+    def addNode(self, jsonNode):
+        """Create and show the node described by the given json node and
+        return it. Returns None if the node type is unknown."""
+        node = self.graph.createNode(jsonNode["type"])
+        if node is None:
+            logging.error(f"Couldn't load node of type: {jsonNode['type']}")
+            self.hasUnknownNodes = True
+            return None
+        node.nodeID = UUID(jsonNode["id"])
+        node.setPos(self.jsonTools.getPos(jsonNode["pos"]))
+        for socket, jsonSocket in zip(node.inputList, jsonNode["inSockets"]):
+            socket.socketID = UUID(jsonSocket["id"])
+            if "value" in jsonSocket:
+                value = jsonSocket["value"]
+                if self.version == "0.1" and value == "None":
+                    # all values have been stored as strings before 0.2
+                    value = None
+                socket.setValue(value)
+            socket.commitValue()
+            self.sockets[jsonSocket["id"]] = socket
+        for socket, jsonSocket in zip(node.outputList, jsonNode["outSockets"]):
+            socket.socketID = UUID(jsonSocket["id"])
+            self.sockets[jsonSocket["id"]] = socket
+        node.show()
+        self.nodes[jsonNode["id"]] = node
+        return node
+
+    def addConnection(self, jsonConnection):
+        """Connect the sockets given in the json connection and return the
+        connector. Returns None if one of the sockets has not been
+        loaded."""
+        socketA = self.sockets.get(jsonConnection["socketA_ID"])
+        socketB = self.sockets.get(jsonConnection["socketB_ID"])
+        if socketA is None or socketB is None:
+            logging.error(
+                "could not connect nodes: {} - {}".format(
+                    self.nodes.get(jsonConnection["nodeA_ID"]),
+                    self.nodes.get(jsonConnection["nodeB_ID"])))
+            return None
+        return self.graph.connectSockets(socketA, socketB)
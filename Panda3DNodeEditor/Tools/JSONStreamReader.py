@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import re
+import json
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# characters a number may continue with up to the end of the buffer
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+class JSONStreamReader:
+    """Reads the top level object of a JSON file piece by piece.
+
+    The file is read in chunks and only one value is decoded at a time,
+    so a caller can process the elements of large arrays like the nodes
+    of a project file while the rest of the file has not been parsed
+    yet."""
+    def __init__(self, infile, chunkSize=65536):
+        self.infile = infile
+        self.chunkSize = chunkSize
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # number of characters read from the file so far
+        self.charsRead = 0
+
+    def __fill(self):
+        """Read the next chunk into the buffer, dropping everything that
+        has already been decoded. Returns False at the end of the file"""
+        if self.eof:
+            return False
+        chunk = self.infile.read(self.chunkSize)
+        if not chunk:
+            self.eof = True
+            return False
+        self.charsRead += len(chunk)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def __skipWhitespace(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.__fill():
+                return
+
+    def __peek(self):
+        """Returns the next non whitespace character or an empty string at
+        the end of the file"""
+        self.__skipWhitespace()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def __next(self, expected):
+        """Consume the next character which must be one of the expected"""
+        char = self.__peek()
+        if char == "" or char not in expected:
+            raise ValueError(
+                f"Expected one of {expected!r} at character "
+                f"{self.charsRead - len(self.buffer) + self.pos}")
+        self.pos += 1
+        return char
+
+    def __decode(self):
+        """Decode the next value"""
+        self.__skipWhitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # the value may be cut off by the end of the buffer
+                if not self.__fill():
+                    raise
+                continue
+            # numbers at the end of the buffer may continue in the next
+            # chunk, even if the decoded part is followed by the start of
+            # a fraction or an exponent like "1." or "1.5e"
+            if isinstance(value, (int, float)) and not isinstance(value, bool) \
+            and NUMBER_TAIL.match(self.buffer, end) and self.__fill():
+                continue
+            self.pos = end
+            return value
+
+    def iterate(self):
+        """Yields (key, value) tuples for all members of the top level
+        object. Members holding an array are yielded element by element
+        as (key, element) tuples."""
+        self.__next("{")
+        if self.__peek() == "}":
+            return
+        while True:
+            key = self.__decode()
+            self.__next(":")
+            if self.__peek() == "[":
+                self.pos += 1
+                if self.__peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self.__decode()
+                        if self.__next(",]") == "]":
+                            break
+            else:
+                yield key, self.__decode()
+            if self.__next(",}") == "}":
+                return
@@ -5,49 +5,142 @@ __license__ = """
 Simplified BSD (BSD 2-Clause) License.
 See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
 """
+import re
+import logging
+
+from panda3d.core import Point3
+
+# Version history of the project file layout
+# 0.1: positions stored as LPoint3f string, socket values as strings
+# 0.2: positions stored as [x, y, z] list, socket values as JSON types
+PROJECT_VERSION = "0.2"
+
+# matches the numbers of positions stored like LPoint3f(1, 0, 2)
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
 class JSONTools:
     def get(self, nodes, connections):
+        return self.fromSnapshot(self.snapshot(nodes, connections))
+
+    def snapshot(self, nodes, connections):
+        """Returns the state of the given nodes and connections as plain
+        tuples. Taking a snapshot has to happen on the main thread, while
+        the snapshot can be turned into the JSON structure on any thread
+        using fromSnapshot."""
+        return (
+            [self.snapshotNode(node) for node in nodes],
+            [self.snapshotConnector(connector) for connector in connections])
+
+    def snapshotNode(self, node):
+        return (
+            node.nodeID,
+            node.__module__,
+            tuple(node.getPos()),
+            self.__snapshotSockets(node.inputList),
+            self.__snapshotSockets(node.outputList))
+
+    def __snapshotSockets(self, socketList):
+        # only store values entered by the user, not by other
+        # sockets as they should be recalculated on load
+        return [
+            (socket.socketID, None if socket.connected else (socket.getValue(),))
+            for socket in socketList]
+
+    def snapshotConnector(self, connector):
+        return (
+            connector.connectorID,
+            connector.socketA.node.nodeID,
+            connector.socketB.node.nodeID,
+            connector.socketA.socketID,
+            connector.socketB.socketID)
+
+    def fromSnapshot(self, snapshot):
+        """Returns the JSON structure of a project from the given snapshot"""
+        nodes, connections = snapshot
         jsonElements = {}
-        jsonElements["ProjectVersion"] = "0.1"
+        jsonElements["ProjectVersion"] = PROJECT_VERSION
         jsonElements["Nodes"] = []
         jsonElements["Connections"] = []
 
-        for node in nodes:
-            jsonElements["Nodes"].append(
-                {
-                    "id":str(node.nodeID),
-                    "type":node.__module__,
-                    "pos":str(node.frame.getPos()),
-                    "inSockets":self.__getSockets(node.inputList),
-                    "outSockets":self.__getSockets(node.outputList)
-                }
-            )
-
-        for connector in connections:
-            jsonElements["Connections"].append(
-                {
-                    "id":str(connector.connectorID),
-                    "nodeA_ID":str(connector.socketA.node.nodeID),
-                    "nodeB_ID":str(connector.socketB.node.nodeID),
-                    "socketA_ID":str(connector.socketA.socketID),
-                    "socketB_ID":str(connector.socketB.socketID),
-                }
-            )
+        for nodeSnapshot in nodes:
+            jsonElements["Nodes"].append(self.nodeFromSnapshot(nodeSnapshot))
+
+        for connectorSnapshot in connections:
+            jsonElements["Connections"].append(self.connectionFromSnapshot(connectorSnapshot))
         return jsonElements
 
+    def nodeFromSnapshot(self, nodeSnapshot):
+        nodeID, nodeType, pos, inSockets, outSockets = nodeSnapshot
+        return {
+            "id":str(nodeID),
+            "type":nodeType,
+            "pos":list(pos),
+            "inSockets":self.__getSockets(inSockets),
+            "outSockets":self.__getSockets(outSockets)
+        }
+
+    def connectionFromSnapshot(self, connectorSnapshot):
+        connectorID, nodeA_ID, nodeB_ID, socketA_ID, socketB_ID = connectorSnapshot
+        return {
+            "id":str(connectorID),
+            "nodeA_ID":str(nodeA_ID),
+            "nodeB_ID":str(nodeB_ID),
+            "socketA_ID":str(socketA_ID),
+            "socketB_ID":str(socketB_ID),
+        }
+
+    def getNode(self, node):
+        """Returns the JSON element of a single node"""
+        return self.nodeFromSnapshot(self.snapshotNode(node))
+
+    def getConnection(self, connector):
+        """Returns the JSON element of a single connection"""
+        return self.connectionFromSnapshot(self.snapshotConnector(connector))
+
     def __getSockets(self, socketList):
         sockets = []
-        for socket in socketList:
-            if not socket.connected:
-                # only store values entered by the user, not by other
-                # sockets as they should be recalculated on load
+        for socketID, value in socketList:
+            if value is not None:
                 sockets.append({
-                    "id":str(socket.socketID),
-                    "value":str(socket.getValue())
+                    "id":str(socketID),
+                    "value":self.getValue(value[0])
                 })
             else:
                 sockets.append({
-                    "id":str(socket.socketID),
+                    "id":str(socketID),
                 })
         return sockets
 
+    def getValue(self, value):
+        """Returns the value as it can be stored in JSON. Values of other
+        types than the basic JSON types are stored as string."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
+
+    def getPos(self, pos):
+        """Returns a Point3 from a stored position. Handles lists as well
+        as the LPoint3f strings of project version 0.1"""
+        if isinstance(pos, str):
+            return self.parsePos(pos)
+        if len(pos) != 3:
+            logging.warning(f"couldn't read node position: {pos}")
+            return Point3(0)
+        return Point3(*pos)
+
+    def isSupportedVersion(self, version):
+        """Returns True if files of the given project version can be read"""
+        try:
+            return tuple(map(int, version.split("."))) \
+                <= tuple(map(int, PROJECT_VERSION.split(".")))
+        except (AttributeError, ValueError):
+            return False
+
+    def parsePos(self, pos):
+        """Returns a Point3 from a position stored as string"""
+        numbers = [float(n) for n in NUMBER_RE.findall(pos.split("(", 1)[-1])]
+        if len(numbers) != 3:
+            logging.warning(f"couldn't read node position: {pos}")
+            return Point3(0)
+        return Point3(*numbers)
+
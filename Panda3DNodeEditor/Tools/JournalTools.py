@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+import logging
+
+from Panda3DNodeEditor.Tools.BinaryTools import BinaryTools
+
+# extension appended to the project file path for its journal
+EXTENSION = ".journal"
+
+class JournalTools:
+    """Reads journals of project files and applies them to the project.
+
+    A journal is a text file next to the project file. Its first line
+    holds the size and modification time of the project file it belongs
+    to, so journals left behind by a full save of the project are
+    ignored. Each following line is a JSON list with the records of one
+    change, as passed to the mutation listeners of the NodeManager."""
+    def getJournalPath(self, path):
+        return path + EXTENSION
+
+    def getBaseHeader(self, path):
+        """Returns the header identifying the current state of the
+        project file at the given path"""
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    def readChangeSets(self, path):
+        """Returns the list of changes stored in the journal of the
+        project file at the given path. Returns None if there is no valid
+        journal for the current state of the project file."""
+        journalPath = self.getJournalPath(path)
+        if not os.path.exists(journalPath):
+            return None
+        changeSets = []
+        with open(journalPath, 'r') as infile:
+            try:
+                header = json.loads(infile.readline())
+            except ValueError:
+                logging.warning(f"Ignoring journal with invalid header {journalPath}")
+                return None
+            if header.get("base") != self.getBaseHeader(path):
+                logging.info(f"Ignoring outdated journal {journalPath}")
+                return None
+            for line in infile:
+                try:
+                    changeSets.append(json.loads(line))
+                except ValueError:
+                    # the editor stopped while writing this change
+                    logging.warning(f"Ignoring incomplete change at the end of {journalPath}")
+                    break
+        return changeSets
+
+    def loadProject(self, path):
+        """Returns the content of the JSON or binary project file at the
+        given path with its journal applied"""
+        with open(path, 'rb') as infile:
+            data = infile.read()
+        binaryTools = BinaryTools()
+        if binaryTools.isBinary(data):
+            fileContent = binaryTools.loads(data)
+        else:
+            fileContent = json.loads(data)
+        changeSets = self.readChangeSets(path)
+        if changeSets:
+            self.replay(fileContent, changeSets)
+        return fileContent
+
+    def replay(self, fileContent, changeSets):
+        """Apply the given changes to the project file content"""
+        nodes = {jsonNode["id"]: jsonNode for jsonNode in fileContent["Nodes"]}
+        connections = {jsonConnection["id"]: jsonConnection for jsonConnection in fileContent["Connections"]}
+        inSockets = {}
+        for jsonNode in nodes.values():
+            for jsonSocket in jsonNode["inSockets"]:
+                inSockets[jsonSocket["id"]] = jsonSocket
+
+        for changeSet in changeSets:
+            for record in changeSet:
+                op = record["op"]
+                if op == "addNode":
+                    jsonNode = record["node"]
+                    nodes[jsonNode["id"]] = jsonNode
+                    for jsonSocket in jsonNode["inSockets"]:
+                        inSockets[jsonSocket["id"]] = jsonSocket
+                elif op == "removeNode":
+                    jsonNode = nodes.pop(record["node"]["id"], None)
+                    if jsonNode is not None:
+                        for jsonSocket in jsonNode["inSockets"]:
+                            inSockets.pop(jsonSocket["id"], None)
+                elif op == "connect":
+                    jsonConnection = record["connection"]
+                    connections[jsonConnection["id"]] = jsonConnection
+                    # values of connected sockets aren't stored
+                    for key in ("socketA_ID", "socketB_ID"):
+                        if jsonConnection[key] in inSockets:
+                            inSockets[jsonConnection[key]].pop("value", None)
+                elif op == "disconnect":
+                    connections.pop(record["connection"]["id"], None)
+                elif op == "move":
+                    if record["id"] in nodes:
+                        nodes[record["id"]]["pos"] = record["to"]
+                elif op == "value":
+                    if record["socket"] in inSockets:
+                        inSockets[record["socket"]]["value"] = record["to"]
+                else:
+                    logging.warning(f"Ignoring unknown journal record {op}")
+
+        fileContent["Nodes"] = list(nodes.values())
+        fileContent["Connections"] = list(connections.values())
+        return fileContent
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+# Times the common editor operations on synthetic graphs of different
+# shapes and sizes without opening a window. Run from the repository root:
+#   python benchmarks/EditorBenchmark.py --nodes 1000 10000 --output results.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from panda3d.core import loadPrcFileData, MouseWatcher, PandaSystem, Filename
+
+from Panda3DNodeEditor.LoadScripts.StreamLoader import StreamLoader
+from Panda3DNodeEditor.NodeCore.NodeManager import NodeManager
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.SaveScripts.SaveJSON import Save
+from benchmarks.GraphGenerator import GraphGenerator, SHAPES
+
+# the order the scenarios are run in, each one works on the graph the
+# previous scenarios left behind
+SCENARIOS = (
+    "create", "connect", "evaluate", "propagate", "redraw",
+    "save", "load", "select", "copy", "delete")
+
+class EditorBenchmark:
+    """Runs all scenarios on the project content of one synthetic graph.
+
+    Every run starts with a new node manager attached to the 2D scene
+    graph, so the nodes are created with all their widgets just like in
+    the editor, and runs through all scenarios in order. The time of each
+    scenario is taken separately and the fastest and median time of all
+    runs are reported."""
+    def __init__(self, project, directory):
+        self.project = project
+        self.directory = directory
+        self.times = {scenario: [] for scenario in SCENARIOS}
+
+    def run(self, repeat):
+        for i in range(repeat):
+            self.runOnce()
+        return {
+            scenario: {
+                "min": min(times),
+                "median": statistics.median(times),
+                "runs": times}
+            for scenario, times in self.times.items()}
+
+    def measure(self, scenario, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self.times[scenario].append(time.perf_counter() - start)
+        return result
+
+    def createNodeManager(self):
+        viewNP = aspect2d.attachNewNode("benchmarkView")
+        viewNP.setScale(0.5)
+        return NodeManager(viewNP)
+
+    def destroyNodeManager(self, nodeMgr):
+        nodeMgr.cleanup()
+        nodeMgr.nodePool.clear()
+        nodeMgr.connectionRenderer.destroy()
+        nodeMgr.nodeViewNP.removeNode()
+
+    def runOnce(self):
+        nodeMgr = self.createNodeManager()
+        builder = GraphBuilder(nodeMgr)
+        self.measure("create", self.createNodes, builder)
+        self.measure("connect", self.connectNodes, builder)
+        self.measure("evaluate", self.evaluate, nodeMgr)
+        self.measure("propagate", self.propagate, nodeMgr)
+        self.measure("redraw", nodeMgr.updateConnections)
+
+        path = os.path.join(self.directory, "benchmark.logic")
+        self.measure("save", Save, nodeMgr.nodeList, nodeMgr.connections, False, path)
+        self.destroyNodeManager(nodeMgr)
+
+        nodeMgr = self.createNodeManager()
+        self.measure("load", self.load, nodeMgr, path)
+
+        nodeMgr.updateNodeBounds()
+        self.measure("select", self.select, nodeMgr)
+        self.measure("copy", self.copy, nodeMgr)
+        self.measure("delete", nodeMgr.removeNode, list(nodeMgr.selectedNodes))
+        self.destroyNodeManager(nodeMgr)
+
+    def createNodes(self, builder):
+        for jsonNode in self.project["Nodes"]:
+            builder.addNode(jsonNode)
+        self.checkNodes(len(builder.nodes))
+
+    def connectNodes(self, builder):
+        for jsonConnection in self.project["Connections"]:
+            builder.addConnection(jsonConnection)
+
+    def evaluate(self, nodeMgr):
+        """Evaluate all nodes and show the results in their widgets"""
+        nodeMgr.evaluator.evaluate(nodeMgr.nodeList)
+        nodeMgr.viewSync.sync()
+
+    def propagate(self, nodeMgr):
+        """Change the value of the first node and update all nodes
+        depending on it"""
+        socket = nodeMgr.nodeList[0].inputList[0]
+        socket.setValue(socket.getValue())
+        nodeMgr.updateSocketNodeLogic(socket)
+        nodeMgr.viewSync.sync()
+
+    def load(self, nodeMgr, path):
+        """Load the project the way the editor does, with a frame budget
+        big enough to load it within a single frame"""
+        StreamLoader(nodeMgr, path, frameBudget=float("inf")).start()
+        while taskMgr.hasTaskNamed("NodeEditor_streamLoad"):
+            taskMgr.step()
+        self.checkNodes(len(nodeMgr.nodeList))
+
+    def checkNodes(self, numNodes):
+        """The graph builder only logs nodes it couldn't create, stop
+        instead of timing an incomplete graph"""
+        if numNodes != len(self.project["Nodes"]):
+            raise RuntimeError(
+                f"only {numNodes} of {len(self.project['Nodes'])} nodes "
+                "could be created, see the log for the reason")
+
+    def select(self, nodeMgr):
+        """Box select the upper half of the graph"""
+        bounds = [nodeMgr.getNodeBounds(node) for node in nodeMgr.nodeList]
+        left = min(b[0] for b in bounds)
+        right = max(b[1] for b in bounds)
+        bottom = min(b[2] for b in bounds)
+        top = max(b[3] for b in bounds)
+        for node in nodeMgr.nodesInRect(left, right, (bottom + top) / 2, top):
+            nodeMgr.selectNode(node, True, True)
+
+    def copy(self, nodeMgr):
+        """Copy the selected nodes and drop them right away"""
+        nodeMgr.copyNodes()
+        if nodeMgr.selectedNodes:
+            taskMgr.remove("dragNodeDropTask")
+            nodeMgr.selectedNodes[0].ignore("mouse1-up")
+
+def startPanda():
+    """Start Panda3D without opening a window"""
+    loadPrcFileData("", "window-type none")
+    loadPrcFileData("", "audio-library-name null")
+    # the icons of the nodes are loaded relative to the editor package,
+    # just like the editor sets it up
+    fn = Filename.fromOsSpecific(os.path.join(ROOT, "Panda3DNodeEditor"))
+    fn.makeTrueCase()
+    loadPrcFileData("", f"model-path {fn}")
+    from direct.showbase.ShowBase import ShowBase
+    base = ShowBase()
+    if base.mouseWatcherNode is None:
+        # nodes query the mouse while being dragged
+        base.mouseWatcherNode = MouseWatcher("benchmark")
+    return base
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the editor operations on synthetic graphs and write the results as JSON")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--connections", type=float, default=1.5,
+        help="connections per node of the random shapes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+        help="file to write the results to instead of stdout")
+    args = parser.parse_args(argv)
+
+    startPanda()
+    generator = GraphGenerator(args.seed)
+    directory = tempfile.mkdtemp(prefix="NEBenchmark")
+    results = []
+    try:
+        for shape in args.shapes:
+            for numNodes in args.nodes:
+                project = generator.generate(shape, numNodes, int(numNodes * args.connections))
+                results.append({
+                    "shape": shape,
+                    "nodes": len(project["Nodes"]),
+                    "connections": len(project["Connections"]),
+                    "scenarios": EditorBenchmark(project, directory).run(args.repeat)})
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "panda3d": PandaSystem.getVersionString(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results}
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as outfile:
+            json.dump(report, outfile, indent=2)
+
+if __name__ == "__main__":
+    main()
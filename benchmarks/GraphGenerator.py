@@ -0,0 +1,201 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import math
+import random
+import operator
+from uuid import UUID
+
+NODE_MODULE = "Panda3DNodeEditor.NodeCore.Nodes."
+
+# built-in nodes with one output and two inputs
+NUMERIC_NODES = ("AddNode", "MultiplyNode", "DivideNode")
+BOOL_NODES = ("BoolAnd", "BoolOr")
+
+SHAPES = ("chain", "fanout", "diamond", "random", "boolean")
+
+def divide(a, b):
+    # like the DivideNode
+    return a / b if b != 0 else float("NaN")
+
+# the logic of the numeric nodes, used to check the generated values
+NUMERIC_LOGIC = {
+    "NumericNode": lambda a: a,
+    "AddNode": operator.add,
+    "MultiplyNode": operator.mul,
+    "DivideNode": divide}
+
+class GraphGenerator:
+    """Creates project file content of synthetic graphs.
+
+    The graphs are built from the nodes shipped with the editor, so they
+    can be loaded by the editor as well as by the headless graph. All
+    graphs are free of cycles and every input socket has at most one
+    connection. Ids, values and connections are drawn from a random
+    generator seeded with the given seed, so the same arguments always
+    result in the same project. The values of the numeric graphs are
+    chosen so all nodes evaluate to finite numbers, which is checked
+    before the project is returned.
+
+    Available shapes are
+    chain: each node takes both inputs from the node before it
+    fanout: all nodes take their inputs from a single source node
+    diamond: nodes split into two and join again, one diamond after another,
+        each diamond results in (top + a) / (top + b) with a and b set in
+        the split nodes, which keeps the values between 1/100 and 100
+    random: numeric nodes connected to random earlier nodes
+    boolean: like random but built from bool nodes"""
+    def __init__(self, seed=0, columns=50, spacing=(4.0, 3.0)):
+        self.seed = seed
+        self.columns = columns
+        self.spacing = spacing
+        self.rng = random.Random(seed)
+        self.nodes = []
+        self.connections = []
+
+    def generate(self, shape, numNodes, numConnections=None):
+        """Returns the project file content of a graph of the given shape
+        with numNodes nodes. The number of connections can only be chosen
+        for the random shapes and defaults to 1.5 connections per node."""
+        if shape not in SHAPES:
+            raise ValueError(f"unknown graph shape {shape}, use one of {', '.join(SHAPES)}")
+        self.rng = random.Random(self.seed)
+        self.nodes = []
+        self.connections = []
+        numNodes = max(2, numNodes)
+        if shape == "chain":
+            self.chain(numNodes)
+        elif shape == "fanout":
+            self.fanOut(numNodes)
+        elif shape == "diamond":
+            self.diamonds(numNodes)
+        else:
+            if numConnections is None:
+                numConnections = int(numNodes * 1.5)
+            if shape == "random":
+                self.randomDAG(numNodes, numConnections, "NumericNode", NUMERIC_NODES)
+            else:
+                self.randomDAG(numNodes, numConnections, "BoolNode", BOOL_NODES)
+        if shape != "boolean":
+            self.checkValues()
+        return {
+            "ProjectVersion": "0.2",
+            "Nodes": self.nodes,
+            "Connections": self.connections}
+
+    def chain(self, numNodes):
+        # add, multiply and divide in turn keeps the values finite
+        previous = self.addSource("NumericNode")
+        for i in range(numNodes - 1):
+            node = self.addNode(NUMERIC_NODES[i % len(NUMERIC_NODES)])
+            self.connect(previous, node, 0)
+            self.connect(previous, node, 1)
+            previous = node
+
+    def fanOut(self, numNodes):
+        source = self.addSource("NumericNode")
+        for i in range(numNodes - 1):
+            node = self.addNode(NUMERIC_NODES[i % len(NUMERIC_NODES)])
+            self.connect(source, node, 0)
+            self.connect(source, node, 1)
+
+    def diamonds(self, numNodes):
+        top = self.addSource("NumericNode")
+        remaining = numNodes - 1
+        while remaining >= 3:
+            # the second input of both split nodes keeps its value
+            left = self.addNode("AddNode")
+            right = self.addNode("AddNode")
+            bottom = self.addNode("DivideNode")
+            self.connect(top, left, 0)
+            self.connect(top, right, 0)
+            self.connect(left, bottom, 0)
+            self.connect(right, bottom, 1)
+            top = bottom
+            remaining -= 3
+        for i in range(remaining):
+            node = self.addNode("AddNode")
+            self.connect(top, node, 0)
+
+    def randomDAG(self, numNodes, numConnections, sourceType, nodeTypes):
+        """Connect randomly chosen inputs to the outputs of randomly
+        chosen nodes created before the input's node"""
+        numSources = max(1, numNodes // 10)
+        for i in range(numSources):
+            self.addSource(sourceType)
+        for i in range(numNodes - numSources):
+            self.addNode(self.rng.choice(nodeTypes))
+
+        inputs = [
+            (index, socketIndex)
+            for index in range(numSources, numNodes)
+            for socketIndex in range(2)]
+        self.rng.shuffle(inputs)
+        for index, socketIndex in inputs[:numConnections]:
+            self.connect(self.nodes[self.rng.randrange(index)], self.nodes[index], socketIndex)
+
+    def evaluate(self):
+        """Returns the output value of each numeric node by its id,
+        computed like the nodes of the editor would"""
+        sources = {
+            connection["socketB_ID"]: connection["socketA_ID"]
+            for connection in self.connections}
+        outputs = {}
+        values = {}
+        # nodes only get connected to nodes created before them
+        for node in self.nodes:
+            inputs = [
+                outputs[sources[socket["id"]]] if socket["id"] in sources else socket["value"]
+                for socket in node["inSockets"]]
+            value = NUMERIC_LOGIC[node["type"][len(NODE_MODULE):]](*inputs)
+            outputs[node["outSockets"][0]["id"]] = value
+            values[node["id"]] = value
+        return values
+
+    def checkValues(self):
+        """Make sure the graph evaluates to finite numbers only, so the
+        benchmarks measure real arithmetic instead of NaN handling"""
+        for nodeID, value in self.evaluate().items():
+            if not math.isfinite(value):
+                raise RuntimeError(
+                    f"generated graph evaluates to {value} in node {nodeID}, "
+                    "try another seed")
+
+    def addSource(self, typeName):
+        """Add a node with a single input holding a value"""
+        return self.addNode(typeName, 1)
+
+    def addNode(self, typeName, numInputs=2):
+        index = len(self.nodes)
+        x = (index % self.columns) * self.spacing[0]
+        z = -(index // self.columns) * self.spacing[1]
+        if typeName in BOOL_NODES or typeName == "BoolNode":
+            values = [self.rng.random() < 0.5 for i in range(numInputs)]
+        else:
+            values = [self.rng.randint(1, 100) for i in range(numInputs)]
+        node = {
+            "id": self.newID(),
+            "type": NODE_MODULE + typeName,
+            "pos": [x, 0.0, z],
+            "inSockets": [{"id": self.newID(), "value": value} for value in values],
+            "outSockets": [{"id": self.newID()}]}
+        self.nodes.append(node)
+        return node
+
+    def connect(self, nodeA, nodeB, inIndex):
+        """Connect the output of nodeA with the input of nodeB at the
+        given index"""
+        self.connections.append({
+            "id": self.newID(),
+            "nodeA_ID": nodeA["id"],
+            "nodeB_ID": nodeB["id"],
+            "socketA_ID": nodeA["outSockets"][0]["id"],
+            "socketB_ID": nodeB["inSockets"][inIndex]["id"]})
+
+    def newID(self):
+        return str(UUID(int=self.rng.getrandbits(128), version=4))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+# Measures the memory used by nodes, sockets and connections of a graph
+# without any GUI. The same is measured with copies of the socket and
+# connector classes which don't use __slots__, as the baseline the
+# slotted classes are compared to. Both keep creating their ids lazily.
+# Run from the repository root:
+#   python benchmarks/MemoryBenchmark.py --nodes 10000
+
+import os
+import sys
+import gc
+import json
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Panda3DNodeEditor.Headless import HeadlessGraph as headlessGraphModule
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.NodeCore.NodeConnector import NodeConnector
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode as addNodeModule
+from Panda3DNodeEditor.NodeCore.Nodes import NodeBase as nodeBaseModule
+from Panda3DNodeEditor.NodeCore.Nodes.AddNode import Node as AddNode
+from Panda3DNodeEditor.NodeCore.Sockets.InSocket import InSocket
+from Panda3DNodeEditor.NodeCore.Sockets.NumericSocket import NumericSocket
+from Panda3DNodeEditor.NodeCore.Sockets.OutSocket import OutSocket
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import SocketBase
+
+def measure(function):
+    """Returns the result of function and the number of bytes still
+    allocated by it when it returned"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+def createNodes(graph, count):
+    return [graph.createNode(AddNode) for i in range(count)]
+
+def createSockets(node, socketType, count):
+    for i in range(count):
+        node.addIn("In", socketType)
+    return node
+
+def connectNodes(graph, nodes):
+    return [
+        graph.connectSockets(a.outputList[0], b.inputList[0])
+        for a, b in zip(nodes, nodes[1:])]
+
+def withoutSlots(cls, bases):
+    """Returns a copy of the given class which stores its attributes in
+    an instance dict instead of __slots__"""
+    slots = getattr(cls, "__slots__", ())
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")}
+    return type(cls.__name__, bases, namespace)
+
+class Unslotted:
+    """Makes the nodes and graphs created within this context use
+    copies of the socket and connector classes without __slots__"""
+    def __init__(self):
+        socketBase = withoutSlots(SocketBase, (object,))
+        self.inSocket = withoutSlots(InSocket, (socketBase,))
+        self.numericSocket = withoutSlots(NumericSocket, (socketBase,))
+        # (module, name, class used within this context)
+        self.replacements = [
+            (nodeBaseModule, "OutSocket", withoutSlots(OutSocket, (socketBase,))),
+            (addNodeModule, "InSocket", self.inSocket),
+            (headlessGraphModule, "NodeConnector", withoutSlots(NodeConnector, (object,)))]
+        self.originals = []
+
+    def __enter__(self):
+        self.originals = [
+            (module, name, getattr(module, name))
+            for module, name, cls in self.replacements]
+        for module, name, cls in self.replacements:
+            setattr(module, name, cls)
+        return self
+
+    def __exit__(self, *excInfo):
+        for module, name, cls in self.originals:
+            setattr(module, name, cls)
+
+def measureGraph(count, inSocketType, numericSocketType):
+    graph = HeadlessGraph()
+    # create one node of each kind up front so imports and caches are
+    # not counted
+    createNodes(graph, 1)
+    nodes, nodeBytes = measure(lambda: createNodes(graph, count))
+
+    holder = AddNode(None)
+    createSockets(holder, inSocketType, 1)
+    createSockets(holder, numericSocketType, 1)
+    __, inSocketBytes = measure(lambda: createSockets(holder, inSocketType, count))
+    __, numericSocketBytes = measure(lambda: createSockets(holder, numericSocketType, count))
+
+    connectNodes(graph, nodes[:2])
+    __, connectionBytes = measure(lambda: connectNodes(graph, nodes[1:]))
+    numConnections = max(1, count - 2)
+
+    return {
+        "bytesPerNode": nodeBytes / count,
+        "socketsPerNode": len(nodes[0].inputList) + len(nodes[0].outputList),
+        "bytesPerInSocket": inSocketBytes / count,
+        "bytesPerNumericSocket": numericSocketBytes / count,
+        "bytesPerConnection": connectionBytes / numConnections,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure the memory used per node, socket and connection")
+    parser.add_argument("--nodes", type=int, default=10000)
+    args = parser.parse_args(argv)
+    count = args.nodes
+
+    results = {"nodes": count}
+    results["slotted"] = measureGraph(count, InSocket, NumericSocket)
+    with Unslotted() as unslotted:
+        results["unslotted"] = measureGraph(
+            count, unslotted.inSocket, unslotted.numericSocket)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
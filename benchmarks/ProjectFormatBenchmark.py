@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+# Compares size and speed of the JSON and the binary project format.
+# Run from the repository root:
+#   python benchmarks/ProjectFormatBenchmark.py --nodes 10000
+
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Panda3DNodeEditor.Tools.BinaryTools import BinaryTools
+
+def createProject(numNodes, numConnections, seed=0):
+    """Returns project data shaped like the output of JSONTools"""
+    rng = random.Random(seed)
+    nodes = []
+    outSockets = []
+    inSockets = []
+    for i in range(numNodes):
+        node = {
+            "id": str(uuid4()),
+            "type": "Panda3DNodeEditor.NodeCore.Nodes.AddNode",
+            "pos": [rng.uniform(-50, 50), 0.0, rng.uniform(-50, 50)],
+            "inSockets": [
+                {"id": str(uuid4()), "value": rng.randint(0, 100)},
+                {"id": str(uuid4()), "value": None}],
+            "outSockets": [{"id": str(uuid4())}]}
+        nodes.append(node)
+        outSockets += [(node, socket) for socket in node["outSockets"]]
+        inSockets += [(node, socket) for socket in node["inSockets"]]
+
+    connections = []
+    for i in range(numConnections):
+        nodeA, socketA = rng.choice(outSockets)
+        nodeB, socketB = rng.choice(inSockets)
+        connections.append({
+            "id": str(uuid4()),
+            "nodeA_ID": nodeA["id"],
+            "nodeB_ID": nodeB["id"],
+            "socketA_ID": socketA["id"],
+            "socketB_ID": socketB["id"]})
+    return {"ProjectVersion": "0.2", "Nodes": nodes, "Connections": connections}
+
+def measure(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare size and speed of the JSON and the binary project format")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=None,
+        help="defaults to twice the number of nodes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    numConnections = args.connections
+    if numConnections is None:
+        numConnections = args.nodes * 2
+    project = createProject(args.nodes, numConnections)
+    binaryTools = BinaryTools()
+
+    jsonData = json.dumps(project, indent=2)
+    binaryData = binaryTools.dumps(project)
+    if binaryTools.loads(binaryData) != project:
+        raise RuntimeError("binary roundtrip changed the project data")
+
+    results = {
+        "nodes": args.nodes,
+        "connections": numConnections,
+        "json": {
+            "bytes": len(jsonData.encode("utf-8")),
+            "write": measure(lambda: json.dumps(project, indent=2), args.repeat),
+            "read": measure(lambda: json.loads(jsonData), args.repeat)},
+        "binary": {
+            "bytes": len(binaryData),
+            "write": measure(lambda: binaryTools.dumps(project), args.repeat),
+            "read": measure(lambda: binaryTools.loads(binaryData), args.repeat)},
+    }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -12,8 +12,14 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/fireclawthefox/NodeEditor",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
+    entry_points={
+        "console_scripts": [
+            "node-editor-evaluate=Panda3DNodeEditor.Headless.BatchEvaluate:main",
+            "node-editor-convert=Panda3DNodeEditor.Tools.ConvertProject:main",
+        ],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: BSD License",
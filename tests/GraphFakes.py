@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.NodeCore.ConnectionIndex import ConnectionIndex
+from Panda3DNodeEditor.NodeCore.NodeEvaluator import NodeEvaluator
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import INSOCKET, OUTSOCKET
+
+class FakeSocket:
+    """Socket without any widgets"""
+    def __init__(self, node, socketType, value=None):
+        self.node = node
+        self.type = socketType
+        self.value = value
+
+    def getValue(self):
+        return self.value
+
+    def receiveValue(self, value):
+        self.value = value
+
+class FakeNode:
+    """Node summing up its inputs and writing the name of each evaluated
+    node to the given log"""
+    def __init__(self, name, log, numInputs=1, value=0):
+        self.name = name
+        self.log = log
+        self.inputList = [FakeSocket(self, INSOCKET, value) for i in range(numInputs)]
+        self.outputList = [FakeSocket(self, OUTSOCKET)]
+
+    def logic(self):
+        self.log.append(self.name)
+        self.outputList[0].value = sum(socket.value or 0 for socket in self.inputList)
+
+    def __repr__(self):
+        return f"FakeNode({self.name})"
+
+class FakeConnector:
+    def __init__(self, socketA, socketB):
+        self.socketA = socketA
+        self.socketB = socketB
+        self.state = None
+
+    def setError(self, hasError):
+        self.state = "error" if hasError else None
+
+    def setChecked(self):
+        self.state = "checked"
+
+class FakeNodeManager:
+    """The parts of the NodeManager used by the evaluator"""
+    def __init__(self):
+        self.nodeList = []
+        self.connections = []
+        self.connectionIndex = ConnectionIndex()
+        self.evaluator = NodeEvaluator(self)
+        # names of the nodes in the order their logic ran
+        self.log = []
+
+    def addNode(self, name, numInputs=1, value=0):
+        node = FakeNode(name, self.log, numInputs, value)
+        self.nodeList.append(node)
+        self.evaluator.invalidate()
+        return node
+
+    def connect(self, nodeA, nodeB, inIndex=0):
+        """Connect the output of nodeA to the input of nodeB"""
+        connector = FakeConnector(nodeA.outputList[0], nodeB.inputList[inIndex])
+        self.connections.append(connector)
+        self.connectionIndex.add(connector)
+        self.evaluator.invalidate()
+        return connector
+
+    def removeNode(self, node):
+        """Remove the node and its connectors like the NodeManager does"""
+        for connector in self.connectionIndex.getNodeConnectors(node):
+            self.connectionIndex.remove(connector)
+            self.connections.remove(connector)
+        self.connectionIndex.removeNode(node)
+        self.nodeList.remove(node)
+        self.evaluator.invalidate()
+        self.evaluator.discard([node])
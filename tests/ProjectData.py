@@ -0,0 +1,36 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+def createGraph(numbers):
+    """Returns a headless graph adding up the given numbers one after
+    another and the add node holding the sum"""
+    graph = HeadlessGraph()
+    total = None
+    for i, number in enumerate(numbers):
+        num = graph.createNode(NumericNode.Node)
+        num.setPos(i * 2, 0, 1.5)
+        num.inputList[0].setValue(number)
+        if total is None:
+            total = num
+            continue
+        add = graph.createNode(AddNode.Node)
+        add.setPos(i * 2 + 1, 0, -0.25)
+        graph.connectSockets(total.outputList[0], add.inputList[0])
+        graph.connectSockets(num.outputList[0], add.inputList[1])
+        total = add
+    return graph, total
+
+def createProject(numbers):
+    """Returns the project file content of a graph adding up the given
+    numbers"""
+    graph, total = createGraph(numbers)
+    return JSONTools().get(graph.nodeList, graph.connections)
@@ -0,0 +1,46 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+# make the editor package importable when running pytest from anywhere
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from panda3d.core import loadPrcFileData, MouseWatcher, Filename
+
+@pytest.fixture(scope="session")
+def showBase():
+    """A ShowBase without a window for tests that need real nodes"""
+    loadPrcFileData("", "window-type none")
+    loadPrcFileData("", "audio-library-name null")
+    # the node icons are loaded relative to the editor package
+    fn = Filename.fromOsSpecific(os.path.join(ROOT, "Panda3DNodeEditor"))
+    fn.makeTrueCase()
+    loadPrcFileData("", f"model-path {fn}")
+    from direct.showbase.ShowBase import ShowBase
+    base = ShowBase()
+    if base.mouseWatcherNode is None:
+        # nodes query the mouse while being dragged
+        base.mouseWatcherNode = MouseWatcher("tests")
+    yield base
+    base.destroy()
+
+@pytest.fixture
+def nodeManager(showBase):
+    """A node manager drawing into its own node below aspect2d"""
+    from Panda3DNodeEditor.NodeCore.NodeManager import NodeManager
+    viewNP = showBase.aspect2d.attachNewNode("testView")
+    nodeMgr = NodeManager(viewNP)
+    yield nodeMgr
+    nodeMgr.cleanup()
+    nodeMgr.connectionRenderer.destroy()
+    viewNP.removeNode()
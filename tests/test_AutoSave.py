@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+import json
+
+import pytest
+
+from Panda3DNodeEditor.SaveScripts.AutoSave import AutoSave
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+from ProjectData import createProject
+
+@pytest.fixture
+def autoSave(showBase, nodeManager, tmp_path):
+    GraphBuilder(nodeManager).build(createProject(range(10)))
+    autoSave = AutoSave(nodeManager, directory=str(tmp_path), frameBudget=1)
+    autoSave.start()
+    yield autoSave
+    autoSave.stop()
+
+def runSnapshot(showBase, autoSave):
+    """Take a snapshot right away and wait for it to be written"""
+    autoSave.startSnapshot()
+    while showBase.taskMgr.hasTaskNamed("NodeEditor_autoSaveSnapshot"):
+        showBase.taskMgr.step()
+    if autoSave.writer is not None:
+        autoSave.writer.join()
+
+def getBackups(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".logic"))
+
+def test_save_changes(showBase, nodeManager, autoSave, tmp_path):
+    showBase.messenger.send("NodeEditor_set_dirty")
+    runSnapshot(showBase, autoSave)
+
+    backups = getBackups(tmp_path)
+    assert len(backups) == 1
+    with open(tmp_path / backups[0]) as infile:
+        assert json.load(infile) == JSONTools().get(
+            nodeManager.nodeList, nodeManager.connections)
+    assert autoSave.savedChangeCount == autoSave.changeCount
+    # no temporary files are left behind
+    assert os.listdir(tmp_path) == backups
+
+def test_nothing_saved_without_changes(showBase, autoSave, tmp_path):
+    showBase.messenger.send("NodeEditor_set_dirty")
+    showBase.messenger.send("NodeEditor_set_clean")
+    runSnapshot(showBase, autoSave)
+
+    assert getBackups(tmp_path) == []
+    assert showBase.taskMgr.hasTaskNamed("NodeEditor_autoSave")
+
+def test_changes_while_taking_the_snapshot(showBase, autoSave, tmp_path):
+    showBase.messenger.send("NodeEditor_set_dirty")
+    autoSave.startSnapshot()
+    showBase.messenger.send("NodeEditor_set_dirty")
+    showBase.taskMgr.step()
+
+    # the snapshot has been thrown away and is retried later on
+    assert autoSave.snapshotState is None
+    assert autoSave.writer is None
+    assert showBase.taskMgr.hasTaskNamed("NodeEditor_autoSave")
+    assert getBackups(tmp_path) == []
+
+def test_removing_nodes_is_a_change(showBase, nodeManager, autoSave):
+    showBase.messenger.send("NodeEditor_set_clean")
+    nodeManager.removeNode([nodeManager.nodeList[0]])
+
+    assert autoSave.changeCount != autoSave.savedChangeCount
+
+def test_old_backups_are_removed(autoSave, tmp_path):
+    for i in range(5):
+        (tmp_path / f"NEAutoSave-20260101-00000{i}.logic").write_text("{}")
+    (tmp_path / "other.logic").write_text("{}")
+    autoSave.removeOldBackups()
+
+    assert getBackups(tmp_path) == [
+        "NEAutoSave-20260101-000002.logic",
+        "NEAutoSave-20260101-000003.logic",
+        "NEAutoSave-20260101-000004.logic",
+        "other.logic"]
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.Headless import BatchEvaluate
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+def writeProject(path, value):
+    """Write a project adding the given value to itself"""
+    graph = HeadlessGraph()
+    num = graph.createNode(NumericNode.Node)
+    add = graph.createNode(AddNode.Node)
+    num.inputList[0].setValue(value)
+    graph.connectSockets(num.outputList[0], add.inputList[0])
+    graph.connectSockets(num.outputList[0], add.inputList[1])
+    with open(path, "w") as outfile:
+        json.dump(JSONTools().get(graph.nodeList, graph.connections), outfile)
+
+def readResults(path):
+    with open(path) as infile:
+        return [json.loads(line) for line in infile]
+
+def test_collect_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("b.logic", "a.logic", "other.txt", "sub/c.logic"):
+        (tmp_path / name).write_text("")
+
+    assert BatchEvaluate.collectFiles([str(tmp_path)]) == [
+        str(tmp_path / "a.logic"), str(tmp_path / "b.logic")]
+    assert BatchEvaluate.collectFiles([str(tmp_path)], recursive=True) == [
+        str(tmp_path / "a.logic"), str(tmp_path / "b.logic"),
+        str(tmp_path / "sub" / "c.logic")]
+    assert BatchEvaluate.collectFiles(["single.logic"]) == ["single.logic"]
+
+def test_evaluate_files(tmp_path):
+    for i in range(3):
+        writeProject(tmp_path / f"{i}.logic", i + 1)
+    output = tmp_path / "results.jsonl"
+
+    assert BatchEvaluate.main([str(tmp_path), "-j", "1", "-o", str(output)]) == 0
+    results = readResults(output)
+    assert [result["file"] for result in results] == [
+        str(tmp_path / f"{i}.logic") for i in range(3)]
+    assert [result["nodes"][1]["outputs"] for result in results] == [[2], [4], [6]]
+
+def test_failed_files_are_reported(tmp_path):
+    writeProject(tmp_path / "good.logic", 1)
+    (tmp_path / "broken.logic").write_text("{")
+    output = tmp_path / "results.jsonl"
+
+    assert BatchEvaluate.main([str(tmp_path), "-j", "2", "-o", str(output)]) == 1
+    broken, good = readResults(output)
+    assert not broken["ok"] and "error" in broken
+    assert good["ok"]
+
+def test_collect_binary_files(tmp_path):
+    for name in ("b.logic", "a.blogic"):
+        (tmp_path / name).write_text("")
+
+    assert BatchEvaluate.collectFiles([str(tmp_path)]) == [
+        str(tmp_path / "a.blogic"), str(tmp_path / "b.logic")]
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+
+import pytest
+
+from Panda3DNodeEditor.Tools import ConvertProject
+from Panda3DNodeEditor.Tools.BinaryTools import BinaryTools
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.LoadScripts.StreamLoader import StreamLoader
+
+from ProjectData import createProject
+
+NODE_A = "0f3a5e4c-1b2d-4e6f-8a9b-0c1d2e3f4a5b"
+NODE_B = "1e2d3c4b-5a69-4788-97a6-b5c4d3e2f1a0"
+SOCKET_A_IN = "2a2a2a2a-0000-4000-8000-000000000001"
+SOCKET_A_OUT = "2a2a2a2a-0000-4000-8000-000000000002"
+SOCKET_B_IN = "2a2a2a2a-0000-4000-8000-000000000003"
+SOCKET_B_OUT = "2a2a2a2a-0000-4000-8000-000000000004"
+CONNECTION = "3b3b3b3b-0000-4000-8000-000000000001"
+# a node that is not part of the project
+FOREIGN = "4c4c4c4c-0000-4000-8000-000000000001"
+
+def roundTrip(project):
+    tools = BinaryTools()
+    data = tools.dumps(project)
+    assert tools.isBinary(data)
+    return tools.loads(data)
+
+@pytest.mark.parametrize("numbers", (range(100), [0.25 * i for i in range(100)]))
+def test_saved_projects(numbers):
+    project = createProject(numbers)
+    assert roundTrip(project) == project
+
+def test_all_value_types():
+    values = [
+        None, True, False, 0, -1, 2**63 - 1, -2**63, 2**64, -2**70,
+        0.5, -1e300, "", "text", "ünïcödé ✓",
+        [], [1, 2.5, "three"], [1.0, 2.0], {"a": [None, {"b": False}]}]
+    project = {
+        "ProjectVersion": "0.2",
+        "Nodes": [{
+            "id": NODE_A,
+            "type": "Panda3DNodeEditor.NodeCore.Nodes.TestNode",
+            "pos": [1.5, 0.0, -2.25],
+            "inSockets": [
+                {"id": f"5d5d5d5d-0000-4000-8000-{i:012x}", "value": value}
+                for i, value in enumerate(values)],
+            "outSockets": []}],
+        "Connections": []}
+    result = roundTrip(project)
+    assert result == project
+    # True and 1 compare equal, so check the types as well
+    resultValues = [socket["value"] for socket in result["Nodes"][0]["inSockets"]]
+    assert [type(value) for value in resultValues] == [type(value) for value in values]
+
+def test_absent_values_and_extras():
+    project = {
+        "ProjectVersion": "0.2",
+        "Custom": {"author": "someone"},
+        "Nodes": [
+            {
+                "id": NODE_A,
+                "type": "A",
+                "pos": [0, 0, 0],
+                "inSockets": [{"id": SOCKET_A_IN}],
+                "outSockets": [{"id": SOCKET_A_OUT}],
+                "name": "renamed"},
+            {
+                "id": NODE_B,
+                "type": "B",
+                "pos": [1.0, 0.0, 1.0],
+                "inSockets": [{"id": SOCKET_B_IN, "value": None}],
+                "outSockets": [{"id": SOCKET_B_OUT}]}],
+        "Connections": [
+            {
+                "id": CONNECTION,
+                "nodeA_ID": NODE_A,
+                "nodeB_ID": NODE_B,
+                "socketA_ID": SOCKET_A_OUT,
+                "socketB_ID": SOCKET_B_IN,
+                "color": [1, 0, 0]},
+            {
+                "id": "3b3b3b3b-0000-4000-8000-000000000002",
+                "nodeA_ID": FOREIGN,
+                "nodeB_ID": NODE_B,
+                "socketA_ID": FOREIGN,
+                "socketB_ID": SOCKET_B_IN}]}
+    result = roundTrip(project)
+    assert result == project
+    # a missing value must not come back as None
+    assert "value" not in result["Nodes"][0]["inSockets"][0]
+
+def test_empty_project():
+    project = {"ProjectVersion": "0.2", "Nodes": [], "Connections": []}
+    assert roundTrip(project) == project
+
+def test_rejects_non_canonical_ids():
+    project = createProject(range(3))
+    project["Nodes"][0]["id"] = project["Nodes"][0]["id"].upper()
+    with pytest.raises(ValueError):
+        BinaryTools().dumps(project)
+
+def test_rejects_unknown_socket_members():
+    project = createProject(range(3))
+    project["Nodes"][0]["inSockets"][0]["label"] = "x"
+    with pytest.raises(ValueError):
+        BinaryTools().dumps(project)
+
+def test_rejects_other_data():
+    tools = BinaryTools()
+    assert not tools.isBinary(b'{"Nodes": []}')
+    with pytest.raises(ValueError):
+        tools.loads(b'{"Nodes": []}')
+
+def test_convert(tmp_path):
+    project = createProject(range(10))
+    jsonPath = tmp_path / "project.logic"
+    jsonPath.write_text(json.dumps(project))
+    binaryPath = tmp_path / "project.blogic"
+    backPath = tmp_path / "back.logic"
+
+    assert ConvertProject.main([str(jsonPath), str(binaryPath)]) == 0
+    assert BinaryTools().isBinary(binaryPath.read_bytes())
+    ConvertProject.convert(str(binaryPath), str(backPath))
+    assert json.loads(backPath.read_text()) == project
+
+def test_load_binary_files(showBase, nodeManager, tmp_path):
+    path = tmp_path / "project.blogic"
+    path.write_bytes(BinaryTools().dumps(createProject(range(1, 11))))
+
+    graph = HeadlessGraph()
+    graph.load(str(path))
+    graph.evaluate()
+    assert graph.nodeList[-1].outputList[0].value == 55
+
+    loader = StreamLoader(nodeManager, str(path))
+    loader.start()
+    while showBase.taskMgr.hasTaskNamed("NodeEditor_streamLoad"):
+        showBase.taskMgr.step()
+    assert nodeManager.nodeList[-1].outputList[0].value == 55
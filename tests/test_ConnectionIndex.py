@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from GraphFakes import FakeConnector, FakeNodeManager
+
+def test_add_indexes_by_socket_and_node():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    connector = mgr.connect(a, b)
+    index = mgr.connectionIndex
+
+    assert index.getOutgoing(a) == [connector]
+    assert index.getIncoming(b) == [connector]
+    assert index.getIncoming(a) == []
+    assert index.getOutgoing(b) == []
+    assert index.getSocketConnectors(a.outputList[0]) == [connector]
+    assert index.getSocketConnectors(b.inputList[0]) == [connector]
+    assert index.isConnected(b.inputList[0])
+    assert index.getNodeConnectors(a) == [connector]
+
+def test_direction_doesnt_depend_on_socket_order():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    # connectors dragged from an input to an output start at the input
+    connector = FakeConnector(b.inputList[0], a.outputList[0])
+    mgr.connectionIndex.add(connector)
+
+    assert mgr.connectionIndex.getDirectedSockets(connector) == (a.outputList[0], b.inputList[0])
+    assert mgr.connectionIndex.getOutgoing(a) == [connector]
+    assert mgr.connectionIndex.getIncoming(b) == [connector]
+
+def test_find_connector():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b", numInputs=2)
+    first = mgr.connect(a, b, 0)
+    second = mgr.connect(a, b, 1)
+    index = mgr.connectionIndex
+
+    assert index.findConnector(a.outputList[0], b.inputList[1]) is second
+    assert index.findConnector(b.inputList[0], a.outputList[0]) is first
+    assert index.findConnector(b.inputList[0], b.inputList[1]) is None
+
+def test_remove_drops_empty_entries():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    c = mgr.addNode("c")
+    ab = mgr.connect(a, b)
+    ac = mgr.connect(a, c)
+    index = mgr.connectionIndex
+
+    index.remove(ab)
+    assert index.getOutgoing(a) == [ac]
+    assert b not in index.incoming
+    assert not index.isConnected(b.inputList[0])
+    assert index.isConnected(a.outputList[0])
+
+    index.remove(ac)
+    assert index.outgoing == {}
+    assert index.incoming == {}
+    assert index.socketConnectors == {}
+
+def test_remove_node():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    c = mgr.addNode("c")
+    mgr.connect(a, b)
+    bc = mgr.connect(b, c)
+    mgr.removeNode(a)
+    index = mgr.connectionIndex
+
+    assert a not in index.outgoing
+    assert index.getIncoming(b) == []
+    assert not index.isConnected(a.outputList[0])
+    assert not index.isConnected(b.inputList[0])
+    # connections of the other nodes are untouched
+    assert index.getOutgoing(b) == [bc]
+    assert index.getIncoming(c) == [bc]
+
+def test_clear():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    mgr.connect(a, b)
+    mgr.connectionIndex.clear()
+
+    assert mgr.connectionIndex.getNodeConnectors(a) == []
+    assert not mgr.connectionIndex.isConnected(b.inputList[0])
@@ -0,0 +1,121 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import pytest
+
+from panda3d.core import NodePath, GeomVertexReader
+
+from Panda3DNodeEditor.NodeCore.ConnectionRenderer import (
+    ConnectionRenderer, DEFAULT_COLOR, HIDDEN_COLOR)
+
+@pytest.fixture
+def renderer():
+    renderer = ConnectionRenderer(NodePath("root"), chunkSize=4)
+    yield renderer
+    renderer.destroy()
+
+def readLines(renderer):
+    """Returns key -> (start, end, color) as stored in the vertex data"""
+    lines = {}
+    for chunk in renderer.chunks:
+        geom = chunk.geomNode.getGeom(0)
+        vdata = geom.getVertexData()
+        assert vdata.getNumRows() == len(chunk.keys) * 2
+        assert geom.getPrimitive(0).getNumVertices() == len(chunk.keys) * 2
+        vertex = GeomVertexReader(vdata, "vertex")
+        color = GeomVertexReader(vdata, "color")
+        for key in chunk.keys:
+            start = tuple(vertex.getData3())
+            end = tuple(vertex.getData3())
+            startColor = tuple(color.getData4())
+            assert tuple(color.getData4()) == pytest.approx(startColor)
+            lines[key] = (start, end, startColor)
+    return lines
+
+def line(start, end, color=DEFAULT_COLOR):
+    return (start, end, pytest.approx(color))
+
+def test_add(renderer):
+    renderer.add("a", (0, 0, 0), (1, 0, 1))
+    renderer.add("b", (2, 0, 2), (3, 0, 3), (1, 0, 0, 1))
+
+    assert renderer.has("a")
+    assert readLines(renderer) == {
+        "a": line((0, 0, 0), (1, 0, 1)),
+        "b": line((2, 0, 2), (3, 0, 3), (1, 0, 0, 1))}
+
+def test_add_existing_key_updates_line(renderer):
+    renderer.add("a", (0, 0, 0), (1, 0, 1))
+    renderer.add("a", (5, 0, 5), (6, 0, 6), (0, 1, 0, 1))
+
+    assert readLines(renderer) == {"a": line((5, 0, 5), (6, 0, 6), (0, 1, 0, 1))}
+
+def test_full_chunks_start_new_ones(renderer):
+    for i in range(10):
+        renderer.add(i, (i, 0, 0), (i, 0, 1))
+
+    assert [len(chunk.keys) for chunk in renderer.chunks] == [4, 4, 2]
+    assert readLines(renderer) == {i: line((i, 0, 0), (i, 0, 1)) for i in range(10)}
+
+def test_remove_moves_last_line_into_gap(renderer):
+    for key in "abcd":
+        renderer.add(key, (ord(key), 0, 0), (ord(key), 0, 1))
+    renderer.remove("b")
+
+    chunk = renderer.chunks[0]
+    assert chunk.keys == ["a", "d", "c"]
+    assert renderer.lines["d"][1] == 1
+    assert not renderer.has("b")
+    assert readLines(renderer) == {
+        key: line((ord(key), 0, 0), (ord(key), 0, 1)) for key in "acd"}
+
+def test_remove_last_and_unknown(renderer):
+    renderer.add("a", (0, 0, 0), (1, 0, 1))
+    renderer.add("b", (2, 0, 2), (3, 0, 3))
+    renderer.remove("b")
+    renderer.remove("unknown")
+
+    assert readLines(renderer) == {"a": line((0, 0, 0), (1, 0, 1))}
+
+def test_freed_slots_are_reused(renderer):
+    for i in range(8):
+        renderer.add(i, (i, 0, 0), (i, 0, 1))
+    renderer.remove(1)
+    renderer.add("new", (9, 0, 9), (9, 0, 9))
+
+    assert len(renderer.chunks) == 2
+    assert renderer.lines["new"][0] is renderer.chunks[0]
+
+def test_set_lines(renderer):
+    for i in range(6):
+        renderer.add(i, (0, 0, 0), (0, 0, 0))
+    renderer.setLines((i, (i, 0, i), (i + 1, 0, i + 1)) for i in range(6))
+    renderer.setLine(0, (7, 0, 7), (8, 0, 8))
+
+    lines = readLines(renderer)
+    assert lines[0] == line((7, 0, 7), (8, 0, 8))
+    assert lines[5] == line((5, 0, 5), (6, 0, 6))
+
+def test_color_and_visibility(renderer):
+    renderer.add("a", (0, 0, 0), (1, 0, 1))
+    renderer.setColor("a", (1, 0, 0, 1))
+    renderer.setVisible("a", False)
+    assert readLines(renderer)["a"][2] == pytest.approx(HIDDEN_COLOR)
+
+    # the color is kept while the line is hidden
+    renderer.setVisible("a", True)
+    assert readLines(renderer)["a"][2] == pytest.approx((1, 0, 0, 1))
+
+def test_clear(renderer):
+    for i in range(6):
+        renderer.add(i, (0, 0, 0), (1, 0, 1))
+    renderer.clear()
+
+    assert renderer.chunks == []
+    assert renderer.root.getNumChildren() == 0
+    assert not renderer.has(0)
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import Point3
+
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+def createProject():
+    """A project with two numbers added up"""
+    graph = HeadlessGraph()
+    numA = graph.createNode(NumericNode.Node)
+    numB = graph.createNode(NumericNode.Node)
+    add = graph.createNode(AddNode.Node)
+    numA.inputList[0].setValue(2)
+    numB.inputList[0].setValue(3)
+    add.setPos(1, 0, -2)
+    graph.connectSockets(numA.outputList[0], add.inputList[0])
+    graph.connectSockets(numB.outputList[0], add.inputList[1])
+    return JSONTools().get(graph.nodeList, graph.connections)
+
+def test_build_headless():
+    project = createProject()
+    graph = HeadlessGraph()
+    builder = GraphBuilder(graph)
+    nodes = builder.build(project)
+    # nodes and sockets keep their ids, so they are saved the same way
+    assert JSONTools().get(graph.nodeList, [])["Nodes"] == project["Nodes"]
+    graph.evaluate()
+
+    assert nodes == graph.nodeList
+    assert [str(node.nodeID) for node in nodes] == [
+        jsonNode["id"] for jsonNode in project["Nodes"]]
+    assert nodes[2].getPos() == Point3(1, 0, -2)
+    assert nodes[2].outputList[0].value == 5
+    assert not builder.hasUnknownNodes
+
+def test_build_node_manager(nodeManager):
+    project = createProject()
+    nodes = GraphBuilder(nodeManager).build(project)
+    nodeManager.updateAllLeaveNodes()
+
+    assert nodes == nodeManager.nodeList
+    assert len(nodeManager.connections) == 2
+    assert nodes[2].outputList[0].value == 5
+
+def test_unknown_nodes_and_connections_are_skipped():
+    project = createProject()
+    project["Nodes"][1]["type"] = "Unknown"
+    graph = HeadlessGraph()
+    builder = GraphBuilder(graph)
+    nodes = builder.build(project)
+
+    assert builder.hasUnknownNodes
+    assert len(nodes) == 2
+    assert len(graph.connections) == 1
+
+def createVersion01Project():
+    """A project as it has been saved before version 0.2"""
+    return {
+        "ProjectVersion": "0.1",
+        "Nodes": [
+            {
+                "id": "0f3a5e4c-1b2d-4e6f-8a9b-0c1d2e3f4a5b",
+                "type": "Panda3DNodeEditor.NodeCore.Nodes.NumericNode",
+                "pos": "LPoint3f(-1.5, 0, 0.25)",
+                "inSockets": [{
+                    "id": "2a2a2a2a-0000-4000-8000-000000000001",
+                    "value": "3"}],
+                "outSockets": [{"id": "2a2a2a2a-0000-4000-8000-000000000002"}]},
+            {
+                "id": "1e2d3c4b-5a69-4788-97a6-b5c4d3e2f1a0",
+                "type": "Panda3DNodeEditor.NodeCore.Nodes.AddNode",
+                "pos": "LPoint3f(1, 0, 0)",
+                "inSockets": [
+                    {"id": "2a2a2a2a-0000-4000-8000-000000000003"},
+                    {
+                        "id": "2a2a2a2a-0000-4000-8000-000000000004",
+                        "value": "None"}],
+                "outSockets": [{
+                    "id": "2a2a2a2a-0000-4000-8000-000000000005",
+                    "value": "None"}]},
+            {
+                "id": "4c4c4c4c-0000-4000-8000-000000000001",
+                "type": "Panda3DNodeEditor.NodeCore.Nodes.BoolNode",
+                "pos": "LPoint3f(0, 0, 2)",
+                "inSockets": [{
+                    "id": "2a2a2a2a-0000-4000-8000-000000000006",
+                    "value": "True"}],
+                "outSockets": [{
+                    "id": "2a2a2a2a-0000-4000-8000-000000000007",
+                    "value": "None"}]}],
+        "Connections": [{
+            "id": "3b3b3b3b-0000-4000-8000-000000000001",
+            "nodeA_ID": "0f3a5e4c-1b2d-4e6f-8a9b-0c1d2e3f4a5b",
+            "nodeB_ID": "1e2d3c4b-5a69-4788-97a6-b5c4d3e2f1a0",
+            "socketA_ID": "2a2a2a2a-0000-4000-8000-000000000002",
+            "socketB_ID": "2a2a2a2a-0000-4000-8000-000000000003"}]}
+
+def test_version_01_values_are_migrated(nodeManager):
+    num, add, boolNode = GraphBuilder(nodeManager).build(createVersion01Project())
+    nodeManager.updateAllLeaveNodes()
+
+    assert num.getPos() == Point3(-1.5, 0, 0.25)
+    assert num.inputList[0].getValue() == 3
+    assert add.inputList[0].value == 3
+    # stored "None" strings are read as missing values
+    assert add.inputList[1].getValue() is None
+    assert boolNode.inputList[0].getValue() is True
+
+def test_version_01_projects_are_saved_as_current_version(nodeManager):
+    GraphBuilder(nodeManager).build(createVersion01Project())
+    project = JSONTools().get(nodeManager.nodeList, nodeManager.connections)
+
+    assert project["Nodes"][0]["pos"] == [-1.5, 0, 0.25]
+    assert project["Nodes"][1]["inSockets"][1]["value"] is None
+    assert project["Nodes"][2]["inSockets"][0]["value"] is True
+
+def test_none_strings_of_newer_projects_are_kept():
+    project = createVersion01Project()
+    project["ProjectVersion"] = "0.2"
+    graph = HeadlessGraph()
+    num, add, boolNode = GraphBuilder(graph).build(project)
+
+    assert add.inputList[1].getValue() == "None"
+
+def test_newer_versions_warn(caplog):
+    project = createProject()
+    project["ProjectVersion"] = "9.0"
+    GraphBuilder(HeadlessGraph()).build(project)
+
+    assert "Unsupported project version 9.0" in caplog.text
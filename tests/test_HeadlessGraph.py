@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import Point3
+
+from Panda3DNodeEditor.Headless.HeadlessGraph import HeadlessGraph
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode, BoolNode, BoolAnd
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+def createSum(graph, a, b):
+    """Two numeric inputs added up, returns the add node"""
+    numA = graph.createNode(NumericNode.Node)
+    numB = graph.createNode(NumericNode.Node)
+    add = graph.createNode(AddNode.Node)
+    numA.inputList[0].setValue(a)
+    numB.inputList[0].setValue(b)
+    numB.setPos(1, 0, -2.5)
+    graph.connectSockets(numA.outputList[0], add.inputList[0])
+    graph.connectSockets(numB.outputList[0], add.inputList[1])
+    return add
+
+def test_nodes_have_no_gui():
+    graph = HeadlessGraph()
+    add = createSum(graph, 2, 3)
+
+    assert all(node.frame is None for node in graph.nodeList)
+    assert add.inputList[0].connected
+
+def test_evaluate():
+    graph = HeadlessGraph()
+    add = createSum(graph, 2, 3)
+    graph.evaluate()
+
+    assert add.outputList[0].value == 5
+
+def test_load_saved_project():
+    graph = HeadlessGraph()
+    createSum(graph, 2, 3)
+    project = JSONTools().get(graph.nodeList, graph.connections)
+
+    loaded = HeadlessGraph()
+    loaded.loadData(project)
+    loaded.evaluate()
+
+    results = loaded.getResults()
+    assert [result["type"] for result in results] == [
+        NumericNode.__name__, NumericNode.__name__, AddNode.__name__]
+    assert results[2]["outputs"] == [5]
+    assert [result["id"] for result in results] == [
+        str(node.nodeID) for node in graph.nodeList]
+    assert loaded.nodeList[1].getPos() == Point3(1, 0, -2.5)
+
+def test_load_bool_values():
+    graph = HeadlessGraph()
+    boolA = graph.createNode(BoolNode.Node)
+    boolB = graph.createNode(BoolNode.Node)
+    andNode = graph.createNode(BoolAnd.Node)
+    boolA.inputList[0].setValue(True)
+    boolB.inputList[0].setValue(True)
+    graph.connectSockets(boolA.outputList[0], andNode.inputList[0])
+    graph.connectSockets(boolB.outputList[0], andNode.inputList[1])
+    # bool values are stored as strings
+    project = JSONTools().get(graph.nodeList, graph.connections)
+
+    loaded = HeadlessGraph()
+    loaded.loadData(project)
+    loaded.evaluate()
+    assert loaded.nodeList[2].outputList[0].value is True
+
+def test_unknown_nodes_are_skipped():
+    graph = HeadlessGraph()
+    createSum(graph, 2, 3)
+    project = JSONTools().get(graph.nodeList, graph.connections)
+    project["Nodes"][0]["type"] = "Unknown.Node"
+
+    loaded = HeadlessGraph()
+    loaded.loadData(project)
+    assert len(loaded.nodeList) == 2
+    assert len(loaded.connections) == 1
+
+def test_attach_to_node_manager(nodeManager):
+    graph = HeadlessGraph()
+    add = createSum(graph, 2, 3)
+    graph.attachTo(nodeManager)
+
+    assert graph.nodeList == []
+    assert add in nodeManager.nodeList
+    assert add.frame is not None
+    assert add.inputList[0].plug is not None
+    numB = nodeManager.nodeList[1]
+    assert numB.inputList[0].getValue() == 3
+    assert numB.frame.getPos() == Point3(1, 0, -2.5)
+    assert add.outputList[0].value == 5
+
+def test_bool_node_with_gui(nodeManager):
+    node = nodeManager.createNode(BoolNode.Node)
+
+    assert node.inputList[0].checkbox["text"] == node.inputList[0].name
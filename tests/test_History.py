@@ -0,0 +1,235 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+import types
+
+import pytest
+
+from Panda3DNodeEditor.NodeCore import History as HistoryModule
+from Panda3DNodeEditor.NodeCore.History import History
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+from ProjectData import createProject
+
+class FakeNodeManager:
+    def __init__(self):
+        self.listeners = []
+
+    def addMutationListener(self, listener):
+        self.listeners.append(listener)
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(HistoryModule, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+@pytest.fixture
+def history(clock):
+    """History which records the change sets it applies instead of
+    changing a graph"""
+    history = History(FakeNodeManager(), coalesceTime=1.0)
+    history.applied = []
+    history.apply = history.applied.append
+    return history
+
+def valueRecord(socket, old, new):
+    return {"op": "value", "node": "n", "socket": socket, "from": old, "to": new}
+
+def moveRecord(nodeID, old, new):
+    return {"op": "move", "id": nodeID, "from": old, "to": new}
+
+def addRecord(nodeID):
+    return {"op": "addNode", "node": {"id": nodeID}}
+
+def entries(history):
+    return [json.loads(entry[2]) for entry in history.undoStack]
+
+def test_listens_to_node_manager():
+    nodeMgr = FakeNodeManager()
+    history = History(nodeMgr)
+    assert nodeMgr.listeners == [history.addChangeSet]
+
+def test_value_edits_coalesce(history, clock):
+    history.addChangeSet([valueRecord("s", 1, 2)])
+    clock.now += 0.5
+    history.addChangeSet([valueRecord("s", 2, 3)])
+    clock.now += 0.5
+    history.addChangeSet([valueRecord("s", 3, 4)])
+
+    # the merged entry goes from the first start to the last end value
+    assert entries(history) == [[valueRecord("s", 1, 4)]]
+    assert history.usedBytes == len(history.undoStack[0][2])
+
+def test_value_edits_of_other_sockets_dont_coalesce(history):
+    history.addChangeSet([valueRecord("s", 1, 2)])
+    history.addChangeSet([valueRecord("t", 1, 2)])
+    assert len(history.undoStack) == 2
+
+def test_coalescing_ends_after_coalesce_time(history, clock):
+    history.addChangeSet([valueRecord("s", 1, 2)])
+    clock.now += 1.5
+    history.addChangeSet([valueRecord("s", 2, 3)])
+    assert entries(history) == [[valueRecord("s", 1, 2)], [valueRecord("s", 2, 3)]]
+
+def test_moves_of_same_nodes_coalesce(history):
+    history.addChangeSet([moveRecord("a", [0, 0, 0], [1, 0, 0]), moveRecord("b", [5, 0, 0], [6, 0, 0])])
+    history.addChangeSet([moveRecord("b", [6, 0, 0], [7, 0, 0]), moveRecord("a", [1, 0, 0], [2, 0, 0])])
+    assert entries(history) == [[moveRecord("b", [5, 0, 0], [7, 0, 0]), moveRecord("a", [0, 0, 0], [2, 0, 0])]]
+
+    # a different selection starts a new entry
+    history.addChangeSet([moveRecord("a", [2, 0, 0], [3, 0, 0])])
+    assert len(history.undoStack) == 2
+
+def test_structural_changes_dont_coalesce(history):
+    history.addChangeSet([addRecord("a")])
+    history.addChangeSet([addRecord("a")])
+    assert len(history.undoStack) == 2
+
+def test_memory_limit_drops_oldest_entries(history):
+    history.maxBytes = 500
+    for i in range(100):
+        history.addChangeSet([addRecord(f"node{i:03d}")])
+
+    assert history.usedBytes <= history.maxBytes
+    assert history.usedBytes == sum(len(entry[2]) for entry in history.undoStack)
+    assert entries(history)[-1] == [addRecord("node099")]
+    # the kept entries are the newest ones in order
+    ids = [changeSet[0]["node"]["id"] for changeSet in entries(history)]
+    assert ids == [f"node{i:03d}" for i in range(100 - len(ids), 100)]
+
+def test_memory_limit_keeps_latest_entry(history):
+    history.maxBytes = 10
+    history.addChangeSet([addRecord("a" * 100)])
+    history.addChangeSet([addRecord("b" * 100)])
+    assert entries(history) == [[addRecord("b" * 100)]]
+
+def test_undo_applies_inverted_records_in_reverse(history):
+    changeSet = [
+        {"op": "connect", "connection": {"id": "c"}},
+        addRecord("a"),
+        valueRecord("s", 1, 2)]
+    history.addChangeSet(changeSet)
+    history.undo()
+
+    assert history.applied == [[
+        valueRecord("s", 2, 1),
+        {"op": "removeNode", "node": {"id": "a"}},
+        {"op": "disconnect", "connection": {"id": "c"}}]]
+    assert not history.canUndo()
+    assert history.canRedo()
+    assert history.usedBytes == 0
+
+def test_redo_applies_records_again(history):
+    changeSet = [addRecord("a"), moveRecord("a", [0, 0, 0], [1, 0, 0])]
+    history.addChangeSet(changeSet)
+    history.undo()
+    history.redo()
+
+    assert history.applied[-1] == changeSet
+    assert entries(history) == [changeSet]
+    assert history.usedBytes == len(history.undoStack[0][2])
+    assert not history.canRedo()
+
+def test_redo_doesnt_coalesce_with_next_change(history):
+    history.addChangeSet([valueRecord("s", 1, 2)])
+    history.undo()
+    history.redo()
+    history.addChangeSet([valueRecord("s", 2, 3)])
+    assert len(history.undoStack) == 2
+
+def test_new_change_clears_redo(history):
+    history.addChangeSet([addRecord("a")])
+    history.undo()
+    history.addChangeSet([addRecord("b")])
+    assert not history.canRedo()
+    history.redo()
+    assert len(history.applied) == 1
+
+def test_changes_of_history_itself_are_ignored(history):
+    history.applying = True
+    history.addChangeSet([addRecord("a")])
+    assert not history.canUndo()
+
+def test_undo_redo_on_empty_history(history):
+    history.undo()
+    history.redo()
+    assert history.applied == []
+
+def getState(nodeMgr):
+    """The saved nodes sorted by id and the connected socket ids"""
+    project = JSONTools().get(nodeMgr.nodeList, nodeMgr.connections)
+    for jsonNode in project["Nodes"]:
+        for jsonSocket in jsonNode["outSockets"]:
+            jsonSocket.pop("value", None)
+    nodes = sorted(project["Nodes"], key=lambda jsonNode: jsonNode["id"])
+    connections = sorted(
+        (jsonConnection["socketA_ID"], jsonConnection["socketB_ID"])
+        for jsonConnection in project["Connections"])
+    return nodes, connections
+
+@pytest.fixture
+def sumGraph(nodeManager):
+    """Nodes num0, num1, add1, num2, add2 adding up 1, 2 and 3"""
+    nodes = GraphBuilder(nodeManager).build(createProject([1, 2, 3]))
+    nodeManager.updateAllLeaveNodes()
+    for node in nodes:
+        nodeManager.commitValues(node)
+    return nodes
+
+def test_undo_and_redo_remove(nodeManager, sumGraph):
+    num0, num1, add1, num2, add2 = sumGraph
+    before = getState(nodeManager)
+    nodeManager.removeNode([add1])
+    after = getState(nodeManager)
+
+    nodeManager.undo()
+    assert getState(nodeManager) == before
+    restored = nodeManager.nodeList[-1]
+    assert restored.nodeID == add1.nodeID
+    assert add2.outputList[0].value == 6
+
+    nodeManager.redo()
+    assert getState(nodeManager) == after
+    assert restored not in nodeManager.nodeList
+
+def test_undo_move_and_value(nodeManager, sumGraph):
+    num0, num1, add1, num2, add2 = sumGraph
+    before = getState(nodeManager)
+    startPos = num0.getPos()
+    num0.setPos(5, 0, 5)
+    nodeManager.recordMoves({num0: startPos})
+    num2.inputList[0].setValue(10)
+    nodeManager.recordValueChange(num2.inputList[0])
+
+    nodeManager.undo()
+    assert num2.inputList[0].getValue() == 3
+    assert add2.outputList[0].value == 6
+    nodeManager.undo()
+    assert getState(nodeManager) == before
+    assert not nodeManager.history.canUndo()
+
+def test_undo_connect(nodeManager, sumGraph):
+    num0, num1, add1, num2, add2 = sumGraph
+    nodeManager.removeNode([num1])
+    before = getState(nodeManager)
+    nodeManager.connectPlugs(num2.outputList[0], add1.inputList[1])
+    assert len(nodeManager.connections) == 4
+
+    nodeManager.undo()
+    assert getState(nodeManager) == before
+    assert not add1.inputList[1].connected
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import io
+import json
+
+import pytest
+
+from Panda3DNodeEditor.Tools.JSONStreamReader import JSONStreamReader
+from ProjectData import createProject
+
+# small chunks cut through strings, numbers and separators
+CHUNK_SIZES = (1, 2, 3, 7, 64, 65536)
+
+def read(text, chunkSize):
+    """Returns the (key, value) tuples the reader yields for text"""
+    return list(JSONStreamReader(io.StringIO(text), chunkSize).iterate())
+
+def expected(text):
+    """Returns the (key, value) tuples json.loads implies for text"""
+    result = []
+    for key, value in json.loads(text).items():
+        if isinstance(value, list):
+            result += [(key, element) for element in value]
+        else:
+            result.append((key, value))
+    return result
+
+@pytest.mark.parametrize("chunkSize", CHUNK_SIZES)
+def test_project_file(chunkSize):
+    text = json.dumps(createProject([0.5 * i for i in range(50)]))
+    assert read(text, chunkSize) == expected(text)
+
+@pytest.mark.parametrize("chunkSize", CHUNK_SIZES)
+def test_formatted_project_file(chunkSize):
+    text = json.dumps(createProject(range(25)), indent=4)
+    assert read(text, chunkSize) == expected(text)
+
+@pytest.mark.parametrize("chunkSize", CHUNK_SIZES)
+def test_tricky_values(chunkSize):
+    text = json.dumps({
+        "ProjectVersion": "0.2",
+        "number": 1234567890.125e-3,
+        "negative": -98765,
+        "flags": [True, False, None],
+        "strings": ["]", ",", "}", "{\"a\": [1]}", "\\", "ünïcödé ✓", ""],
+        "nested": [[1, [2, [3]]], {"k": [4, 5]}, []],
+        "empty": [],
+        "object": {"Nodes": [1, 2]},
+        "last": 0})
+    assert read(text, chunkSize) == expected(text)
+
+@pytest.mark.parametrize("chunkSize", CHUNK_SIZES)
+def test_whitespace(chunkSize):
+    text = ' \r\n{ "a" :\t[ 1 ,\n 2 ] ,\n "b" : "x" , "c" : [ ] }\n '
+    assert read(text, chunkSize) == expected(text)
+
+def test_empty_object():
+    assert read("{}", 1) == []
+    assert read("  { }  ", 1) == []
+
+@pytest.mark.parametrize("text", ("", "[1, 2]", '{"a": 1', '{"a" 1}', '{"a": [1 2]}', '{"a": tru}'))
+def test_invalid(text):
+    with pytest.raises(ValueError):
+        read(text, 2)
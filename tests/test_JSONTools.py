@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from panda3d.core import Point3
+
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools, PROJECT_VERSION
+
+from ProjectData import createGraph
+
+def test_parse_pos():
+    jsonTools = JSONTools()
+
+    assert jsonTools.parsePos("LPoint3f(1, 0, -2.5)") == Point3(1, 0, -2.5)
+    assert jsonTools.parsePos("LPoint3f(1e-05, 0, 3)") == Point3(1e-05, 0, 3)
+    assert jsonTools.parsePos("garbage") == Point3(0)
+
+def test_get_pos():
+    jsonTools = JSONTools()
+
+    assert jsonTools.getPos([1, 0, -2.5]) == Point3(1, 0, -2.5)
+    # positions of project version 0.1
+    assert jsonTools.getPos("LPoint3f(1, 0, -2.5)") == Point3(1, 0, -2.5)
+    assert jsonTools.getPos([1, 2]) == Point3(0)
+
+def test_supported_versions():
+    jsonTools = JSONTools()
+
+    assert jsonTools.isSupportedVersion("0.1")
+    assert jsonTools.isSupportedVersion(PROJECT_VERSION)
+    assert not jsonTools.isSupportedVersion("0.10")
+    assert not jsonTools.isSupportedVersion("1.0")
+    assert not jsonTools.isSupportedVersion(None)
+    assert not jsonTools.isSupportedVersion("latest")
+
+def test_values_are_stored_as_json_types():
+    graph, total = createGraph([1, 2.5])
+    project = JSONTools().get(graph.nodeList, graph.connections)
+
+    assert project["ProjectVersion"] == PROJECT_VERSION
+    assert [node["pos"] for node in project["Nodes"]] == [
+        [0, 0, 1.5], [2, 0, 1.5], [3, 0, -0.25]]
+    values = [
+        socket.get("value", "connected")
+        for node in project["Nodes"] for socket in node["inSockets"]]
+    assert values == [1, 2.5, "connected", "connected"]
+    # the sum is not connected any further
+    assert project["Nodes"][2]["outSockets"][0]["value"] is None
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import os
+
+import pytest
+
+from Panda3DNodeEditor.SaveScripts.Journal import Journal
+from Panda3DNodeEditor.SaveScripts.SaveJSON import Save
+from Panda3DNodeEditor.Tools.GraphBuilder import GraphBuilder
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+from Panda3DNodeEditor.Tools.JSONTools import JSONTools
+
+from ProjectData import createProject
+
+@pytest.fixture
+def project(nodeManager, tmp_path):
+    """Nodes num0, num1, add1, num2, add2 saved to a file"""
+    nodes = GraphBuilder(nodeManager).build(createProject([1, 2, 3]))
+    nodeManager.updateAllLeaveNodes()
+    for node in nodes:
+        nodeManager.commitValues(node)
+    path = str(tmp_path / "project.logic")
+    Save(nodeManager.nodeList, nodeManager.connections, filepath=path)
+    return path, nodes
+
+@pytest.fixture
+def journal(nodeManager, project):
+    path, nodes = project
+    journal = Journal(nodeManager)
+    journal.bind(path)
+    yield journal
+    journal.destroy()
+
+def withoutOutputs(fileContent):
+    """Output values are recalculated on load and not journaled"""
+    for jsonNode in fileContent["Nodes"]:
+        for jsonSocket in jsonNode["outSockets"]:
+            jsonSocket.pop("value", None)
+    return fileContent
+
+def fullSave(nodeManager):
+    return withoutOutputs(JSONTools().get(nodeManager.nodeList, nodeManager.connections))
+
+def setValue(nodeManager, socket, value):
+    socket.setValue(value)
+    nodeManager.recordValueChange(socket)
+
+def test_replay_equals_full_save(nodeManager, project, journal):
+    path, (num0, num1, add1, num2, add2) = project
+    startPos = num0.getPos()
+    num0.setPos(4, 0, 4)
+    nodeManager.recordMoves({num0: startPos})
+    setValue(nodeManager, num2.inputList[0], 7)
+    nodeManager.removeNode([num1])
+    nodeManager.connectPlugs(num2.outputList[0], add1.inputList[1])
+    journal.save()
+
+    assert os.path.exists(JournalTools().getJournalPath(path))
+    assert withoutOutputs(JournalTools().loadProject(path)) == fullSave(nodeManager)
+
+def test_replay_of_disconnect_equals_full_save(nodeManager, project, journal):
+    path, (num0, num1, add1, num2, add2) = project
+    nodeManager.connectPlugs(num0.outputList[0], num2.inputList[0])
+    # the widget shows the value of the connection when it gets removed
+    nodeManager.viewSync.sync()
+    nodeManager.connectPlugs(num0.outputList[0], num2.inputList[0])
+    assert num2.inputList[0].getValue() == 1
+    journal.save()
+
+    assert withoutOutputs(JournalTools().loadProject(path)) == fullSave(nodeManager)
+
+def test_replay_of_removed_input_equals_full_save(nodeManager, project, journal):
+    path, (num0, num1, add1, num2, add2) = project
+    nodeManager.connectPlugs(num0.outputList[0], num2.inputList[0])
+    nodeManager.viewSync.sync()
+    nodeManager.removeNode([num0])
+    journal.save()
+
+    assert withoutOutputs(JournalTools().loadProject(path)) == fullSave(nodeManager)
+
+def test_save_without_changes(project, journal):
+    path, nodes = project
+    journal.save()
+
+    assert not os.path.exists(JournalTools().getJournalPath(path))
+
+def test_compact(nodeManager, project, journal):
+    path, (num0, num1, add1, num2, add2) = project
+    journal.compactThreshold = 2
+    for value in range(3):
+        setValue(nodeManager, num0.inputList[0], value)
+    journal.save()
+
+    assert not os.path.exists(JournalTools().getJournalPath(path))
+    assert withoutOutputs(JournalTools().loadProject(path)) == fullSave(nodeManager)
+    assert journal.recordCount == 0
+
+def test_outdated_journal_is_removed(nodeManager, project, journal):
+    path, (num0, num1, add1, num2, add2) = project
+    setValue(nodeManager, num0.inputList[0], 9)
+    journal.save()
+    # a full save of the project makes the journal outdated
+    Save(nodeManager.nodeList, nodeManager.connections, filepath=path)
+    os.utime(path, ns=(0, 0))
+    journal.bind(path)
+
+    assert not os.path.exists(JournalTools().getJournalPath(path))
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import copy
+import json
+
+from Panda3DNodeEditor.Tools.BinaryTools import BinaryTools
+from Panda3DNodeEditor.Tools.JournalTools import JournalTools
+
+import ProjectData
+
+def createProject():
+    """Nodes of the sum of three numbers: num0, num1, add1, num2, add2"""
+    return ProjectData.createProject([1, 2, 3])
+
+def writeJournal(path, changeSets, base=None):
+    tools = JournalTools()
+    if base is None:
+        base = tools.getBaseHeader(path)
+    with open(tools.getJournalPath(path), "w") as outfile:
+        outfile.write(json.dumps({"base": base}) + "\n")
+        for changeSet in changeSets:
+            outfile.write(json.dumps(changeSet) + "\n")
+
+def test_replay():
+    project = createProject()
+    nodes = project["Nodes"]
+    connections = project["Connections"]
+    newNode = copy.deepcopy(nodes[1])
+    newNode["id"] = "9e9e9e9e-0000-4000-8000-000000000001"
+    newNode["inSockets"][0]["id"] = "9e9e9e9e-0000-4000-8000-000000000002"
+    newNode["outSockets"][0]["id"] = "9e9e9e9e-0000-4000-8000-000000000003"
+    changeSets = [
+        [{"op": "addNode", "node": newNode}],
+        [{"op": "move", "id": nodes[0]["id"], "from": nodes[0]["pos"], "to": [9.0, 0.0, 9.0]}],
+        [{"op": "value", "node": nodes[0]["id"], "socket": nodes[0]["inSockets"][0]["id"], "from": 1, "to": 42}],
+        [{"op": "value", "node": newNode["id"], "socket": newNode["inSockets"][0]["id"], "from": 1, "to": 7}],
+        # the connectors of a removed node are disconnected first
+        [{"op": "disconnect", "connection": connection} for connection in connections[:3]]
+        + [{"op": "removeNode", "node": nodes[2]}],
+        [{"op": "unknown"}]]
+    result = JournalTools().replay(copy.deepcopy(project), changeSets)
+
+    ids = [jsonNode["id"] for jsonNode in result["Nodes"]]
+    assert ids == [
+        nodes[0]["id"], nodes[1]["id"], nodes[3]["id"], nodes[4]["id"], newNode["id"]]
+    assert result["Nodes"][0]["pos"] == [9.0, 0.0, 9.0]
+    assert result["Nodes"][0]["inSockets"][0]["value"] == 42
+    assert result["Nodes"][-1]["inSockets"][0]["value"] == 7
+    assert result["Connections"] == connections[3:]
+
+def test_changes_of_removed_nodes_are_ignored():
+    project = createProject()
+    node = project["Nodes"][0]
+    changeSets = [
+        [{"op": "removeNode", "node": node}],
+        [{"op": "move", "id": node["id"], "from": [0, 0, 0], "to": [1, 0, 0]}],
+        [{"op": "value", "node": node["id"], "socket": node["inSockets"][0]["id"], "from": 1, "to": 2}]]
+    result = JournalTools().replay(copy.deepcopy(project), changeSets)
+    assert node["id"] not in [jsonNode["id"] for jsonNode in result["Nodes"]]
+
+def test_load_project_with_journal(tmp_path):
+    path = str(tmp_path / "project.logic")
+    project = createProject()
+    with open(path, "w") as outfile:
+        json.dump(project, outfile)
+    node = project["Nodes"][0]
+    writeJournal(path, [[{"op": "move", "id": node["id"], "from": node["pos"], "to": [2.0, 0.0, 2.0]}]])
+
+    result = JournalTools().loadProject(path)
+    assert result["Nodes"][0]["pos"] == [2.0, 0.0, 2.0]
+    assert result["Nodes"][1:] == project["Nodes"][1:]
+
+def test_load_binary_project(tmp_path):
+    path = str(tmp_path / "project.blogic")
+    project = createProject()
+    with open(path, "wb") as outfile:
+        outfile.write(BinaryTools().dumps(project))
+    assert JournalTools().loadProject(path) == project
+
+def test_outdated_journal_is_ignored(tmp_path):
+    path = str(tmp_path / "project.logic")
+    with open(path, "w") as outfile:
+        json.dump(createProject(), outfile)
+    writeJournal(path, [[{"op": "unknown"}]], base={"size": 0, "mtime": 0})
+
+    assert JournalTools().readChangeSets(path) is None
+
+def test_missing_journal(tmp_path):
+    path = str(tmp_path / "project.logic")
+    with open(path, "w") as outfile:
+        json.dump(createProject(), outfile)
+    assert JournalTools().readChangeSets(path) is None
+
+def test_incomplete_last_change_is_ignored(tmp_path):
+    path = str(tmp_path / "project.logic")
+    with open(path, "w") as outfile:
+        json.dump(createProject(), outfile)
+    first = [{"op": "move", "id": "a", "from": [0, 0, 0], "to": [1, 0, 0]}]
+    writeJournal(path, [first])
+    with open(JournalTools().getJournalPath(path), "a") as outfile:
+        outfile.write('[{"op": "mo')
+
+    assert JournalTools().readChangeSets(path) == [first]
@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import pytest
+
+from DirectGuiExtension import DirectGuiHelper as DGH
+
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, TestOutNode
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import LOD_REDUCED
+
+@pytest.fixture
+def measured(monkeypatch):
+    """Record the frames whose width gets measured"""
+    frames = []
+    getRealWidth = DGH.getRealWidth
+    def spy(frame):
+        frames.append(frame)
+        return getRealWidth(frame)
+    monkeypatch.setattr(DGH, "getRealWidth", spy)
+    return frames
+
+def test_layout_is_cached(nodeManager, measured):
+    node = nodeManager.createNode(AddNode.Node)
+    node.show()
+    assert node.layoutValid
+    del measured[:]
+
+    node.update()
+    node.update()
+    assert measured == []
+
+def test_invalidated_socket_is_measured_again(nodeManager, measured):
+    node = nodeManager.createNode(AddNode.Node)
+    node.show()
+    del measured[:]
+
+    node.invalidateLayout(node.inputList[1])
+    node.update()
+    assert measured == [node.inputList[1].frame]
+
+    node.setLOD(LOD_REDUCED)
+    node.update()
+    assert len(measured) == 1 + len(node.inputList + node.outputList)
+
+def test_requested_updates_run_once_per_frame(nodeManager):
+    node = nodeManager.createNode(AddNode.Node)
+    updated = []
+    node.update = lambda: updated.append(node)
+    node.requestUpdate()
+    node.requestUpdate()
+    assert updated == []
+
+    taskMgr.step()
+    assert updated == [node]
+    taskMgr.step()
+    assert updated == [node]
+
+def test_each_node_manager_runs_its_own_updates(showBase, nodeManager):
+    from Panda3DNodeEditor.NodeCore.NodeManager import NodeManager
+    viewNP = showBase.aspect2d.attachNewNode("otherView")
+    otherManager = NodeManager(viewNP)
+    try:
+        node = nodeManager.createNode(AddNode.Node)
+        otherNode = otherManager.createNode(AddNode.Node)
+        node.requestUpdate()
+        otherNode.requestUpdate()
+        assert nodeManager.updateNodesTaskName != otherManager.updateNodesTaskName
+        assert list(otherManager.pendingUpdates) == [otherNode]
+
+        otherManager.cleanup()
+        assert list(nodeManager.pendingUpdates) == [node]
+        assert taskMgr.hasTaskNamed(nodeManager.updateNodesTaskName)
+    finally:
+        otherManager.cleanup()
+        otherManager.connectionRenderer.destroy()
+        viewNP.removeNode()
+
+def test_nodes_without_manager_update_right_away(showBase):
+    node = AddNode.Node(showBase.aspect2d)
+    node.invalidateLayout()
+    node.requestUpdate()
+
+    assert node.layoutValid
+    node.destroy()
+
+def test_removed_nodes_drop_their_update(nodeManager):
+    node = nodeManager.createNode(AddNode.Node)
+    node.requestUpdate()
+    nodeManager.removeNode([node])
+
+    assert node not in nodeManager.pendingUpdates
+
+def test_test_out_node_skips_unchanged_values(nodeManager):
+    node = nodeManager.createNode(TestOutNode.Node)
+    node.inputList[0].value = 3
+    node.updateView()
+    assert node.inputList[0].text["text"] == "3"
+    assert not node.layoutValid
+    taskMgr.step()
+    assert node.layoutValid
+
+    node.updateView()
+    assert node not in nodeManager.pendingUpdates
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from GraphFakes import FakeNodeManager
+
+def createChain(mgr, length):
+    nodes = [mgr.addNode("n0", value=1)]
+    for i in range(1, length):
+        nodes.append(mgr.addNode(f"n{i}"))
+        mgr.connect(nodes[-2], nodes[-1])
+    return nodes
+
+def createDiamond(mgr):
+    """top splits into left and right which join again in bottom"""
+    top = mgr.addNode("top", value=1)
+    # created in reverse, so the creation order doesn't match the result
+    bottom = mgr.addNode("bottom", numInputs=2)
+    right = mgr.addNode("right")
+    left = mgr.addNode("left")
+    mgr.connect(top, left)
+    mgr.connect(top, right)
+    mgr.connect(left, bottom, 0)
+    mgr.connect(right, bottom, 1)
+    return top, left, right, bottom
+
+def test_chain_order():
+    mgr = FakeNodeManager()
+    nodes = createChain(mgr, 5)
+    # sorting must not depend on the order nodes are passed in
+    mgr.evaluator.evaluate(reversed(nodes))
+
+    assert mgr.log == ["n0", "n1", "n2", "n3", "n4"]
+    assert nodes[-1].outputList[0].value == 1
+
+def test_chain_evaluates_downstream_only():
+    mgr = FakeNodeManager()
+    nodes = createChain(mgr, 5)
+    mgr.evaluator.evaluate([nodes[2]])
+
+    assert mgr.log == ["n2", "n3", "n4"]
+
+def test_diamond_runs_each_node_once_after_its_inputs():
+    mgr = FakeNodeManager()
+    top, left, right, bottom = createDiamond(mgr)
+    mgr.evaluator.evaluate([top])
+
+    assert sorted(mgr.log) == ["bottom", "left", "right", "top"]
+    assert mgr.log[0] == "top"
+    assert mgr.log[-1] == "bottom"
+    assert bottom.outputList[0].value == 2
+    assert all(connector.state == "checked" for connector in mgr.connections)
+
+def test_diamond_from_one_branch():
+    mgr = FakeNodeManager()
+    top, left, right, bottom = createDiamond(mgr)
+    mgr.evaluator.evaluate([top])
+    del mgr.log[:]
+    mgr.evaluator.evaluate([left])
+
+    assert mgr.log == ["left", "bottom"]
+
+def test_no_cycles_found_in_dag():
+    mgr = FakeNodeManager()
+    createDiamond(mgr)
+    mgr.evaluator.buildSchedule()
+
+    assert mgr.evaluator.cycles == []
+    assert mgr.evaluator.cyclicConnectors == set()
+
+def test_cycle_detection():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a")
+    b = mgr.addNode("b")
+    c = mgr.addNode("c")
+    d = mgr.addNode("d")
+    ab = mgr.connect(a, b)
+    bc = mgr.connect(b, c)
+    ca = mgr.connect(c, a)
+    cd = mgr.connect(c, d)
+    mgr.evaluator.evaluate([a])
+
+    assert len(mgr.evaluator.cycles) == 1
+    assert set(mgr.evaluator.cycles[0]) == {a, b, c}
+    assert mgr.evaluator.cyclicConnectors == {ab, bc, ca}
+    # the cycle still runs once and the node behind it afterwards
+    assert sorted(mgr.log) == ["a", "b", "c", "d"]
+    assert mgr.log[-1] == "d"
+    assert ab.state == bc.state == ca.state == "error"
+    assert cd.state == "checked"
+
+def test_schedule_rebuilt_after_invalidate():
+    mgr = FakeNodeManager()
+    a = mgr.addNode("a", value=1)
+    b = mgr.addNode("b")
+    mgr.evaluator.evaluate([a, b])
+    del mgr.log[:]
+
+    mgr.connect(b, a)
+    mgr.evaluator.evaluate([b])
+    assert mgr.log == ["b", "a"]
+
+def test_removed_node_is_not_evaluated():
+    mgr = FakeNodeManager()
+    nodes = createChain(mgr, 3)
+    mgr.evaluator.markDirty(nodes[1])
+    mgr.removeNode(nodes[1])
+    mgr.evaluator.evaluate([nodes[0]])
+
+    assert mgr.log == ["n0"]
+    assert nodes[1] not in mgr.evaluator.order
+
+def test_suspend_defers_evaluation():
+    mgr = FakeNodeManager()
+    nodes = createChain(mgr, 3)
+    mgr.evaluator.suspend()
+    mgr.evaluator.suspend()
+    mgr.evaluator.evaluate([nodes[0]])
+    mgr.evaluator.evaluate([nodes[1]])
+    assert mgr.log == []
+
+    mgr.evaluator.resume()
+    assert mgr.log == []
+
+    # all deferred nodes are evaluated together, each once
+    mgr.evaluator.resume()
+    assert mgr.log == ["n0", "n1", "n2"]
+
+def test_view_sync_gets_results():
+    class FakeViewSync:
+        def __init__(self):
+            self.nodes = []
+            self.connectors = {}
+
+        def addNodes(self, nodes):
+            self.nodes += nodes
+
+        def setConnectorState(self, connector, hasError):
+            self.connectors[connector] = hasError
+
+    mgr = FakeNodeManager()
+    nodes = createChain(mgr, 3)
+    mgr.evaluator.viewSync = viewSync = FakeViewSync()
+    mgr.evaluator.evaluate([nodes[0]])
+
+    assert viewSync.nodes == nodes
+    assert viewSync.connectors == {connector: False for connector in mgr.connections}
+    # connectors are left to the view sync
+    assert all(connector.state is None for connector in mgr.connections)
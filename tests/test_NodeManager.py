@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from direct.showbase.DirectObject import DirectObject
+
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode
+from Panda3DNodeEditor.NodeCore.Sockets.SocketBase import (
+    LOD_FULL,
+    LOD_REDUCED,
+    LOD_SIMPLE)
+
+def createChain(nodeMgr, length):
+    nodes = [nodeMgr.createNode(AddNode.Node) for i in range(length)]
+    connectors = [
+        nodeMgr.connectSockets(a.outputList[0], b.inputList[0])
+        for a, b in zip(nodes, nodes[1:])]
+    return nodes, connectors
+
+def spyLines(nodeMgr):
+    """Record the keys of all lines the renderer is asked to move"""
+    updated = []
+    setLines = nodeMgr.connectionRenderer.setLines
+    def spy(lines):
+        lines = list(lines)
+        updated.extend(key for key, start, end in lines)
+        setLines(lines)
+    nodeMgr.connectionRenderer.setLines = spy
+    return updated
+
+def test_update_connections_of_given_nodes(nodeManager):
+    nodes, connectors = createChain(nodeManager, 4)
+    updated = spyLines(nodeManager)
+    nodeManager.updateConnections([nodes[0], nodes[1]])
+
+    assert sorted(updated, key=connectors.index) == connectors[:2]
+
+def test_update_all_connections(nodeManager):
+    nodes, connectors = createChain(nodeManager, 4)
+    updated = spyLines(nodeManager)
+    nodeManager.updateConnections()
+
+    assert updated == connectors
+
+def test_node_hit_tests(nodeManager):
+    a = nodeManager.createNode(AddNode.Node)
+    b = nodeManager.createNode(AddNode.Node)
+    b.frame.setPos(0.5, 0, 0)
+    nodeManager.updateNodeBounds()
+
+    # nodes span from -0.5 to 0.5 horizontally and -0.6 to 0.2 vertically
+    assert nodeManager.nodeAt(-0.25, 0) is a
+    assert nodeManager.nodeAt(0.25, 0) is b
+    assert nodeManager.nodeAt(5, 5) is None
+    assert nodeManager.nodesInRect(0.8, 2, -1, 1) == [b]
+
+    # rectangles seen from another NodePath are transformed into the view
+    assert nodeManager.nodeAt(-0.25, 0, nodeManager.nodeViewNP.getParent()) is a
+    nodeManager.nodeViewNP.setScale(0.5)
+    assert nodeManager.nodesInRect(
+        0.4, 1, -1, 1, nodeManager.nodeViewNP.getParent()) == [b]
+
+def test_removed_nodes_are_not_hit(nodeManager):
+    node = nodeManager.createNode(AddNode.Node)
+    nodeManager.updateNodeBounds()
+    nodeManager.removeNode([node])
+
+    assert nodeManager.nodeAt(0, 0) is None
+
+def createRow(nodeManager, count):
+    """Nodes next to each other, two units apart"""
+    nodes = []
+    for i in range(count):
+        node = nodeManager.createNode(AddNode.Node)
+        node.frame.setPos(i * 2, 0, 0)
+        nodes.append(node)
+    nodeManager.updateNodeBounds()
+    return nodes
+
+def isStashed(node):
+    return node.frame.isStashed()
+
+def test_culling_stashes_nodes_outside_of_the_view(nodeManager):
+    nodes = createRow(nodeManager, 5)
+    nodeManager.cullNodes(-1, 3, -1, 1)
+    # nothing happens until culling gets enabled
+    assert not any(map(isStashed, nodes))
+
+    nodeManager.setCulling(True)
+    assert list(map(isStashed, nodes)) == [False, False, True, True, True]
+
+    nodeManager.cullNodes(3, 7, -1, 1)
+    assert list(map(isStashed, nodes)) == [True, True, False, False, True]
+
+def test_culling_follows_moved_nodes(nodeManager):
+    nodes = createRow(nodeManager, 2)
+    nodeManager.setCulling(True)
+    nodeManager.cullNodes(-1, 1, -1, 1)
+    assert isStashed(nodes[1])
+
+    nodes[1].frame.setPos(0.5, 0, 0)
+    nodeManager.updateNodeBounds([nodes[1]])
+    assert not isStashed(nodes[1])
+
+def test_disable_culling_shows_all_nodes(nodeManager):
+    nodes = createRow(nodeManager, 3)
+    nodeManager.setCulling(True)
+    nodeManager.cullNodes(-1, 1, -1, 1)
+    nodeManager.removeNode([nodes[2]])
+    nodeManager.setCulling(False)
+
+    assert not any(map(isStashed, nodes[:2]))
+    assert nodeManager.culledNodes == set()
+
+def test_lod_stashes_widgets_and_sockets(nodeManager):
+    node = nodeManager.createNode(NumericNode.Node)
+    node.show()
+    socket = node.inputList[0]
+
+    nodeManager.setLOD(LOD_REDUCED)
+    assert socket.spinBox.isStashed()
+    assert not socket.frame.isStashed()
+
+    nodeManager.setLOD(LOD_SIMPLE)
+    assert socket.frame.isStashed()
+    assert node.frame.component("text0").isHidden()
+    assert nodeManager.connectionRenderer.root.getRenderModeThickness() == 1
+
+    nodeManager.setLOD(LOD_FULL)
+    assert not socket.frame.isStashed()
+    assert not socket.spinBox.isStashed()
+    assert not node.frame.component("text0").isHidden()
+
+def test_lod_lays_out_nodes(nodeManager):
+    a = nodeManager.createNode(NumericNode.Node)
+    b = nodeManager.createNode(AddNode.Node)
+    a.show()
+    b.show()
+    b.frame.setPos(2, 0, 0)
+    connector = nodeManager.connectSockets(a.outputList[0], b.inputList[0])
+    updated = spyLines(nodeManager)
+    nodeManager.setLOD(LOD_SIMPLE)
+
+    assert connector in updated
+    for node in (a, b):
+        assert nodeManager.spatialIndex.getBounds(node) == \
+            nodeManager.getNodeBounds(node)
+
+def test_new_nodes_use_the_current_lod(nodeManager):
+    nodeManager.setLOD(LOD_REDUCED)
+    node = nodeManager.createNode(NumericNode.Node)
+
+    assert node.lod == LOD_REDUCED
+    assert node.inputList[0].spinBox.isStashed()
+
+def countDirty():
+    """Count the dirty events sent from now on"""
+    listener = DirectObject()
+    sent = []
+    listener.accept("NodeEditor_set_dirty", sent.append, [True])
+    return listener, sent
+
+def test_batch_defers_logic_to_the_outermost_end(nodeManager):
+    num = nodeManager.createNode(NumericNode.Node)
+    add = nodeManager.createNode(AddNode.Node)
+    nodeManager.connectSockets(num.outputList[0], add.inputList[0])
+    nodeManager.connectSockets(num.outputList[0], add.inputList[1])
+    num.inputList[0].setValue(3)
+
+    with nodeManager.batch():
+        with nodeManager.batch():
+            nodeManager.evaluator.evaluate([num])
+        assert add.outputList[0].getValue() != 6
+    assert add.outputList[0].getValue() == 6
+
+def test_batch_sends_dirty_once(nodeManager):
+    listener, sent = countDirty()
+    with nodeManager.batch():
+        with nodeManager.batch():
+            nodeManager.setDirty()
+        nodeManager.setDirty()
+        assert sent == []
+    assert sent == [True]
+
+    with nodeManager.batch():
+        pass
+    assert sent == [True]
+    listener.ignoreAll()
+
+def test_batch_lays_out_changed_nodes_once(nodeManager):
+    nodes, connectors = createChain(nodeManager, 4)
+    updated = spyLines(nodeManager)
+    with nodeManager.batch():
+        nodeManager.updateLayout([nodes[0]])
+        with nodeManager.batch():
+            nodes[0].frame.setPos(3, 0, 0)
+            nodeManager.updateLayout([nodes[0]])
+        assert updated == []
+    assert updated == [connectors[0]]
+    assert nodeManager.spatialIndex.getBounds(nodes[0]) == \
+        nodeManager.getNodeBounds(nodes[0])
+
+def test_remove_in_batch_skips_its_layout(nodeManager):
+    nodes, connectors = createChain(nodeManager, 3)
+    updated = spyLines(nodeManager)
+    listener, sent = countDirty()
+    with nodeManager.batch():
+        nodeManager.updateLayout([nodes[1]])
+        nodeManager.removeNode([nodes[1]])
+    assert nodes[1] not in nodeManager.nodeList
+    assert nodeManager.connections == []
+    assert updated == []
+    assert not nodeManager.spatialIndex.has(nodes[1])
+    assert sent == [True]
+    listener.ignoreAll()
@@ -0,0 +1,97 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.NodeCore.NodePool import NodePool
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode, TestOutNode
+
+class UnpoolableNode(AddNode.Node):
+    poolable = False
+
+def test_released_nodes_are_reused():
+    pool = NodePool()
+    node = pool.create(NumericNode.Node, None)
+    nodeID = node.nodeID
+    socketIDs = [socket.socketID for socket in node.inputList + node.outputList]
+    node.inputList[0].setValue(42)
+    node.setPos(1, 0, 1)
+    pool.release(node)
+
+    reused = pool.create(NumericNode.Node, None)
+    assert reused is node
+    assert reused.nodeID != nodeID
+    assert all(
+        socket.socketID not in socketIDs
+        for socket in reused.inputList + reused.outputList)
+    # reused nodes start with the values of a new node
+    assert reused.inputList[0].getValue() == NumericNode.Node(None).inputList[0].getValue()
+    assert list(reused.getPos()) == [0, 0, 0]
+
+def test_reset_disconnects_sockets():
+    pool = NodePool()
+    node = pool.create(AddNode.Node, None)
+    node.inputList[0].setConnected(True)
+    node.inputList[0].value = 3
+    pool.release(node)
+    reused = pool.create(AddNode.Node, None)
+
+    assert not reused.inputList[0].connected
+    assert reused.inputList[0].value is None
+
+def test_pools_are_kept_per_type():
+    pool = NodePool()
+    add = pool.create(AddNode.Node, None)
+    pool.release(add)
+
+    assert pool.create(NumericNode.Node, None) is not add
+    assert pool.create(AddNode.Node, None) is add
+
+def test_max_size():
+    pool = NodePool(maxSize=1)
+    nodes = [pool.create(AddNode.Node, None) for i in range(3)]
+    for node in nodes:
+        pool.release(node)
+
+    assert pool.pools[AddNode.Node] == [nodes[0]]
+
+def test_unpoolable_nodes_are_destroyed():
+    pool = NodePool()
+    pool.release(pool.create(UnpoolableNode, None))
+    # nodes not created by the pool don't have any default values
+    pool.release(AddNode.Node(None))
+
+    assert pool.pools[UnpoolableNode] == []
+    assert pool.pools[AddNode.Node] == []
+
+def test_node_manager_reuses_removed_nodes(nodeManager):
+    node = nodeManager.createNode(TestOutNode.Node)
+    node.show()
+    nodeManager.removeNode([node])
+    assert node.frame.isStashed()
+
+    reused = nodeManager.createNode(TestOutNode.Node)
+    assert reused is node
+    assert not reused.frame.isStashed()
+    assert reused in nodeManager.nodeList
+
+def test_clear(showBase):
+    pool = NodePool()
+    node = pool.create(AddNode.Node, showBase.aspect2d)
+    pool.release(node)
+    pool.clear()
+
+    assert pool.pools == {}
+    assert node.frame.isEmpty()
+
+def test_node_manager_cleanup_destroys_pooled_nodes(nodeManager):
+    node = nodeManager.createNode(AddNode.Node)
+    nodeManager.removeNode([node])
+    nodeManager.cleanup()
+
+    assert nodeManager.nodePool.pools == {}
+    assert node.frame.isEmpty()
+    assert nodeManager.createNode(AddNode.Node) is not node
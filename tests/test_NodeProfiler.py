@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import pytest
+
+from Panda3DNodeEditor.NodeCore import NodeProfiler as profilerModule
+from Panda3DNodeEditor.NodeCore.NodeProfiler import NodeProfiler
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode, NumericNode
+
+class FakeClock:
+    """Time which only passes while the logic of nodes runs"""
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def setCost(self, node, cost):
+        """Let the logic of the given node take cost seconds"""
+        logic = type(node).logic
+        def timedLogic():
+            self.now += cost
+            logic(node)
+        node.logic = timedLogic
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(profilerModule, "time", clock)
+    return clock
+
+@pytest.fixture
+def graph(nodeManager, clock):
+    """A numeric node taking 1 second connected to an add node taking 2"""
+    num = nodeManager.createNode(NumericNode.Node)
+    add = nodeManager.createNode(AddNode.Node)
+    nodeManager.connectSockets(num.outputList[0], add.inputList[0])
+    clock.setCost(num, 1)
+    clock.setCost(add, 2)
+    profiler = NodeProfiler(nodeManager.evaluator)
+    profiler.enable()
+    yield profiler, num, add
+    profiler.disable()
+
+def getTint(node):
+    return tuple(node.frame.getColorScale())
+
+def spyOverlay(profiler):
+    """Record the nodes passed to each overlay update"""
+    updates = []
+    updateOverlay = profiler.updateOverlay
+    def spy(nodes=None):
+        updates.append(nodes)
+        updateOverlay(nodes)
+    profiler.updateOverlay = spy
+    return updates
+
+def test_stats_are_kept_per_node_id(nodeManager, graph):
+    profiler, num, add = graph
+    nodeManager.evaluator.evaluate([num])
+
+    assert set(profiler.nodeStats) == {num.nodeID, add.nodeID}
+    assert [entry["node"] for entry in profiler.getNodeStats()] == [add, num]
+    assert profiler.getNodeStats()[0]["averageTime"] == 2
+
+def test_removed_nodes_are_dropped(nodeManager, graph):
+    profiler, num, add = graph
+    nodeManager.evaluator.evaluate([num])
+    addID = add.nodeID
+    nodeManager.removeNode([add])
+
+    assert set(profiler.nodeStats) == {num.nodeID}
+    assert profiler.slowestID == num.nodeID
+    # the pool hands out the removed node again with a new id
+    reused = nodeManager.createNode(AddNode.Node)
+    assert reused is add
+    assert reused.nodeID != addID
+    assert [entry["node"] for entry in profiler.getNodeStats()] == [num]
+
+def test_overlay_is_tinted_with_the_view_sync(nodeManager, graph):
+    profiler, num, add = graph
+    profiler.showOverlay()
+    nodeManager.evaluator.evaluate([num])
+    assert getTint(add) == (1, 1, 1, 1)
+
+    nodeManager.viewSync.sync()
+    assert getTint(add) == (1, 0, 0, 1)
+    assert getTint(num) == (1, 0.5, 0.5, 1)
+
+def test_overlay_only_updates_evaluated_nodes(nodeManager, clock, graph):
+    profiler, num, add = graph
+    profiler.showOverlay()
+    nodeManager.evaluator.evaluate([num])
+    nodeManager.viewSync.sync()
+    updates = spyOverlay(profiler)
+
+    nodeManager.evaluator.evaluate([add])
+    nodeManager.evaluator.evaluate([add])
+    nodeManager.viewSync.sync()
+    assert updates == [[add]]
+
+    # a new slowest node changes the tint of all nodes
+    clock.setCost(num, 11)
+    nodeManager.evaluator.evaluate([num])
+    nodeManager.viewSync.sync()
+    assert updates[1:] == [None]
+    assert getTint(num) == (1, 0, 0, 1)
+
+def test_removing_the_slowest_node_tints_all_nodes(nodeManager, graph):
+    profiler, num, add = graph
+    profiler.showOverlay()
+    nodeManager.evaluator.evaluate([num])
+    nodeManager.viewSync.sync()
+    nodeManager.removeNode([add])
+    nodeManager.viewSync.sync()
+
+    assert getTint(num) == (1, 0, 0, 1)
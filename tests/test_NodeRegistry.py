@@ -0,0 +1,66 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.NodeCore.NodeRegistry import NodeRegistry
+from Panda3DNodeEditor.NodeCore.Nodes import AddNode
+from Panda3DNodeEditor.NodeCore.Nodes.NodeBase import NodeBase
+
+class CustomNode(NodeBase):
+    def __init__(self, parent):
+        NodeBase.__init__(self, "CUSTOM", parent)
+
+class OtherNode(NodeBase):
+    def __init__(self, parent):
+        NodeBase.__init__(self, "OTHER", parent)
+
+def test_builtin_lookup():
+    registry = NodeRegistry()
+
+    assert registry.resolve("AddNode") is AddNode.Node
+    assert registry.resolve("Panda3DNodeEditor.NodeCore.Nodes.AddNode") is AddNode.Node
+    assert registry.resolve("NodeBase") is None
+    assert registry.resolve("Unknown") is None
+    # classes are passed through
+    assert registry.resolve(AddNode.Node) is AddNode.Node
+
+def test_custom_node_map():
+    registry = NodeRegistry({
+        "Custom": ["CustomNode", CustomNode],
+        "More": {
+            "Other": ["OtherNode", OtherNode],
+            "Separator": "-"}})
+
+    assert registry.resolve("CustomNode") is CustomNode
+    assert registry.resolve("OtherNode") is OtherNode
+    # custom nodes are stored with their module and class name
+    assert registry.resolve("some.module.OtherNode") is OtherNode
+
+def test_custom_node_map_with_tuples():
+    registry = NodeRegistry({
+        "Custom": ("CustomNode", CustomNode),
+        "More": {"Other": ("OtherNode", OtherNode)}})
+
+    assert registry.resolve("CustomNode") is CustomNode
+    assert registry.resolve("OtherNode") is OtherNode
+
+def test_unregister():
+    registry = NodeRegistry({"Custom": ["CustomNode", CustomNode]})
+    registry.unregister("CustomNode")
+
+    assert registry.resolve("CustomNode") is None
+    assert CustomNode not in registry.types.values()
+    registry.unregister("CustomNode")
+
+    registry.unregister(AddNode.Node)
+    assert registry.resolve("AddNode") is None
+
+def test_node_manager_creates_nodes_by_name(nodeManager):
+    node = nodeManager.createNode("AddNode")
+
+    assert isinstance(node, AddNode.Node)
+    assert nodeManager.createNode("Unknown") is None
@@ -0,0 +1,34 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import logging
+
+from Panda3DNodeEditor.NodeCore.Nodes import NumericNode
+from Panda3DNodeEditor.NodeCore.Sockets.NumericSocket import DEFAULT_VALUE
+
+def test_strings_are_converted_to_numbers():
+    socket = NumericNode.Node(None).inputList[0]
+
+    assert socket.toNumber("3") == 3
+    assert socket.toNumber("2.5") == 2.5
+    assert socket.toNumber(7) == 7
+
+def test_invalid_strings_use_the_default(caplog):
+    socket = NumericNode.Node(None).inputList[0]
+    with caplog.at_level(logging.WARNING):
+        socket.setValue("abc")
+
+    assert socket.getValue() == DEFAULT_VALUE
+    assert "abc" in caplog.text
+
+def test_invalid_strings_in_widgets_use_the_default(nodeManager):
+    socket = nodeManager.createNode(NumericNode.Node).inputList[0]
+    socket.setValue("7")
+    socket.setValue("abc")
+
+    assert socket.getValue() == DEFAULT_VALUE
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import pytest
+
+from panda3d.core import ClockObject
+
+from Panda3DNodeEditor.GUI import RenderOnDemand as renderOnDemandModule
+from Panda3DNodeEditor.GUI.RenderOnDemand import RenderOnDemand
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the sleeps instead of waiting"""
+    sleeps = []
+    monkeypatch.setattr(renderOnDemandModule.time, "sleep", sleeps.append)
+    return sleeps
+
+@pytest.fixture
+def renderOnDemand(showBase, sleeps):
+    renderOnDemand = RenderOnDemand(idleFrameRate=20, activeFrames=2)
+    renderOnDemand.start()
+    yield renderOnDemand
+    renderOnDemand.stop()
+
+def test_idle_after_active_frames(renderOnDemand, sleeps):
+    taskMgr.step()
+    taskMgr.step()
+    assert not renderOnDemand.idle
+
+    taskMgr.step()
+    assert renderOnDemand.idle
+    renderOnDemand.request()
+    taskMgr.step()
+    assert not renderOnDemand.idle
+
+def test_idle_frames_are_stretched(renderOnDemand, sleeps):
+    for i in range(5):
+        taskMgr.step()
+
+    assert renderOnDemand.idle
+    assert len(sleeps) == 2
+    assert all(0 < duration <= 1 / 20 for duration in sleeps)
+
+def test_clock_is_left_untouched(showBase, sleeps):
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MForced)
+    clock.setFrameRate(25)
+    renderOnDemand = RenderOnDemand(activeFrames=1)
+    try:
+        renderOnDemand.start()
+        for i in range(3):
+            taskMgr.step()
+        assert renderOnDemand.idle
+        assert clock.getMode() == ClockObject.MForced
+
+        renderOnDemand.stop()
+        taskMgr.step()
+        assert clock.getMode() == ClockObject.MForced
+        assert clock.getDt() == pytest.approx(1 / 25)
+    finally:
+        renderOnDemand.stop()
+        clock.setMode(ClockObject.MNormal)
+
+class FakeWindow:
+    def __init__(self):
+        self.active = True
+
+    def setActive(self, active):
+        self.active = active
+
+@pytest.mark.parametrize("deactivateWindow", [False, True])
+def test_window_is_only_deactivated_on_request(showBase, sleeps, monkeypatch, deactivateWindow):
+    window = FakeWindow()
+    monkeypatch.setattr(showBase, "win", window)
+    renderOnDemand = RenderOnDemand(activeFrames=1, deactivateWindow=deactivateWindow)
+    renderOnDemand.setIdle(True)
+    assert window.active is not deactivateWindow
+
+    renderOnDemand.setIdle(False)
+    assert window.active
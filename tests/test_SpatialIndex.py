@@ -0,0 +1,60 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+from Panda3DNodeEditor.NodeCore.SpatialIndex import SpatialIndex
+
+def createIndex():
+    index = SpatialIndex(cellSize=1.0)
+    index.insert("a", (0, 1, 0, 1))
+    index.insert("b", (2, 3, 0, 1))
+    # spans several cells
+    index.insert("wide", (-3, 5, 4, 6))
+    return index
+
+def test_query():
+    index = createIndex()
+
+    assert sorted(index.query(0.5, 2.5, 0.5, 0.6)) == ["a", "b"]
+    assert index.query(4, 4.5, 4.5, 5) == ["wide"]
+    assert index.query(1.2, 1.8, 0, 1) == []
+
+def test_query_area_bigger_than_grid():
+    index = createIndex()
+
+    assert sorted(index.query(-100, 100, -100, 100)) == ["a", "b", "wide"]
+
+def test_query_point_returns_last_inserted_last():
+    index = createIndex()
+    index.insert("top", (0.5, 2, 0.5, 2))
+
+    assert index.queryPoint(0.75, 0.75) == ["a", "top"]
+    assert index.queryPoint(1.5, 0.25) == []
+    # moving an item keeps its place in the order
+    index.insert("a", (0.25, 1, 0.25, 1))
+    assert index.queryPoint(0.75, 0.75) == ["a", "top"]
+
+def test_move_and_remove():
+    index = createIndex()
+    index.insert("a", (10, 11, 10, 11))
+
+    assert index.query(0, 1, 0, 1) == []
+    assert index.queryPoint(10.5, 10.5) == ["a"]
+    assert index.getBounds("a") == (10, 11, 10, 11)
+
+    index.remove("a")
+    index.remove("unknown")
+    assert not index.has("a")
+    assert index.queryPoint(10.5, 10.5) == []
+    assert (10, 10) not in index.cells
+
+def test_clear():
+    index = createIndex()
+    index.clear()
+
+    assert index.cells == {}
+    assert index.query(-100, 100, -100, 100) == []
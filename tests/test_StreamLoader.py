@@ -0,0 +1,58 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import json
+
+from Panda3DNodeEditor.LoadScripts.StreamLoader import StreamLoader
+
+from ProjectData import createProject
+
+def writeProject(path, numbers):
+    with open(path, "w") as outfile:
+        json.dump(createProject(numbers), outfile)
+    return str(path)
+
+def runTasks(showBase, maxFrames=1000):
+    """Step the task manager until the loader is done"""
+    for frame in range(maxFrames):
+        if not showBase.taskMgr.hasTaskNamed("NodeEditor_streamLoad"):
+            return
+        showBase.taskMgr.step()
+    raise AssertionError("loading didn't finish")
+
+def test_load(showBase, nodeManager, tmp_path):
+    path = writeProject(tmp_path / "project.logic", range(1, 11))
+    loader = StreamLoader(nodeManager, path)
+    loader.start()
+    assert loader.frame is not None
+    runTasks(showBase)
+
+    assert len(nodeManager.nodeList) == 19
+    assert len(nodeManager.connections) == 18
+    assert nodeManager.nodeList[-1].outputList[0].value == 55
+    assert loader.frame is None
+    assert loader.infile is None
+
+def test_cancel(showBase, nodeManager, tmp_path):
+    path = writeProject(tmp_path / "project.logic", range(20))
+    loader = StreamLoader(nodeManager, path)
+    loader.start()
+    for i in range(10):
+        loader.step()
+    assert nodeManager.nodeList != []
+    showBase.messenger.send("NodeEditor_cancelLoad")
+
+    assert not showBase.taskMgr.hasTaskNamed("NodeEditor_streamLoad")
+    assert nodeManager.nodeList == []
+    assert loader.frame is None
+
+def test_missing_file(showBase, nodeManager, tmp_path):
+    loader = StreamLoader(nodeManager, str(tmp_path / "missing.logic"))
+    loader.start()
+
+    assert not showBase.taskMgr.hasTaskNamed("NodeEditor_streamLoad")
@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+__author__ = "Fireclaw the Fox"
+__license__ = """
+Simplified BSD (BSD 2-Clause) License.
+See License.txt or http://opensource.org/licenses/BSD-2-Clause for more info
+"""
+
+import pytest
+
+from Panda3DNodeEditor.NodeCore.ViewSync import ViewSync
+from Panda3DNodeEditor.NodeCore.Nodes import NumericNode, TestOutNode
+
+class ViewNode:
+    def __init__(self):
+        self.views = 0
+
+    def updateView(self):
+        self.views += 1
+
+class ViewConnector:
+    def __init__(self):
+        self.state = None
+
+    def setError(self, hasError):
+        self.state = "error" if hasError else None
+
+    def setChecked(self):
+        self.state = "checked"
+
+@pytest.fixture
+def viewSync(showBase):
+    viewSync = ViewSync()
+    yield viewSync
+    viewSync.clear()
+
+def test_sync_updates_each_node_once(viewSync):
+    a, b = ViewNode(), ViewNode()
+    checked, cyclic = ViewConnector(), ViewConnector()
+    viewSync.addNodes([a, b])
+    viewSync.addNodes([a])
+    viewSync.setConnectorState(checked, False)
+    viewSync.setConnectorState(cyclic, True)
+    assert a.views == 0
+
+    viewSync.sync()
+    assert (a.views, b.views) == (1, 1)
+    assert (checked.state, cyclic.state) == ("checked", "error")
+    assert not viewSync.scheduled
+    assert not taskMgr.hasTaskNamed(viewSync.taskName)
+
+    # nothing is left for the next sync
+    viewSync.sync()
+    assert (a.views, b.views) == (1, 1)
+
+def test_sync_runs_once_per_frame(viewSync):
+    node = ViewNode()
+    viewSync.addNodes([node])
+    viewSync.addNodes([node])
+
+    taskMgr.step()
+    assert node.views == 1
+    assert not viewSync.scheduled
+    taskMgr.step()
+    assert node.views == 1
+
+def test_instances_use_their_own_task(viewSync):
+    otherSync = ViewSync()
+    node = ViewNode()
+    viewSync.addNodes([node])
+    otherSync.addNodes([node])
+    otherSync.sync()
+
+    assert viewSync.taskName != otherSync.taskName
+    assert taskMgr.hasTaskNamed(viewSync.taskName)
+    taskMgr.step()
+    assert node.views == 2
+
+def test_callbacks_run_once_after_the_nodes(viewSync):
+    node = ViewNode()
+    calls = []
+    callback = lambda: calls.append(node.views)
+    viewSync.addNodes([node])
+    viewSync.addCallback(callback)
+    viewSync.addCallback(callback)
+    viewSync.sync()
+
+    assert calls == [1]
+    viewSync.sync()
+    assert calls == [1]
+
+def test_discarded_items_are_not_synced(viewSync):
+    node = ViewNode()
+    connector = ViewConnector()
+    viewSync.addNodes([node])
+    viewSync.setConnectorState(connector, True)
+    viewSync.discardNodes([node])
+    viewSync.discardConnectors([connector])
+    viewSync.sync()
+
+    assert node.views == 0
+    assert connector.state is None
+
+def test_widgets_show_values_after_sync(nodeManager):
+    num = nodeManager.createNode(NumericNode.Node)
+    out = nodeManager.createNode(TestOutNode.Node)
+    nodeManager.connectSockets(num.outputList[0], out.inputList[0])
+    num.inputList[0].setValue(3)
+    nodeManager.evaluator.evaluate([num])
+
+    # the value is passed on right away, the widget waits for the sync
+    assert out.inputList[0].getValue() == 3
+    assert out.inputList[0].text["text"] == "In 1"
+    nodeManager.viewSync.sync()
+    assert out.inputList[0].text["text"] == "3"